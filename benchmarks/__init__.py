@@ -0,0 +1 @@
+"""Benchmarks for tremana, to be run with airspeed velocity (asv)."""
@@ -0,0 +1,135 @@
+"""Benchmarks for the spectra and metrics of the analysis."""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+from benchmarks.data_generators import synthetic_recording
+
+from tremana.analysis.activity import active_windows
+from tremana.analysis.metrics import batch_center_of_mass
+from tremana.analysis.metrics import center_of_mass
+from tremana.analysis.metrics import tremor_metrics
+from tremana.analysis.transformations import batch_fft_spectra
+from tremana.analysis.transformations import fft_spectra
+from tremana.analysis.transformations import power_density_spectra
+from tremana.analysis.transformations import stack_recordings
+from tremana.analysis.transformations import windowed_spectra
+
+# Durations of the synthetic recordings, from a short recording up to three nights
+RECORDING_HOURS = [1, 8, 24, 72]
+
+
+class FFTSpectra:
+    """FFT of whole recordings (4 channels at 128 Hz)."""
+
+    params = RECORDING_HOURS
+    param_names = ["hours"]
+    timeout = 600
+
+    def setup(self, hours: int) -> None:
+        self.data = synthetic_recording(hours)
+
+    def time_fft_spectra(self, hours: int) -> None:
+        fft_spectra(self.data, sampling_rate=self.data.attrs["sample_rate"])
+
+    def peakmem_fft_spectra(self, hours: int) -> None:
+        fft_spectra(self.data, sampling_rate=self.data.attrs["sample_rate"])
+
+
+class PowerDensitySpectra:
+    """Power density spectra of whole recordings (4 channels at 128 Hz)."""
+
+    params = (RECORDING_HOURS, ["periodogram", "welch"])
+    param_names = ["hours", "method"]
+    timeout = 600
+
+    def setup(self, hours: int, method: str) -> None:
+        self.data = synthetic_recording(hours)
+
+    def time_power_density_spectra(self, hours: int, method: str) -> None:
+        power_density_spectra(
+            self.data, sampling_rate=self.data.attrs["sample_rate"], method=method
+        )
+
+    def peakmem_power_density_spectra(self, hours: int, method: str) -> None:
+        power_density_spectra(
+            self.data, sampling_rate=self.data.attrs["sample_rate"], method=method
+        )
+
+
+class CenterOfMass:
+    """Center of mass of the spectra of whole recordings.
+
+    The number of frequencies grows with the duration for the FFT and periodogram,
+    while it is constant for welch.
+    """
+
+    params = (RECORDING_HOURS, ["fft", "periodogram", "welch"])
+    param_names = ["hours", "method"]
+    timeout = 600
+
+    def setup(self, hours: int, method: str) -> None:
+        data = synthetic_recording(hours)
+        sample_rate = data.attrs["sample_rate"]
+        if method == "fft":
+            self.spectra: pd.DataFrame = fft_spectra(data, sampling_rate=sample_rate)
+        else:
+            self.spectra = power_density_spectra(data, sampling_rate=sample_rate, method=method)
+
+    def time_center_of_mass(self, hours: int, method: str) -> None:
+        center_of_mass(self.spectra)
+
+    def peakmem_center_of_mass(self, hours: int, method: str) -> None:
+        center_of_mass(self.spectra)
+
+    def time_tremor_metrics(self, hours: int, method: str) -> None:
+        tremor_metrics(self.spectra, amplitude=method == "fft")
+
+    def peakmem_tremor_metrics(self, hours: int, method: str) -> None:
+        tremor_metrics(self.spectra, amplitude=method == "fft")
+
+
+class BatchAnalysis:
+    """Spectra and center of mass of a cohort, batched compared to one recording at a time."""
+
+    params = [8, 32]
+    param_names = ["recordings"]
+    timeout = 600
+
+    def setup(self, recordings: int) -> None:
+        self.recordings = [synthetic_recording(0.5, seed=seed) for seed in range(recordings)]
+        self.values = stack_recordings(self.recordings)
+
+    def time_loop(self, recordings: int) -> None:
+        for recording in self.recordings:
+            center_of_mass(fft_spectra(recording))
+
+    def time_batch(self, recordings: int) -> None:
+        batch_center_of_mass(batch_fft_spectra(self.values))
+
+
+class ActivitySegmentation:
+    """Windowed spectra of whole recordings with and without skipping the rest.
+
+    The synthetic recordings contain a constant tremor, so every tenth window is
+    marked as active to mimic a night which is mostly rest.
+    """
+
+    params = RECORDING_HOURS
+    param_names = ["hours"]
+    timeout = 600
+
+    def setup(self, hours: int) -> None:
+        self.data = synthetic_recording(hours)
+        self.active = np.arange(len(active_windows(self.data))) % 10 == 0
+
+    def time_active_windows(self, hours: int) -> None:
+        active_windows(self.data)
+
+    def time_windowed_spectra(self, hours: int) -> None:
+        windowed_spectra(self.data, sampling_rate=self.data.attrs["sample_rate"])
+
+    def time_windowed_spectra_active(self, hours: int) -> None:
+        windowed_spectra(
+            self.data, sampling_rate=self.data.attrs["sample_rate"], active=self.active
+        )
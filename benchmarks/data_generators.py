@@ -0,0 +1,170 @@
+"""Generators for synthetic benchmark data."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SOMNOWATCH_SIGNAL_TYPES = ("X_AC_Type", "Y_AC_Type", "Z_AC_Type", "Mag_Type")
+SAMPLE_RATE = 128
+# Number of samples written at once, which bounds the memory needed for long recordings
+CHUNK_SIZE = 2**20
+
+
+def _somnowatch_time_strings(start: int, stop: int, sample_rate: int) -> pd.Series:
+    """Format the time column of the samples ``start`` to ``stop`` of a recording.
+
+    Parameters
+    ----------
+    start : int
+        Number of the first sample.
+    stop : int
+        Number of the sample after the last one.
+    sample_rate : int
+        Number of samples per second.
+
+    Returns
+    -------
+    pd.Series
+        Times formatted like ``22:00:00,000``, starting at 22:00.
+    """
+    seconds = (np.arange(start, stop) / sample_rate + 22 * 3600) % 86400
+    times = pd.Series(
+        seconds.astype("timedelta64[s]") + (seconds % 1 * 1e3).astype("timedelta64[ms]")
+    )
+    components = times.dt.components
+    return (
+        components["hours"].map("{:02d}".format)
+        + ":"
+        + components["minutes"].map("{:02d}".format)
+        + ":"
+        + components["seconds"].map("{:02d}".format)
+        + ","
+        + components["milliseconds"].map("{:03d}".format)
+    )
+
+
+def synthetic_tremor(
+    hours: float,
+    *,
+    sample_rate: int = SAMPLE_RATE,
+    n_channels: int = len(SOMNOWATCH_SIGNAL_TYPES),
+    seed: int = 0,
+) -> np.ndarray:
+    """Generate accelerometry values of a tremor (5 Hz sine) with white noise.
+
+    Parameters
+    ----------
+    hours : float
+        Duration of the recording in hours.
+    sample_rate : int
+        Number of samples per second, by default SAMPLE_RATE
+    n_channels : int
+        Number of channels, by default len(SOMNOWATCH_SIGNAL_TYPES)
+    seed : int
+        Seed of the random number generator, by default 0
+
+    Returns
+    -------
+    np.ndarray
+        Values in mg with the shape (sample x channel).
+    """
+    length = int(hours * 3600 * sample_rate)
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0, 100, (length, n_channels))
+    values += 50 * np.sin(2 * np.pi * 5 * np.arange(length) / sample_rate)[:, np.newaxis]
+    return values
+
+
+def synthetic_recording(
+    hours: float, *, sample_rate: int = SAMPLE_RATE, seed: int = 0
+) -> pd.DataFrame:
+    """Generate a recording like it is returned by ``read_somnowatch``.
+
+    Parameters
+    ----------
+    hours : float
+        Duration of the recording in hours.
+    sample_rate : int
+        Number of samples per second, by default SAMPLE_RATE
+    seed : int
+        Seed of the random number generator, by default 0
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe indexed by time with one column per accelerometer channel.
+    """
+    values = synthetic_tremor(hours, sample_rate=sample_rate, seed=seed)
+    data = pd.DataFrame(
+        values,
+        index=pd.date_range(
+            "2021-01-18 22:00:00",
+            periods=values.shape[0],
+            freq=pd.Timedelta(seconds=1 / sample_rate),
+            name="time",
+        ),
+        columns=[
+            f"{signal_type.split('_')[0]} amplitude in mg"
+            for signal_type in SOMNOWATCH_SIGNAL_TYPES
+        ],
+    )
+    data.attrs["sample_rate"] = sample_rate
+    return data
+
+
+def write_somnowatch_export(
+    directory: Path, *, hours: float, sample_rate: int = SAMPLE_RATE, seed: int = 0
+) -> list[Path]:
+    """Write a synthetic somnowatch export with one file per accelerometer channel.
+
+    The files are written in chunks of ``CHUNK_SIZE`` samples, so exports of
+    multiple days can be generated without holding them in memory.
+
+    Parameters
+    ----------
+    directory : Path
+        Directory to write the files to.
+    hours : float
+        Duration of the recording in hours.
+    sample_rate : int
+        Number of samples per second, by default SAMPLE_RATE
+    seed : int
+        Seed of the random number generator, by default 0
+
+    Returns
+    -------
+    list[Path]
+        Paths of the written files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    length = int(hours * 3600 * sample_rate)
+    start_date = pd.Timestamp("2021-01-18 22:00:00")
+    rng = np.random.default_rng(seed)
+    file_paths = [directory / f"{signal_type}.txt" for signal_type in SOMNOWATCH_SIGNAL_TYPES]
+    files = [file_path.open("w") for file_path in file_paths]
+    try:
+        for file, signal_type in zip(files, SOMNOWATCH_SIGNAL_TYPES):
+            file.write(
+                f"Signal Type: {signal_type}\n"
+                f"Start Time: {start_date:%d.%m.%Y %H:%M:%S}\n"
+                f"Sample Rate: {sample_rate}\n"
+                f"Length: {length}\n"
+                "Unit: mg\n"
+                "\n"
+                "Data:\n"
+            )
+        for start in range(0, length, CHUNK_SIZE):
+            stop = min(start + CHUNK_SIZE, length)
+            time_strings = _somnowatch_time_strings(start, stop, sample_rate) + "; "
+            for file in files:
+                values = pd.Series(np.round(rng.normal(0, 100, stop - start), 1)).map(
+                    "{:g}".format
+                )
+                body = (time_strings + values.str.replace(".", ",", regex=False)).str.cat(sep="\n")
+                file.write(f"{body}\n")
+    finally:
+        for file in files:
+            file.close()
+    return file_paths
@@ -0,0 +1,89 @@
+"""Benchmarks for the somnowatch parser."""
+from __future__ import annotations
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import pandas as pd
+from benchmarks.data_generators import write_somnowatch_export
+
+from tremana.parsers.devices.somnowatch import _somnowatch_parse_header
+from tremana.parsers.devices.somnowatch import _somnowatch_read_data
+from tremana.parsers.devices.somnowatch import read_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch_recording
+from tremana.utils.io import lazy_read_headers
+
+# Durations of the synthetic exports, from a short recording up to three nights
+EXPORT_HOURS = [1, 8, 24, 72]
+
+
+class TimeSomnoWatchChannelReading:
+    """Reading a single channel file, compared to the plain ``pd.read_csv`` approach."""
+
+    params = [0.25, 1]
+    param_names = ["hours"]
+    timeout = 600
+
+    def setup(self, hours: float) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.file_path = write_somnowatch_export(Path(self.tmp_dir.name), hours=hours)[0]
+        self.metadata = _somnowatch_parse_header(
+            next(lazy_read_headers([self.file_path], lines_to_read=5))
+        )
+
+    def teardown(self, hours: float) -> None:
+        self.tmp_dir.cleanup()
+
+    def time_read_csv_parse_dates(self, hours: float) -> None:
+        pd.read_csv(
+            self.file_path,
+            skiprows=7,
+            decimal=",",
+            sep=";",
+            names=["time", "amplitude"],
+            parse_dates=["time"],
+        )
+
+    def time_read_data(self, hours: float) -> None:
+        _somnowatch_read_data(self.file_path, self.metadata)
+
+
+class SomnoWatchExport:
+    """Reading whole exports (4 channels at 128 Hz) of realistic durations.
+
+    The exports are generated once by ``setup_cache`` and shared by all benchmarks.
+    """
+
+    params = EXPORT_HOURS
+    param_names = ["hours"]
+    timeout = 3600
+
+    def setup_cache(self) -> dict[int, list[str]]:
+        return {
+            hours: [
+                str(file_path.resolve())
+                for file_path in write_somnowatch_export(Path(f"export_{hours}h"), hours=hours)
+            ]
+            for hours in EXPORT_HOURS
+        }
+
+    def time_lazy_read_headers(self, exports: dict[int, list[str]], hours: int) -> None:
+        list(lazy_read_headers(exports[hours], lines_to_read=7))
+
+    def time_read_somnowatch(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch(exports[hours])
+
+    def time_read_somnowatch_compact(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch(exports[hours], compact=True)
+
+    def peakmem_read_somnowatch(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch(exports[hours])
+
+    def peakmem_read_somnowatch_compact(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch(exports[hours], compact=True)
+
+    def time_read_somnowatch_recording(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch_recording(exports[hours])
+
+    def peakmem_read_somnowatch_recording(self, exports: dict[int, list[str]], hours: int) -> None:
+        read_somnowatch_recording(exports[hours])
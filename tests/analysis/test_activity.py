@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.analysis.activity import _window_activity
+from tremana.analysis.activity import active_windows
+from tremana.analysis.activity import window_activity
+from tremana.analysis.transformations import windowed_spectra
+from tremana.recording import Recording
+
+
+@pytest.fixture
+def rest_and_tremor() -> pd.DataFrame:
+    """One minute at 100 Hz with gravity and noise and a 5 Hz tremor from 20 s to 30 s"""
+    rng = np.random.default_rng(0)
+    t = np.arange(6000) / 100
+    tremor = np.where((t >= 20) & (t < 30), 50 * np.sin(2 * np.pi * 5 * t), 0)
+    return pd.DataFrame(
+        {
+            "X": 1000 + tremor + rng.normal(0, 1, t.size),
+            "Y": tremor + rng.normal(0, 1, t.size),
+            "Z": rng.normal(0, 1, t.size),
+        },
+        index=t,
+    )
+
+
+@pytest.mark.parametrize("window_length, hop", ((256, 128), (200, 75), (100, 100)))
+def test_window_activity_values(window_length: int, hop: int):
+    """The activity is the root of the summed variances of each window"""
+    rng = np.random.default_rng(0)
+    values = rng.normal(1000, 2, size=(2000, 3))
+    values[1000, 1] = np.nan
+
+    result = _window_activity(values, window_length, hop)
+
+    expected = np.array(
+        [
+            np.sqrt(values[start : start + window_length].var(axis=0).sum())  # noqa: E203
+            for start in range(0, values.shape[0] - window_length + 1, hop)
+        ]
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-10)
+    assert _window_activity(values[:10], window_length, hop).size == 0
+
+
+def test_window_activity(rest_and_tremor: pd.DataFrame):
+    result = window_activity(rest_and_tremor, columns=["X", "Y", "Z"], window_length=500)
+
+    assert result.name == "activity"
+    assert np.allclose(result.index, np.arange(23) * 2.5)
+    assert np.all(result[(result.index >= 20) & (result.index <= 25)] > 40)
+    assert np.all(result[(result.index <= 15) | (result.index >= 30)] < 2)
+
+
+def test_active_windows(rest_and_tremor: pd.DataFrame):
+    result = active_windows(rest_and_tremor, window_length=500)
+
+    assert result.dtype == bool
+    assert result.name == "active"
+    assert list(result[result].index) == [17.5, 20, 22.5, 25, 27.5]
+    assert not active_windows(rest_and_tremor, window_length=500, threshold=100).any()
+    assert active_windows(rest_and_tremor.iloc[:10], window_length=500).empty
+
+
+def test_active_windows_recording(rest_and_tremor: pd.DataFrame):
+    """Only the spectra of active windows are calculated"""
+    recording = Recording.from_dataframe(rest_and_tremor, sample_rate=100)
+    active = active_windows(recording, window_length=500)
+
+    result = windowed_spectra(recording, window_length=500, active=active)
+    expected = windowed_spectra(recording, window_length=500)
+
+    assert result.values.shape == (5, 251, 3)
+    np.testing.assert_array_equal(result.values, expected.values[active.to_numpy()])
+    pd.testing.assert_index_equal(result.times, active[active].index)
+    peak_frequencies = result.frequencies[result.values[1:-1, :, 1].argmax(axis=1)]
+    assert np.all(peak_frequencies == 5)
+    with pytest.raises(ValueError, match="active has 2 values, but there are 23 windows"):
+        windowed_spectra(recording, window_length=500, active=[True, False])
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.analysis.alignment import align_channels
+from tremana.analysis.alignment import resampling_factors
+
+START = pd.Timestamp("2021-01-18 22:00:00")
+
+
+def sine(sample_rate: float, seconds: float, frequency: float = 5) -> np.ndarray:
+    t = np.arange(round(seconds * sample_rate)) / sample_rate
+    return np.sin(2 * np.pi * frequency * t)
+
+
+@pytest.mark.parametrize(
+    "source_rate, target_rate, expected",
+    ((128, 128, (1, 1)), (64, 128, (2, 1)), (128, 100, (25, 32)), (127.9999, 128, (1, 1))),
+)
+def test_resampling_factors(source_rate, target_rate, expected):
+    assert resampling_factors(source_rate, target_rate) == expected
+
+
+def test_align_channels_consistent():
+    """Consistent channels are combined without changes"""
+    values = [np.arange(10.0), -np.arange(10.0)]
+
+    result = align_channels(values, [128, 128], [START, START], channels=["X", "Y"])
+
+    np.testing.assert_array_equal(result.values, np.stack(values, axis=1))
+    assert result.channels.tolist() == ["X", "Y"]
+    assert result.sample_rate == 128
+    assert result.start_date == START
+
+
+def test_align_channels_resampling():
+    """Channels are resampled to the most common sample rate"""
+    values = [sine(128, 10), sine(64, 10), sine(128, 10, frequency=3)]
+
+    result = align_channels(values, [128, 64, 128], [START] * 3)
+
+    assert result.sample_rate == 128
+    assert result.values.shape == (1280, 3)
+    # the edges are distorted by the filter of the resampling
+    np.testing.assert_allclose(result.values[100:-100, 1], values[0][100:-100], atol=1e-2)
+    np.testing.assert_array_equal(result.values[:, 2], values[2])
+    assert align_channels(values, [128, 64, 128], [START] * 3, sample_rate=32).values.shape == (
+        320,
+        3,
+    )
+    assert (
+        align_channels([values[0].astype(np.float32)], [128], [START], sample_rate=64).values.dtype
+        == np.float32
+    )
+
+
+def test_align_channels_offsets():
+    """Channels are trimmed to the common time or padded to the whole time"""
+    values = [np.arange(256.0), np.arange(128.0), np.arange(128.0)]
+    start_dates = [START, START + pd.Timedelta(seconds=0.5), START]
+
+    result = align_channels(values, [128, 64, 128], start_dates)
+
+    assert result.start_date == START + pd.Timedelta(seconds=0.5)
+    assert result.values.shape == (64, 3)
+    np.testing.assert_array_equal(result.values[:, 0], np.arange(64, 128))
+    np.testing.assert_array_equal(result.values[:, 2], np.arange(64, 128))
+
+    padded = align_channels(values, [128, 64, 128], start_dates, trim=False)
+
+    assert padded.start_date == START
+    assert padded.values.shape == (320, 3)
+    assert np.isnan(padded.values[:64, 1]).all()
+    assert np.isnan(padded.values[128:, 2]).all()
+    np.testing.assert_array_equal(padded.values[:256, 0], values[0])
+
+
+def test_align_channels_no_overlap():
+    result = align_channels(
+        [np.ones(10), np.ones(10)], [10, 10], [START, START + pd.Timedelta(seconds=2)]
+    )
+
+    assert result.values.shape == (0, 2)
+
+
+def test_align_channels_wrong_number_of_rates():
+    with pytest.raises(ValueError, match="Got 1 sample rates and 2 start dates for 2 channels"):
+        align_channels([np.ones(10), np.ones(10)], [10], [START, START])
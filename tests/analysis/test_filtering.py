@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.signal import sosfilt
+from scipy.signal import sosfilt_zi
+
+from tremana.analysis.filtering import BandpassFilter
+from tremana.analysis.filtering import bandpass_filter
+from tremana.analysis.filtering import design_bandpass
+from tremana.analysis.filtering import iter_bandpass_filter
+from tremana.analysis.transformations import fft_spectra
+from tremana.recording import Recording
+
+
+@pytest.fixture
+def signal() -> pd.DataFrame:
+    """Tremor at 5 Hz with a drift, an offset and a 40 Hz disturbance"""
+    t = np.arange(60 * 128) / 128
+    tremor = np.sin(2 * np.pi * 5 * t)
+    disturbance = np.sin(2 * np.pi * 40 * t) + 0.1 * t + 1000
+    data = pd.DataFrame({"X": tremor + disturbance, "Y": 2 * tremor + disturbance}, index=t)
+    data.attrs["sample_rate"] = 128
+    return data
+
+
+def test_design_bandpass():
+    """The coefficients are designed once per sample rate and band"""
+    sos = design_bandpass(128.0, (1.0, 20.0))
+
+    assert sos.shape == (4, 6)
+    assert design_bandpass(128.0, (1.0, 20.0)) is sos
+    assert not sos.flags.writeable
+    assert design_bandpass(128.0, (1.0, 20.0), order=2).shape == (2, 6)
+    with pytest.raises(ValueError, match=r"The band \(1, 70\) needs to be between 0"):
+        design_bandpass(128.0, (1, 70))
+    with pytest.raises(ValueError, match="Nyquist frequency"):
+        design_bandpass(128.0, (20.0, 1.0))
+
+
+def test_bandpass_filter(signal: pd.DataFrame):
+    result = bandpass_filter(signal, sampling_rate=128)
+
+    assert result.attrs == signal.attrs
+    pd.testing.assert_index_equal(result.index, signal.index)
+    # apart from the edges only the tremor remains
+    inner = slice(5 * 128, -5 * 128)
+    t = signal.index.to_numpy()[inner]
+    np.testing.assert_allclose(result["X"].to_numpy()[inner], np.sin(2 * np.pi * 5 * t), atol=0.02)
+    spectra = fft_spectra(result, sampling_rate=128)
+    assert spectra["Y"].idxmax() == 5
+    assert spectra.loc[spectra.index > 30, "Y"].max() < 1e-3
+    assert list(bandpass_filter(signal, columns=["Y"]).columns) == ["Y"]
+
+
+def test_bandpass_filter_recording(signal: pd.DataFrame):
+    recording = Recording.from_dataframe(signal.astype(np.float32), sample_rate=128)
+    recording.metadata = {"X": {"unit": "mg"}, "Y": {"unit": "g"}}
+
+    result = bandpass_filter(recording, band=(2, 10))
+
+    assert isinstance(result, Recording)
+    assert result.values.dtype == np.float32
+    assert result.sample_rate == 128
+    np.testing.assert_allclose(
+        result.values,
+        bandpass_filter(signal, sampling_rate=128, band=(2, 10)).to_numpy(),
+        atol=1e-3,
+    )
+    assert result.metadata == recording.metadata
+    assert bandpass_filter(recording, columns=["Y"]).metadata == {"Y": {"unit": "g"}}
+
+
+@pytest.mark.parametrize("chunk_size", (7, 100, 1000, 10000))
+def test_bandpass_filter_chunks(signal: pd.DataFrame, chunk_size: int):
+    """Filtering chunks with carried state is the same as filtering all samples at once"""
+    sos = np.array(design_bandpass(128.0, (1.0, 20.0)))
+    values = signal.to_numpy()
+    expected, _ = sosfilt(sos, values, axis=0, zi=sosfilt_zi(sos)[:, :, np.newaxis] * values[0])
+    chunks = [
+        signal.iloc[slice(start, start + chunk_size)]
+        for start in range(0, len(signal), chunk_size)
+    ]
+
+    result = pd.concat(iter_bandpass_filter(chunks, sampling_rate=128))
+
+    np.testing.assert_allclose(result.to_numpy(), expected)
+    pd.testing.assert_index_equal(result.index, signal.index)
+    assert result.attrs == signal.attrs
+
+
+def test_bandpass_filter_stream():
+    stream_filter = BandpassFilter(sampling_rate=128, band=(1, 20))
+    block = np.ones(100)
+
+    first = stream_filter.filter(block)
+
+    # a constant signal starting at the initial state is removed without a step response
+    assert first.shape == (100, 1)
+    np.testing.assert_allclose(first, 0, atol=1e-10)
+    assert stream_filter.filter(np.empty((0, 1))).shape == (0, 1)
+    stream_filter.reset()
+    assert stream_filter.zi is None
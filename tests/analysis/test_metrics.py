@@ -1,7 +1,13 @@
 import numpy as np
 import pandas as pd
+import pytest
 
+from tremana.analysis.metrics import TREMOR_METRICS
+from tremana.analysis.metrics import batch_center_of_mass
 from tremana.analysis.metrics import center_of_mass
+from tremana.analysis.metrics import tremor_metrics
+from tremana.analysis.transformations import BatchSpectra
+from tremana.analysis.transformations import windowed_spectra
 
 
 def test_center_of_mass():
@@ -21,3 +27,126 @@ def test_center_of_mass():
 
     assert result.loc["H_cm", "single_frequency_fft"] == 0
     assert np.allclose(result.loc["H_cm", "white_noise_fft"], 0.5)
+
+
+def test_center_of_mass_ndarray():
+    """Arrays give the same result as dataframes and sorting is done per spectrum"""
+    rng = np.random.default_rng(0)
+    fft_data = rng.random((100, 5))
+
+    result = center_of_mass(fft_data)
+    expected = center_of_mass(pd.DataFrame(fft_data))
+
+    pd.testing.assert_frame_equal(result, expected)
+    for column in range(5):
+        sorted_spectrum = np.sort(fft_data[:, column])[::-1]
+        assert np.allclose(
+            result.loc["H_cm", column],
+            np.arange(100) @ sorted_spectrum / sorted_spectrum.sum() / 99,
+        )
+
+
+def test_center_of_mass_windowed_spectra():
+    """Center of mass is calculated per window and channel"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(1000, 2)), columns=["X", "Y"])
+    spectra = windowed_spectra(signal, window_length=100, hop=100)
+
+    result = center_of_mass(spectra)
+
+    assert list(result.columns) == ["X", "Y"]
+    assert list(result.index) == list(range(0, 1000, 100))
+    for index, time in enumerate(result.index):
+        expected = center_of_mass(spectra.values[index])
+        assert np.allclose(result.loc[time], expected.loc["H_cm"])
+
+
+def test_tremor_metrics():
+    """Metrics of a gaussian peak in the tremor band and white noise"""
+    frequencies = np.linspace(0, 64, 1025)
+    peak = np.exp(-((frequencies - 5) ** 2) / (2 * 0.5**2))
+    spectra = pd.DataFrame({"peak": peak, "noise": np.ones(1025)}, index=frequencies)
+
+    result = tremor_metrics(spectra)
+
+    assert list(result.columns) == list(TREMOR_METRICS)
+    assert list(result.index) == ["peak", "noise"]
+    assert result.index.name == "channel"
+    assert np.allclose(result["H_cm"], center_of_mass(spectra).loc["H_cm"])
+    assert result.at["peak", "dominant_frequency"] == 5
+    assert np.isclose(result.at["peak", "band_power_ratio"], 1, rtol=1e-4)
+    assert np.isclose(result.at["noise", "band_power_ratio"], 145 / 1025)
+    probabilities = peak[peak > 0] / peak.sum()
+    assert np.isclose(
+        result.at["peak", "spectral_entropy"],
+        -np.sum(probabilities * np.log(probabilities)) / np.log(1025),
+    )
+    assert np.isclose(result.at["noise", "spectral_entropy"], 1)
+    assert np.isclose(result.at["peak", "peak_width"], 2 * np.sqrt(2 * np.log(2)) * 0.5, rtol=1e-2)
+    assert np.isclose(result.at["noise", "peak_width"], 64)
+
+
+def test_tremor_metrics_selection():
+    """Only the selected metrics are calculated, amplitudes are squared"""
+    frequencies = np.arange(20.0)
+    amplitudes = np.ones((20, 3))
+    amplitudes[4] = 2
+
+    result = tremor_metrics(
+        amplitudes,
+        metrics=["band_power_ratio", "dominant_frequency"],
+        band=(2, 5),
+        amplitude=True,
+        frequencies=frequencies,
+    )
+
+    assert list(result.columns) == ["band_power_ratio", "dominant_frequency"]
+    assert list(result.index) == [0, 1, 2]
+    assert np.allclose(result["band_power_ratio"], 7 / 23)
+    assert np.all(result["dominant_frequency"] == 4)
+
+
+def test_tremor_metrics_windowed_spectra():
+    """Metrics are calculated per window and channel"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(1000, 2)), columns=["X", "Y"])
+    spectra = windowed_spectra(signal, sampling_rate=100, window_length=100, hop=100)
+
+    result = tremor_metrics(spectra, amplitude=True)
+
+    assert result.index.names == ["time", "channel"]
+    assert result.shape == (20, 5)
+    for index, time in enumerate(spectra.times):
+        expected = tremor_metrics(
+            spectra.values[index], amplitude=True, frequencies=spectra.frequencies
+        )
+        assert np.allclose(result.loc[time].to_numpy(), expected.to_numpy())
+
+
+def test_tremor_metrics_errors():
+    spectra = pd.DataFrame({"X": np.ones(10)}, index=np.arange(10.0))
+
+    with pytest.raises(ValueError, match="Unknown metrics \\['foo'\\]"):
+        tremor_metrics(spectra, metrics=["foo"])
+    with pytest.raises(ValueError, match="No frequency"):
+        tremor_metrics(spectra, band=(20, 30))
+    with pytest.raises(ValueError, match="frequencies are required"):
+        tremor_metrics(np.ones(10))
+
+
+def test_batch_metrics():
+    """Metrics of batched spectra are the same as for each recording"""
+    rng = np.random.default_rng(0)
+    frequencies = np.linspace(0, 64, 100)
+    spectra = BatchSpectra(frequencies, rng.random((3, 100, 2)))
+
+    center_of_mass_result = batch_center_of_mass(spectra)
+    tremor_metrics_result = tremor_metrics(spectra)
+
+    assert center_of_mass_result.shape == (3, 2)
+    assert np.array_equal(batch_center_of_mass(spectra.values), center_of_mass_result)
+    assert tremor_metrics_result.index.names == ["recording", "channel"]
+    for index, values in enumerate(spectra.values):
+        assert np.allclose(center_of_mass_result[index], center_of_mass(values).loc["H_cm"])
+        expected = tremor_metrics(values, frequencies=frequencies)
+        assert np.allclose(tremor_metrics_result.loc[index].to_numpy(), expected.to_numpy())
@@ -0,0 +1,165 @@
+from functools import wraps
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.analysis import transformations
+from tremana.analysis.spectra_cache import SpectraCache
+from tremana.analysis.spectra_cache import SpectraCacheStats
+from tremana.analysis.spectra_cache import hash_dataframe
+from tremana.analysis.transformations import fft_spectra
+from tremana.analysis.transformations import power_density_spectra
+from tremana.recording import Recording
+
+
+@pytest.fixture
+def signal() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(size=(1024, 2)), columns=["X", "Y"])
+
+
+def count_calls(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        wrapper.calls += 1
+        return func(*args, **kwargs)
+
+    wrapper.calls = 0
+    return wrapper
+
+
+def test_hash_dataframe(signal: pd.DataFrame):
+    """Only values, columns and dtypes are part of the hash"""
+    assert hash_dataframe(signal) == hash_dataframe(signal.copy())
+    assert hash_dataframe(signal) == hash_dataframe(signal.set_index(signal.index + 10))
+    assert hash_dataframe(signal) != hash_dataframe(signal * 2)
+    assert hash_dataframe(signal) != hash_dataframe(signal.rename(columns={"X": "Z"}))
+    assert hash_dataframe(signal) != hash_dataframe(signal.astype(np.float32))
+
+
+def test_hash_recording(signal: pd.DataFrame):
+    recording = Recording.from_dataframe(signal, sample_rate=64)
+
+    assert hash_dataframe(recording) == hash_dataframe(Recording.from_dataframe(signal, 64))
+    assert hash_dataframe(recording) != hash_dataframe(Recording.from_dataframe(signal, 32))
+    assert hash_dataframe(recording) != hash_dataframe(Recording.from_dataframe(signal * 2, 64))
+
+
+def test_spectra_cache_memoize(signal: pd.DataFrame):
+    cache = SpectraCache()
+    counted_fft_spectra = count_calls(fft_spectra)
+    cached_fft_spectra = cache.memoize(counted_fft_spectra)
+
+    expected = fft_spectra(signal, sampling_rate=64)
+    result = cached_fft_spectra(signal, sampling_rate=64)
+    result.iloc[:] = 0
+    # same call with positional and default arguments
+    cached_result = cached_fft_spectra(signal, None, 64, False)
+
+    assert counted_fft_spectra.calls == 1
+    pd.testing.assert_frame_equal(cached_result, expected)
+    assert cache.stats() == SpectraCacheStats(
+        hits=1,
+        disk_hits=0,
+        misses=1,
+        evictions=0,
+        entries=1,
+        nbytes=expected.memory_usage().sum(),
+    )
+
+    cached_fft_spectra(signal, sampling_rate=128)
+    cached_fft_spectra(signal * 2, sampling_rate=64)
+
+    assert counted_fft_spectra.calls == 3
+    assert cache.stats().entries == 3
+
+
+def test_spectra_cache_lru_eviction(signal: pd.DataFrame):
+    """The least recently used results are evicted above the size limit"""
+    nbytes = fft_spectra(signal).memory_usage().sum()
+    cache = SpectraCache(max_nbytes=2 * nbytes)
+    cached_fft_spectra = cache.memoize(fft_spectra)
+    keys = [cache.key(fft_spectra, signal, sampling_rate=rate) for rate in (1, 2, 3)]
+
+    cached_fft_spectra(signal, sampling_rate=1)
+    cached_fft_spectra(signal, sampling_rate=2)
+    cached_fft_spectra(signal, sampling_rate=1)
+    cached_fft_spectra(signal, sampling_rate=3)
+
+    assert cache.stats().evictions == 1
+    assert cache.stats().nbytes == 2 * nbytes
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+
+    cache.evict(keys[0])
+    assert cache.get(keys[0]) is None
+    cache.clear()
+    assert cache.stats().entries == 0
+    assert cache.stats().evictions == 3
+
+
+def test_spectra_cache_disk(signal: pd.DataFrame, tmp_path: Path, monkeypatch):
+    """Results on disk are used by new caches and limited in size"""
+    disk_dir = tmp_path / "spectra"
+    SpectraCache(disk_dir=disk_dir).memoize(power_density_spectra)(signal, method="welch")
+    expected = power_density_spectra(signal, method="welch")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Result was calculated again.")
+
+    cache = SpectraCache(disk_dir=disk_dir)
+    with monkeypatch.context() as context:
+        context.setattr(transformations, "welch", fail)
+        result = cache.memoize(power_density_spectra)(signal, method="welch")
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert cache.stats().disk_hits == 1
+    assert cache.stats().entries == 1
+
+    cache.max_disk_nbytes = int(1.5 * next(disk_dir.glob("*.pkl")).stat().st_size)
+    cache.memoize(power_density_spectra)(signal, sampling_rate=64, method="welch")
+    assert len(list(disk_dir.glob("*.pkl"))) == 1
+
+    cache.clear(disk=True)
+    assert list(disk_dir.iterdir()) == []
+
+
+def test_spectra_cache_too_big(signal: pd.DataFrame):
+    """Results bigger than the limit aren't kept in memory"""
+    cache = SpectraCache(max_nbytes=10)
+
+    cache.memoize(fft_spectra)(signal)
+
+    assert cache.stats().entries == 0
+
+
+def test_hash_dataframe_object_columns(signal: pd.DataFrame):
+    """Columns without a plain numeric dtype are hashed by their values"""
+    labels = pd.DataFrame({"label": ["rest", "tremor"], "category": ["a", "b"]})
+    labels["category"] = labels["category"].astype("category")
+
+    assert hash_dataframe(labels) == hash_dataframe(labels.copy())
+    assert hash_dataframe(labels) != hash_dataframe(labels.replace("tremor", "walk"))
+    assert hash_dataframe(labels) != hash_dataframe(labels.replace({"category": {"b": "c"}}))
+
+
+def test_spectra_cache_key_array_parameters(signal: pd.DataFrame):
+    """Arrays are hashed by their content, not their truncated repr"""
+    cache = SpectraCache()
+    window = np.hanning(2048)
+    changed_window = window.copy()
+    changed_window[1024] = 0
+
+    def filtered_spectra(input_dataframe, window, labels=("X",)):
+        return input_dataframe
+
+    key = cache.key(filtered_spectra, signal, window)
+
+    assert repr(window) == repr(changed_window)
+    assert key == cache.key(filtered_spectra, signal, window.copy(), labels=("X",))
+    assert key != cache.key(filtered_spectra, signal, changed_window)
+    assert key != cache.key(filtered_spectra, signal, window.astype(np.float32))
+    assert key != cache.key(filtered_spectra, signal, window.reshape(2, 1024))
+    assert key != cache.key(filtered_spectra, signal, window, labels=("X", "Y"))
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.analysis.metrics import center_of_mass
+from tremana.analysis.streaming import OnlineSpectralEstimator
+from tremana.analysis.transformations import power_density_spectra
+from tremana.parsers.devices.somnowatch import iter_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch
+
+
+@pytest.mark.parametrize("chunk_size", (37, 128, 256, 1000))
+def test_online_spectral_estimator_somnowatch_stream(somnowatch_export, chunk_size: int):
+    """Streaming a recording results in the same spectra as welch on the whole recording"""
+    file_paths = somnowatch_export(2000)
+    data = read_somnowatch(file_paths)
+    estimator = OnlineSpectralEstimator(n_channels=4, sampling_rate=128, nperseg=256)
+
+    updates = [
+        update
+        for chunk in iter_somnowatch(file_paths, chunk_size=chunk_size)
+        for update in estimator.update(chunk)
+    ]
+
+    assert [update.sample for update in updates] == list(range(256, 2001, 128))
+    expected = power_density_spectra(data.iloc[:1920], sampling_rate=128, method="welch")
+    assert np.allclose(updates[-1].power_density, expected.to_numpy())
+    assert np.allclose(estimator.frequencies, expected.index)
+    assert np.allclose(updates[-1].center_of_mass, center_of_mass(expected).loc["H_cm"])
+    assert estimator.n_samples == 2000
+    first = power_density_spectra(data.iloc[:256], sampling_rate=128, method="welch")
+    assert np.allclose(updates[0].power_density, first.to_numpy())
+
+
+def test_online_spectral_estimator_latest_segments():
+    """Only the latest segments are averaged, estimates are emitted every emit_every samples"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(3000, 2)))
+    estimator = OnlineSpectralEstimator(
+        n_channels=2, nperseg=200, noverlap=150, n_segments=5, emit_every=100, norm=True
+    )
+
+    updates = estimator.update(signal)
+
+    assert [update.sample for update in updates] == list(range(200, 3001, 100))
+    expected = power_density_spectra(
+        signal.iloc[2600:], method="welch", nperseg=200, noverlap=150, norm=True
+    )
+    assert np.allclose(updates[-1].power_density, expected.to_numpy())
+
+    estimator.reset()
+    assert np.isnan(estimator.power_density).all()
+    assert estimator.update(signal.iloc[:199]) == []
+
+
+def test_online_spectral_estimator_no_drift():
+    """The running sum doesn't keep rounding errors of segments which left the average"""
+    rng = np.random.default_rng(0)
+    signal = np.concatenate([rng.normal(0, 1e8, 1000), rng.normal(0, 1e-3, 1000)])
+    estimator = OnlineSpectralEstimator(n_channels=1, nperseg=100, n_segments=3)
+    expected = OnlineSpectralEstimator(n_channels=1, nperseg=100)
+
+    estimator.update(signal)
+    expected.update(signal[-200:])
+
+    np.testing.assert_allclose(estimator.power_density, expected.power_density, rtol=1e-9)
+
+
+def test_online_spectral_estimator_errors():
+    with pytest.raises(ValueError, match="noverlap"):
+        OnlineSpectralEstimator(n_channels=1, nperseg=100, noverlap=100)
+    with pytest.raises(ValueError, match="multiple of 50"):
+        OnlineSpectralEstimator(n_channels=1, nperseg=100, emit_every=75)
+    with pytest.raises(ValueError, match="Expected blocks with 2 channels, got 1"):
+        OnlineSpectralEstimator(n_channels=2).update(np.ones(10))
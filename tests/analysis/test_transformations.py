@@ -4,8 +4,17 @@ import numpy as np
 import pandas as pd
 import pytest
 
+from tremana.analysis.transformations import _select_values
+from tremana.analysis.transformations import batch_fft_spectra
+from tremana.analysis.transformations import batch_power_density_spectra
 from tremana.analysis.transformations import fft_spectra
+from tremana.analysis.transformations import iter_windowed_spectra
 from tremana.analysis.transformations import power_density_spectra
+from tremana.analysis.transformations import stack_recordings
+from tremana.analysis.transformations import windowed_spectra
+from tremana.parsers.devices.somnowatch import iter_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch
+from tremana.recording import Recording
 
 
 @pytest.mark.parametrize("time", (30, 60, 120))
@@ -100,3 +109,266 @@ def test_power_density_spectra_normalized():
     pds_amplitude_at_frequency = result["X"].iat[result.index.get_loc(frequency, method="nearest")]
 
     assert np.allclose(pds_amplitude_at_frequency, 1)
+
+
+@pytest.mark.parametrize("n_samples", (999, 1000))
+def test_fft_spectra_multiple_columns(n_samples: int):
+    """All columns are transformed at once and match the full FFT for freq>=0"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(n_samples, 3)), columns=["X", "Y", "Z"])
+
+    result = fft_spectra(signal, columns=["Z", "X"], sampling_rate=100)
+
+    assert list(result.columns) == ["Z", "X"]
+    assert result.index[0] == 0
+    assert np.allclose(np.diff(result.index), 100 / n_samples)
+    for column in ("Z", "X"):
+        full_fft = 2 / n_samples * np.abs(np.fft.fft(signal[column]))
+        assert np.allclose(result[column], full_fft[: result.shape[0]])
+
+
+def test_windowed_spectra():
+    """Each window contains the frequency of the signal at that time"""
+    sampling_rate = 100
+    t = np.arange(60 * sampling_rate) / sampling_rate
+    signal_values = np.where(t < 30, np.sin(2 * np.pi * 4 * t), 2 * np.sin(2 * np.pi * 8 * t))
+    signal = pd.DataFrame({"X": signal_values, "Y": -signal_values}, index=t)
+
+    result = windowed_spectra(
+        signal, sampling_rate=sampling_rate, window_length=500, hop=250, window="boxcar"
+    )
+
+    assert result.values.shape == (23, 251, 2)
+    assert np.allclose(result.times, np.arange(23) * 2.5)
+    assert list(result.channels) == ["X", "Y"]
+    peak_frequencies = result.frequencies[result.values.argmax(axis=1)]
+    assert np.all(peak_frequencies[result.times < 25] == 4)
+    assert np.all(peak_frequencies[result.times >= 30] == 8)
+    assert np.allclose(result.values[0, result.frequencies == 4], 1)
+    assert np.allclose(result.values[-1, result.frequencies == 8], 2)
+
+
+def test_windowed_spectra_normalized_taper():
+    """Tapered amplitudes are corrected and default hop is half a window"""
+    sampling_rate = 128
+    t = np.arange(30 * sampling_rate) / sampling_rate
+    signal = pd.DataFrame({"X": 3 * np.sin(2 * np.pi * 5 * t)})
+
+    result = windowed_spectra(signal, sampling_rate=sampling_rate, window_length=256)
+    normalized = windowed_spectra(
+        signal, sampling_rate=sampling_rate, window_length=256, norm=True
+    )
+
+    assert np.all(np.diff(result.times) == 128)
+    assert np.allclose(result.values[:, result.frequencies == 5], 3)
+    assert np.allclose(normalized.values.max(axis=1), 1)
+
+
+def test_windowed_spectra_too_short():
+    signal = pd.DataFrame({"X": np.ones(10)})
+
+    result = windowed_spectra(signal, window_length=20)
+
+    assert result.values.shape == (0, 11, 1)
+
+
+def test_windowed_spectra_invalid_windows():
+    signal = pd.DataFrame({"X": np.ones(100)})
+
+    with pytest.raises(ValueError, match=r"hop \(0\) needs to be positive"):
+        windowed_spectra(signal, window_length=20, hop=0)
+    with pytest.raises(ValueError, match=r"window has the shape \(10,\)"):
+        windowed_spectra(signal, window_length=20, window=np.ones(10))
+    with pytest.raises(ValueError, match=r"hop \(-1\) needs to be positive"):
+        next(iter_windowed_spectra([signal], window_length=20, hop=-1))
+
+
+@pytest.mark.parametrize("time", (60, 600))
+def test_power_density_spectra_welch(time: int):
+    """Welch PDS peaks have amplitude height and fixed length independent of time"""
+    sampling_rate = 128
+    t = np.arange(time * sampling_rate) / sampling_rate
+    signal = pd.DataFrame({"X": 2 * np.sin(2 * np.pi * 5 * t), "Y": np.sin(2 * np.pi * 8 * t)})
+
+    result = power_density_spectra(
+        signal, sampling_rate=sampling_rate, method="welch", nperseg=512, noverlap=256
+    )
+    normalized = power_density_spectra(
+        signal, sampling_rate=sampling_rate, norm=True, method="welch", nperseg=512
+    )
+
+    assert result.shape == (257, 2)
+    assert np.allclose(result.at[5, "X"], 4)
+    assert np.allclose(result.at[8, "Y"], 1)
+    assert np.allclose(normalized.max(), 1)
+
+
+def test_power_density_spectra_unknown_method():
+    with pytest.raises(ValueError, match="Unknown method 'foo'"):
+        power_density_spectra(pd.DataFrame({"X": np.ones(10)}), method="foo")
+
+
+@pytest.mark.parametrize("chunk_size", (100, 333, 1000, 5000))
+def test_iter_windowed_spectra(chunk_size: int):
+    """Results for chunked data are the same as for the whole data"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(3000, 2)), columns=["X", "Y"])
+    expected = windowed_spectra(signal, window_length=256, hop=100)
+    chunks = (
+        signal.iloc[slice(start, start + chunk_size)] for start in range(0, 3000, chunk_size)
+    )
+
+    results = list(iter_windowed_spectra(chunks, window_length=256, hop=100))
+
+    assert np.array_equal(np.concatenate([result.times for result in results]), expected.times)
+    assert np.allclose(np.concatenate([result.values for result in results]), expected.values)
+    assert np.array_equal(results[0].frequencies, expected.frequencies)
+    assert list(results[0].channels) == ["X", "Y"]
+
+
+def test_float32_values_are_kept():
+    """float32 data (compact mode) result in float32 spectra"""
+    rng = np.random.default_rng(0)
+    signal = pd.DataFrame(rng.normal(size=(4096, 2)), columns=["X", "Y"])
+    compact_signal = signal.astype(np.float32)
+
+    for transformation in (
+        fft_spectra,
+        power_density_spectra,
+        lambda data: power_density_spectra(data, method="welch"),
+    ):
+        expected = transformation(signal)
+        result = transformation(compact_signal)
+
+        assert (result.dtypes == np.float32).all()
+        assert np.allclose(result, expected, rtol=1e-3, atol=1e-6)
+
+    result = windowed_spectra(compact_signal)
+    assert result.values.dtype == np.float32
+    assert np.allclose(result.values, windowed_spectra(signal).values, rtol=1e-3, atol=1e-6)
+
+
+def test_stack_recordings():
+    rng = np.random.default_rng(0)
+    recordings = [pd.DataFrame(rng.normal(size=(100, 2)), columns=["X", "Y"]) for _ in range(3)]
+
+    result = stack_recordings(recordings + [recordings[0].to_numpy()])
+
+    assert result.shape == (4, 100, 2)
+    assert np.array_equal(result[3], recordings[0].to_numpy())
+    assert stack_recordings(recordings, columns=["Y"]).shape == (3, 100, 1)
+    assert stack_recordings(result) is result
+    assert stack_recordings(np.ones((2, 3, 4), dtype=int)).dtype == np.float64
+
+    with pytest.raises(ValueError, match="same number of samples"):
+        stack_recordings([np.ones((100, 2)), np.ones((99, 2))])
+    with pytest.raises(ValueError, match="got an array with 2 dimensions"):
+        stack_recordings(np.ones((100, 2)))
+
+
+@pytest.mark.parametrize(
+    "batch_transformation, transformation",
+    (
+        (batch_fft_spectra, fft_spectra),
+        (batch_power_density_spectra, power_density_spectra),
+        (
+            lambda data, **kwargs: batch_power_density_spectra(data, method="welch", **kwargs),
+            lambda data, **kwargs: power_density_spectra(data, method="welch", **kwargs),
+        ),
+    ),
+)
+@pytest.mark.parametrize("norm", (True, False))
+def test_batch_spectra(batch_transformation, transformation, norm: bool):
+    """Batched spectra are the same as the spectra of each recording"""
+    rng = np.random.default_rng(0)
+    recordings = [pd.DataFrame(rng.normal(size=(1000, 2)), columns=["X", "Y"]) for _ in range(3)]
+
+    result = batch_transformation(recordings, sampling_rate=64, norm=norm)
+
+    for index, recording in enumerate(recordings):
+        expected = transformation(recording, sampling_rate=64, norm=norm)
+        assert np.array_equal(result.frequencies, expected.index)
+        assert np.allclose(result.values[index], expected.to_numpy())
+    frame = result.to_dataframe(recordings=["a", "b", "c"], channels=["X", "Y"])
+    assert frame.index.names == ["recording", "frequency"]
+    pd.testing.assert_frame_equal(
+        frame.loc["b"],
+        transformation(recordings[1], sampling_rate=64, norm=norm).rename_axis("frequency"),
+    )
+
+
+@pytest.mark.parametrize("batch_transformation", (batch_fft_spectra, batch_power_density_spectra))
+def test_batch_spectra_of_recordings(batch_transformation):
+    """The sample rate of recordings is used unless it is passed explicitly"""
+    rng = np.random.default_rng(0)
+    recordings = [Recording(rng.normal(size=(1000, 2)), sample_rate=64) for _ in range(2)]
+
+    result = batch_transformation(iter(recordings))
+
+    assert result.frequencies[-1] == 32
+    assert batch_transformation(recordings, sampling_rate=128).frequencies[-1] == 64
+    assert batch_transformation(np.stack([rng.normal(size=(1000, 2))])).frequencies[-1] == 64
+    with pytest.raises(ValueError, match=r"same sample rate, got the sample rates \[32, 64\]"):
+        batch_transformation([recordings[0], Recording(recordings[1].values, sample_rate=32)])
+
+
+@pytest.mark.parametrize(
+    "transformation",
+    (
+        fft_spectra,
+        power_density_spectra,
+        lambda data, **kwargs: power_density_spectra(data, method="welch", **kwargs),
+    ),
+)
+def test_spectra_of_recording(transformation):
+    """Recordings give the same spectra as dataframes and provide their sample rate"""
+    rng = np.random.default_rng(0)
+    recording = Recording(rng.normal(size=(1000, 3)), channels=["X", "Y", "Z"], sample_rate=64)
+
+    result = transformation(recording)
+
+    pd.testing.assert_frame_equal(result, transformation(recording.to_pandas(), sampling_rate=64))
+    pd.testing.assert_frame_equal(
+        transformation(recording, columns=["Z", "X"], sampling_rate=32),
+        transformation(recording.to_pandas()[["Z", "X"]], sampling_rate=32),
+    )
+    with pytest.raises(KeyError):
+        transformation(recording, columns=["typo"])
+
+
+def test_select_values_of_recording_is_zero_copy():
+    recording = Recording(np.zeros((100, 2), dtype=np.float32), sample_rate=64)
+
+    values, channels = _select_values(recording)
+
+    assert values is recording.values
+    assert list(channels) == [0, 1]
+    assert _select_values(Recording(np.zeros((10, 1), dtype=int)))[0].dtype == np.float64
+
+
+def test_windowed_spectra_of_recording():
+    rng = np.random.default_rng(0)
+    recording = Recording(
+        rng.normal(size=(1000, 2)), sample_rate=100, start_date=pd.Timestamp("2021-01-01")
+    )
+
+    result = windowed_spectra(recording, window_length=200, hop=100)
+    expected = windowed_spectra(recording.to_pandas(), sampling_rate=100, window_length=200)
+
+    pd.testing.assert_index_equal(result.times, expected.times)
+    assert np.array_equal(result.frequencies, expected.frequencies)
+    assert np.allclose(result.values, expected.values)
+    assert stack_recordings([recording, recording]).shape == (2, 1000, 2)
+
+
+def test_spectra_use_sample_rate_attribute(somnowatch_export):
+    """The sample rate stored by the readers is used unless it is passed explicitly"""
+    file_paths = somnowatch_export(1024, sample_rate=64)
+    data = read_somnowatch(file_paths)
+
+    assert fft_spectra(data).index[-1] == 32
+    assert fft_spectra(data, sampling_rate=128).index[-1] == 64
+    assert power_density_spectra(read_somnowatch(file_paths, compact=True)).index[-1] == 32
+    assert batch_fft_spectra([data, data]).frequencies[-1] == 32
+    spectra = next(iter_windowed_spectra(iter_somnowatch(file_paths), window_length=256))
+    assert spectra.frequencies[-1] == 32
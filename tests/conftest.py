@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Callable
+from typing import Iterable
+
+import numpy as np
+import pytest
+from tests.somnowatch_helper import SOMNOWATCH_SIGNAL_TYPES
+from tests.somnowatch_helper import write_somnowatch_file
+
+
+@pytest.fixture
+def somnowatch_export(tmp_path: Path) -> Callable[..., list[Path]]:
+    """Factory to create a somnowatch export with one file per signal type."""
+
+    def factory(
+        n_samples: int = 256,
+        *,
+        directory: Path = tmp_path,
+        signal_types: Iterable[str] = SOMNOWATCH_SIGNAL_TYPES,
+        seed: int = 0,
+        **kwargs,
+    ) -> list[Path]:
+        directory.mkdir(parents=True, exist_ok=True)
+        rng = np.random.default_rng(seed)
+        return [
+            write_somnowatch_file(
+                directory / f"{signal_type}.txt",
+                signal_type=signal_type,
+                values=np.round(rng.normal(0, 100, n_samples), 1),
+                **kwargs,
+            )
+            for signal_type in signal_types
+        ]
+
+    return factory
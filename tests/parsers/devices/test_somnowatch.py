@@ -1,14 +1,38 @@
 """Testmodule for the somowatch parser"""
+from __future__ import annotations
+
 import re
+import warnings
 from datetime import datetime
+from pathlib import Path
 from textwrap import dedent
 from typing import Union
 
+import numpy as np
+import pandas as pd
 import pytest
+from tests.somnowatch_helper import write_somnowatch_file
 
+from tremana.exceptions import TremanaParsingDataLengthException
+from tremana.exceptions import TremanaParsingException
+from tremana.exceptions import TremanaParsingMixedSampleRatesException
+from tremana.parsers.devices import somnowatch
 from tremana.parsers.devices.somnowatch import SOMNOWATCH_TYPE_MAPPING
+from tremana.parsers.devices.somnowatch import SomnoWatchMetaData
 from tremana.parsers.devices.somnowatch import _somnowatch_parse_header
+from tremana.parsers.devices.somnowatch import _somnowatch_parse_start_date
+from tremana.parsers.devices.somnowatch import _somnowatch_read_data
+from tremana.parsers.devices.somnowatch import _somnowatch_time_index
+from tremana.parsers.devices.somnowatch import iter_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch_recording
+from tremana.parsers.devices.somnowatch import somnowatch_metadata_report
+from tremana.parsers.devices.somnowatch import somnowatch_time_index
+from tremana.recording import Recording
+from tremana.warnings import TremanaBaseWarning
 from tremana.warnings import TremanaParsingIgnoredSignalTypeWarning
+from tremana.warnings import TremanaParsingInconsistentMetadataWarning
+from tremana.warnings import TremanaParsingIncorrectDateFormatWarning
 
 
 def dummy_header(
@@ -78,3 +102,361 @@ def test_somnowatch_parse_header_unsupported_signal_type(origin_file):
         result = _somnowatch_parse_header(header_lines, origin_file=origin_file)
     for result_item, expected_item in zip(result, expected):
         assert result_item == expected_item
+
+
+def test_somnowatch_time_index():
+    result = _somnowatch_time_index(pd.Timestamp("2021-01-18 22:00:00"), 128, 257)
+
+    assert result.name == "time"
+    assert result[0] == pd.Timestamp("2021-01-18 22:00:00")
+    assert result[128] == pd.Timestamp("2021-01-18 22:00:01")
+    assert result[-1] == pd.Timestamp("2021-01-18 22:00:02")
+
+
+def test_somnowatch_parse_start_date_wrong_format():
+    with pytest.warns(TremanaParsingIncorrectDateFormatWarning, match="2021-01-18"):
+        result = _somnowatch_parse_start_date("2021-01-18 22:00:00")
+
+    assert result == pd.Timestamp("2021-01-18 22:00:00")
+
+
+@pytest.mark.parametrize("chunk_size", (7, 2**20))
+def test_somnowatch_read_data(tmp_path: Path, chunk_size: int):
+    values = [1.5, -2.25, 3, 0]
+    file_path = write_somnowatch_file(tmp_path / "x.txt", signal_type="X_AC_Type", values=values)
+    metadata = SomnoWatchMetaData("X", "18.01.2021 22:00:00", 128, 4, "mg")
+
+    result = _somnowatch_read_data(file_path, metadata, chunk_size=chunk_size)
+
+    assert result.dtype == np.float64
+    assert np.array_equal(result, values)
+
+
+@pytest.mark.parametrize("header_length", (3, 5))
+def test_somnowatch_read_data_length_mismatch(tmp_path: Path, header_length: int):
+    file_path = write_somnowatch_file(
+        tmp_path / "x.txt", signal_type="X_AC_Type", values=[1, 2, 3, 4], length=header_length
+    )
+    metadata = SomnoWatchMetaData("X", "18.01.2021 22:00:00", 128, header_length, "mg")
+
+    with pytest.raises(TremanaParsingDataLengthException, match="length of"):
+        _somnowatch_read_data(file_path, metadata, chunk_size=2)
+
+
+@pytest.mark.parametrize("workers", (1, 4, None))
+def test_read_somnowatch(somnowatch_export, workers: int | None):
+    file_paths = somnowatch_export(300)
+    file_paths.append(
+        write_somnowatch_file(
+            file_paths[0].parent / "light.txt", signal_type="Light_Type", values=[1] * 300
+        )
+    )
+
+    result = read_somnowatch(file_paths, workers=workers)
+
+    assert list(result.columns) == [
+        f"{signal_type} amplitude in mg" for signal_type in ("X", "Y", "Z", "Mag")
+    ]
+    assert result.shape == (300, 4)
+    assert result.index[0] == pd.Timestamp("2021-01-18 22:00:00")
+    assert result.index[-1] == pd.Timestamp("2021-01-18 22:00:00") + pd.Timedelta(
+        seconds=299 / 128
+    )
+    expected = pd.read_csv(
+        file_paths[0], skiprows=7, decimal=",", sep=";", names=["time", "value"]
+    )
+    assert np.array_equal(result.iloc[:, 0], expected["value"])
+
+
+def test_read_somnowatch_unaligned_channels(somnowatch_export, tmp_path: Path):
+    """Channels with differing start dates are aligned by time"""
+    file_paths = somnowatch_export(128, signal_types=("X_AC_Type",))
+    file_paths += somnowatch_export(
+        128, signal_types=("Y_AC_Type",), start_date="18.01.2021 22:00:01"
+    )
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning):
+        result = read_somnowatch(file_paths, workers=2)
+
+    assert result.shape == (256, 2)
+    assert result["X amplitude in mg"].notna().sum() == 128
+    assert result["Y amplitude in mg"].first_valid_index() == pd.Timestamp("2021-01-18 22:00:01")
+
+
+def test_read_somnowatch_compact(somnowatch_export):
+    """Compact data use less memory and contain the same values"""
+    file_paths = somnowatch_export(1000)
+    expected = read_somnowatch(file_paths)
+
+    result = read_somnowatch(file_paths, compact=True)
+
+    assert (result.dtypes == np.float32).all()
+    assert isinstance(result.index, pd.RangeIndex)
+    assert isinstance(result.columns, pd.CategoricalIndex)
+    assert result.memory_usage(deep=True).sum() < expected.memory_usage(deep=True).sum() / 2
+    assert result.attrs == {"sample_rate": 128, "start_date": pd.Timestamp("2021-01-18 22:00:00")}
+    pd.testing.assert_index_equal(somnowatch_time_index(result), expected.index, exact=False)
+    assert np.allclose(result.to_numpy(), expected.to_numpy())
+
+
+def test_read_somnowatch_compact_unaligned_channels(somnowatch_export):
+    """Compact channels with differing start dates are aligned by sample number"""
+    file_paths = somnowatch_export(128, signal_types=("X_AC_Type",))
+    file_paths += somnowatch_export(
+        128, signal_types=("Y_AC_Type",), start_date="18.01.2021 22:00:01"
+    )
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning):
+        result = read_somnowatch(file_paths, compact=True)
+
+    assert result.shape == (256, 2)
+    assert result["Y amplitude in mg"].first_valid_index() == 128
+    assert somnowatch_time_index(result)[128] == pd.Timestamp("2021-01-18 22:00:01")
+
+
+def test_read_somnowatch_compact_parses_float32(somnowatch_export, monkeypatch):
+    """Compact values are parsed into float32 without a float64 copy of the channel"""
+    file_paths = somnowatch_export(300)
+    dtypes = []
+
+    def read_data(*args, dtype, **kwargs):
+        dtypes.append(dtype)
+        return _somnowatch_read_data(*args, dtype=dtype, **kwargs)
+
+    monkeypatch.setattr(somnowatch, "_somnowatch_read_data", read_data)
+    result = read_somnowatch(file_paths, compact=True)
+
+    assert dtypes == [np.float32] * 4
+    assert (result.dtypes == np.float32).all()
+
+
+def test_read_somnowatch_only_ignored_signal_types(somnowatch_export):
+    file_paths = somnowatch_export(10, signal_types=("Light_Type", "Accu_Type"))
+
+    with pytest.raises(TremanaParsingException, match="ignored signal types"):
+        read_somnowatch(file_paths)
+
+
+def test_read_somnowatch_compact_mixed_sample_rates(somnowatch_export):
+    """Compact channels with differing sample rates can't share a sample number index"""
+    file_paths = somnowatch_export(128, signal_types=("X_AC_Type", "Y_AC_Type"))
+    file_paths += somnowatch_export(64, signal_types=("Z_AC_Type",), sample_rate=64)
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning), pytest.raises(
+        TremanaParsingMixedSampleRatesException, match=r"Z_AC_Type\.txt"
+    ):
+        read_somnowatch(file_paths, compact=True)
+
+
+@pytest.mark.parametrize("workers", (1, 2))
+def test_read_somnowatch_recording(somnowatch_export, workers: int):
+    """A recording contains the same data as the dataframe of read_somnowatch"""
+    file_paths = somnowatch_export(300)
+    expected = read_somnowatch(file_paths)
+
+    result = read_somnowatch_recording(file_paths, workers=workers)
+
+    assert result.values.flags.f_contiguous
+    assert result.sample_rate == 128
+    assert result.metadata["X amplitude in mg"].signal_type == "X"
+    pd.testing.assert_frame_equal(result.to_pandas(), expected, check_freq=False)
+    pd.testing.assert_frame_equal(
+        read_somnowatch_recording(file_paths, dtype=np.float32).to_pandas(compact=True),
+        read_somnowatch(file_paths, compact=True),
+    )
+
+
+@pytest.mark.parametrize("align", (True, False))
+def test_read_somnowatch_recording_only_ignored_signal_types(somnowatch_export, align: bool):
+    file_paths = somnowatch_export(10, signal_types=("Light_Type",))
+
+    with pytest.raises(TremanaParsingException, match="ignored signal types"):
+        read_somnowatch_recording(file_paths, align=align)
+
+
+def test_read_somnowatch_recording_unaligned_channels(somnowatch_export, tmp_path: Path):
+    """Channels with differing start dates are aligned by sample number and can be saved"""
+    file_paths = somnowatch_export(128, signal_types=("X_AC_Type",))
+    file_paths += somnowatch_export(
+        128, signal_types=("Y_AC_Type",), start_date="18.01.2021 22:00:01"
+    )
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning):
+        result = read_somnowatch_recording(file_paths, out_path=tmp_path / "recording")
+
+    assert isinstance(result.values, np.memmap)
+    assert result.values.shape == (256, 2)
+    assert np.isnan(result["Y amplitude in mg"][:128]).all()
+    assert np.isnan(result["X amplitude in mg"][128:]).all()
+    assert result.time_index()[128] == pd.Timestamp("2021-01-18 22:00:01")
+    np.testing.assert_array_equal(Recording.load(tmp_path / "recording").values, result.values)
+
+
+def test_read_somnowatch_recording_align(somnowatch_export, tmp_path: Path):
+    """Channels with differing sample rates and start dates are aligned without warnings"""
+    file_paths = somnowatch_export(256, signal_types=("X_AC_Type", "Y_AC_Type"))
+    file_paths += somnowatch_export(
+        64, signal_types=("Z_AC_Type",), start_date="18.01.2021 22:00:01", sample_rate=64
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", TremanaParsingInconsistentMetadataWarning)
+        result = read_somnowatch_recording(file_paths, align=True, out_path=tmp_path / "rec")
+
+    assert result.sample_rate == 128
+    assert result.start_date == pd.Timestamp("2021-01-18 22:00:01")
+    assert result.values.shape == (128, 3)
+    np.testing.assert_array_equal(
+        result["X amplitude in mg"], read_somnowatch(file_paths[:1])["X amplitude in mg"][128:]
+    )
+    assert result.metadata["Z amplitude in mg"].sample_rate == 64
+    assert Recording.load(tmp_path / "rec").values.shape == (128, 3)
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning), pytest.raises(
+        TremanaParsingMixedSampleRatesException, match=r"Z_AC_Type\.txt"
+    ):
+        read_somnowatch_recording(file_paths)
+
+
+def test_read_somnowatch_cache(somnowatch_export, tmp_path: Path, monkeypatch):
+    """Cached files are neither parsed nor opened, changed files are parsed again"""
+    file_paths = somnowatch_export(300)
+    cache_dir = tmp_path / "cache"
+    expected = read_somnowatch(file_paths, cache_dir=cache_dir)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Cached file was read.")
+
+    with monkeypatch.context() as context:
+        context.setattr(somnowatch, "_somnowatch_read_data", fail)
+        context.setattr(somnowatch, "lazy_read_headers", lambda file_paths, **_: [])
+        result = read_somnowatch(file_paths, cache_dir=cache_dir)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+    write_somnowatch_file(file_paths[0], signal_type="X_AC_Type", values=range(300))
+    result = read_somnowatch(file_paths, cache_dir=cache_dir)
+
+    assert np.array_equal(result["X amplitude in mg"], np.arange(300))
+    pd.testing.assert_frame_equal(result.iloc[:, 1:], expected.iloc[:, 1:])
+
+
+def test_iter_somnowatch(somnowatch_export):
+    file_paths = somnowatch_export(300)
+    expected = read_somnowatch(file_paths)
+
+    chunks = list(iter_somnowatch(file_paths, chunk_size=128))
+
+    assert [chunk.shape for chunk in chunks] == [(128, 4), (128, 4), (44, 4)]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_freq=False)
+
+
+def test_iter_somnowatch_compact(somnowatch_export):
+    file_paths = somnowatch_export(300)
+    expected = read_somnowatch(file_paths, compact=True)
+
+    chunks = list(iter_somnowatch(file_paths, chunk_size=128, compact=True))
+
+    assert chunks[1].index[0] == 128
+    assert chunks[1].attrs == expected.attrs
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_index_type=False)
+
+
+def test_iter_somnowatch_unequal_lengths(somnowatch_export):
+    """Channels ending earlier are padded with NaN instead of truncating the others"""
+    file_paths = somnowatch_export(300, signal_types=("X_AC_Type",))
+    file_paths += somnowatch_export(200, signal_types=("Y_AC_Type",))
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning):
+        result = pd.concat(iter_somnowatch(file_paths, chunk_size=128))
+
+    assert result.shape == (300, 2)
+    assert result["X amplitude in mg"].notna().all()
+    assert result["Y amplitude in mg"].iloc[:200].notna().all()
+    assert result["Y amplitude in mg"].iloc[200:].isna().all()
+
+
+def test_iter_somnowatch_invalid_exports(somnowatch_export, tmp_path: Path):
+    """Exports which can't be read in lock step raise instead of yielding wrong chunks"""
+    file_paths = somnowatch_export(300, directory=tmp_path / "length", length=256)
+    with pytest.raises(TremanaParsingDataLengthException, match="length of 256"):
+        list(iter_somnowatch(file_paths, chunk_size=128))
+
+    file_paths = somnowatch_export(
+        256, directory=tmp_path / "rates", signal_types=("X_AC_Type", "Y_AC_Type")
+    )
+    file_paths += somnowatch_export(
+        128, directory=tmp_path / "rates", signal_types=("Z_AC_Type",), sample_rate=64
+    )
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning), pytest.raises(
+        TremanaParsingMixedSampleRatesException, match=r"Z_AC_Type\.txt"
+    ):
+        list(iter_somnowatch(file_paths))
+
+    file_paths = somnowatch_export(
+        10, directory=tmp_path / "ignored", signal_types=("Light_Type",)
+    )
+    with pytest.raises(TremanaParsingException, match="ignored signal types"):
+        list(iter_somnowatch(file_paths))
+
+
+def test_somnowatch_metadata_report(somnowatch_export, tmp_path: Path):
+    """Deviations are reported per recording without warnings"""
+    file_paths = somnowatch_export(10, directory=tmp_path / "a")
+    file_paths += somnowatch_export(10, directory=tmp_path / "b", sample_rate=64)
+    file_paths += somnowatch_export(10, directory=tmp_path / "c")
+    write_somnowatch_file(
+        tmp_path / "b" / "Y_AC_Type.txt", signal_type="Y_AC_Type", values=range(11)
+    )
+    write_somnowatch_file(
+        tmp_path / "c" / "Z_AC_Type.txt",
+        signal_type="Z_AC_Type",
+        values=range(10),
+        start_date="18.01.2021 22:00:01",
+        unit="g",
+    )
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", TremanaBaseWarning)
+        result = somnowatch_metadata_report(file_paths, max_workers=4)
+
+    assert list(result.columns) == [
+        "file",
+        "recording",
+        "metadata_name",
+        "actual_value",
+        "expected_value",
+    ]
+    assert result[["file", "metadata_name"]].to_numpy().tolist() == [
+        [str(tmp_path / "b" / "Y_AC_Type.txt"), "sample_rate"],
+        [str(tmp_path / "b" / "Y_AC_Type.txt"), "length"],
+        [str(tmp_path / "c" / "Z_AC_Type.txt"), "start_date"],
+        [str(tmp_path / "c" / "Z_AC_Type.txt"), "unit"],
+    ]
+    assert result["recording"].tolist() == [str(tmp_path / "b")] * 2 + [str(tmp_path / "c")] * 2
+    assert result["actual_value"].tolist()[:2] == [128, 11]
+    assert result["expected_value"].tolist()[:2] == [64, 10]
+
+
+def test_somnowatch_metadata_report_consistent(somnowatch_export):
+    result = somnowatch_metadata_report(somnowatch_export(10))
+
+    assert result.shape == (0, 5)
+
+
+def test_read_somnowatch_inconsistent_metadata_warnings(somnowatch_export, tmp_path: Path):
+    file_paths = somnowatch_export(10)
+    write_somnowatch_file(
+        file_paths[1], signal_type="Y_AC_Type", values=range(10), sample_rate=64, unit="g"
+    )
+
+    with pytest.warns(TremanaParsingInconsistentMetadataWarning) as record:
+        read_somnowatch(file_paths)
+
+    messages = [
+        str(warning.message)
+        for warning in record
+        if warning.category is TremanaParsingInconsistentMetadataWarning
+    ]
+    assert len(messages) == 2
+    assert "'sample_rate' was of value 64.0 while other files have the value 128.0" in messages[0]
+    assert "'unit' was of value 'g'" in messages[1]
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from tests.somnowatch_helper import write_somnowatch_file
+
+from tremana.parsers import catalog as catalog_module
+from tremana.parsers.catalog import SomnoWatchCatalog
+from tremana.parsers.catalog import _read_catalog_header
+
+
+@pytest.fixture
+def archive(somnowatch_export, tmp_path: Path) -> Path:
+    archive = tmp_path / "archive"
+    somnowatch_export(128 * 60, directory=archive / "short")
+    somnowatch_export(64 * 120, directory=archive / "slow", sample_rate=64)
+    somnowatch_export(128 * 120, directory=archive / "long")
+    write_somnowatch_file(archive / "long" / "light.txt", signal_type="Light_Type", values=[1])
+    (archive / "long" / "notes.txt").write_text("not an export")
+    (archive / "long" / "binary.txt").write_bytes(bytes(range(256)) * 64)
+    return archive
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_somnowatch_catalog_query(archive: Path, tmp_path: Path, max_workers: int):
+    with SomnoWatchCatalog(tmp_path / "catalog.sqlite") as catalog:
+        assert catalog.update(archive, max_workers=max_workers) == 13
+
+        files = catalog.query()
+        recordings = catalog.query(
+            sample_rate=128, min_duration=90, signal_types=("X", "Y", "Z"), by_recording=True
+        )
+
+    assert files.shape[0] == 13
+    assert set(files["signal_type"]) == {"X", "Y", "Z", "Mag", "Light_Type"}
+    assert files["start_date"].iat[0] == pd.Timestamp("2021-01-18 22:00:00")
+    assert recordings["recording"].tolist() == [str((archive / "long").resolve())]
+    assert recordings["n_files"].tolist() == [3]
+    assert recordings["duration"].tolist() == [120]
+
+
+def test_somnowatch_catalog_incremental_update(archive: Path, tmp_path: Path, monkeypatch):
+    """Only new or modified files are read, deleted files are removed"""
+    database = tmp_path / "catalog.sqlite"
+    with SomnoWatchCatalog(database) as catalog:
+        catalog.update(archive)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("Unchanged file was read.")
+
+    with SomnoWatchCatalog(database) as catalog:
+        with monkeypatch.context() as context:
+            context.setattr(catalog_module, "_read_catalog_header", fail)
+            assert catalog.update(archive) == 0
+
+        x_file = archive / "short" / "X_AC_Type.txt"
+        write_somnowatch_file(x_file, signal_type="X_AC_Type", values=range(10))
+        stat_result = os.stat(x_file)
+        os.utime(x_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+        (archive / "slow" / "Y_AC_Type.txt").unlink()
+
+        assert catalog.update(archive) == 1
+        files = catalog.query().set_index("path")
+
+    assert files.shape[0] == 12
+    assert files.at[str(x_file.resolve()), "length"] == 10
+    assert str((archive / "slow" / "Y_AC_Type.txt").resolve()) not in files.index
+
+
+def test_somnowatch_catalog_skipped_files(archive: Path, tmp_path: Path):
+    """Exports which become unparsable are removed and unreadable files are skipped"""
+    x_file = archive / "short" / "X_AC_Type.txt"
+    with SomnoWatchCatalog(tmp_path / "catalog.sqlite") as catalog:
+        catalog.update(archive)
+        x_file.write_bytes(b"\xff\xfe" * 100)
+
+        assert catalog.update(archive) == 0
+        files = catalog.query()
+
+    assert files.shape[0] == 12
+    assert str(x_file.resolve()) not in set(files["path"])
+    assert _read_catalog_header(str(tmp_path / "deleted.txt")) is None
+    header_lines = _read_catalog_header(str(x_file))
+    assert header_lines is not None
+    assert header_lines[0].startswith("\ufffd")
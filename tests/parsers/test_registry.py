@@ -0,0 +1,128 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import tremana
+from tremana.exceptions import TremanaParsingMixedDevicesException
+from tremana.exceptions import TremanaParsingUnknownDeviceException
+from tremana.parsers import registry
+from tremana.parsers.devices.somnowatch import read_somnowatch
+from tremana.parsers.registry import get_parser
+from tremana.parsers.registry import group_by_device
+from tremana.parsers.registry import read_by_device
+from tremana.parsers.registry import register_parser
+from tremana.parsers.registry import sniff_device
+from tremana.warnings import TremanaParsingUnknownDeviceWarning
+
+
+@pytest.fixture
+def fake_device(monkeypatch: pytest.MonkeyPatch):
+    """Register a fake device, which files start with 'FAKE'."""
+    monkeypatch.setattr(registry, "DEVICE_PARSERS", registry._load_builtin_parsers().copy())
+    register_parser(
+        "fake",
+        sniff=lambda header_lines: header_lines[0] == "FAKE",
+        read=lambda file_paths: pd.DataFrame({"n_files": [len(file_paths)]}),
+        header_lines=1,
+    )
+
+
+def test_sniff_device():
+    assert sniff_device(["Signal Type: X_Type", "Start Time: 01.01.2021 00:00:00"]) == "somnowatch"
+    assert sniff_device(["Signal Type: X_Type"]) is None
+    assert sniff_device([""]) is None
+
+
+@pytest.mark.parametrize("max_workers", (1, 4))
+def test_group_by_device(somnowatch_export, fake_device, tmp_path: Path, max_workers: int):
+    file_paths = somnowatch_export()
+    (tmp_path / "fake.dat").write_text("FAKE\n1\n2")
+    (tmp_path / "notes.txt").write_text("not an export")
+    (tmp_path / "image.bin").write_bytes(b"\x00\xff\xfe" * 1000)
+
+    groups = group_by_device(sorted(tmp_path.iterdir()), max_workers=max_workers)
+
+    assert groups == {
+        None: [tmp_path / "image.bin", tmp_path / "notes.txt"],
+        "fake": [tmp_path / "fake.dat"],
+        "somnowatch": sorted(file_paths),
+    }
+
+
+def test_group_by_device_loads_parsers_once(somnowatch_export, monkeypatch):
+    """The registered parsers are resolved once and not per file"""
+    file_paths = somnowatch_export()
+    load_builtin_parsers = registry._load_builtin_parsers
+    calls = []
+
+    def counting_load_builtin_parsers():
+        calls.append(None)
+        return load_builtin_parsers()
+
+    monkeypatch.setattr(registry, "_load_builtin_parsers", counting_load_builtin_parsers)
+
+    assert list(group_by_device(file_paths)) == ["somnowatch"]
+    assert len(calls) == 1
+
+
+def test_get_parser():
+    assert get_parser("somnowatch").read is read_somnowatch
+    assert get_parser("somnowatch").read_recording is not None
+    with pytest.raises(KeyError, match="No parser is registered for the device 'foo'"):
+        get_parser("foo")
+
+
+def test_read(somnowatch_export, tmp_path: Path):
+    file_paths = sorted(somnowatch_export())
+    (tmp_path / "image.bin").write_bytes(b"\x00\xff\xfe" * 1000)
+
+    with pytest.warns(TremanaParsingUnknownDeviceWarning) as record:
+        result = tremana.read(tmp_path)
+
+    (unknown_device_warning,) = (
+        warning for warning in record if warning.category is TremanaParsingUnknownDeviceWarning
+    )
+    assert "image.bin" in str(unknown_device_warning.message)
+    pd.testing.assert_frame_equal(result, read_somnowatch(file_paths))
+    pd.testing.assert_frame_equal(
+        tremana.read(tmp_path, pattern="*.txt", compact=True),
+        read_somnowatch(file_paths, compact=True),
+    )
+
+
+def test_read_single_file(somnowatch_export):
+    file_path, *_ = somnowatch_export()
+
+    pd.testing.assert_frame_equal(tremana.read(file_path), read_somnowatch([file_path]))
+
+
+def test_read_unknown_device(tmp_path: Path):
+    (tmp_path / "notes.txt").write_text("not an export")
+
+    with pytest.raises(TremanaParsingUnknownDeviceException, match="'somnowatch'"):
+        tremana.read(tmp_path)
+    with pytest.raises(TremanaParsingUnknownDeviceException):
+        tremana.read(tmp_path / "notes.txt")
+
+
+def test_read_mixed_devices(somnowatch_export, fake_device, tmp_path: Path):
+    somnowatch_export()
+    (tmp_path / "fake.dat").write_text("FAKE\n1\n2")
+
+    with pytest.raises(TremanaParsingMixedDevicesException, match=r"\['fake', 'somnowatch'\]"):
+        tremana.read(tmp_path)
+    assert tremana.read(tmp_path, pattern="*.dat").equals(pd.DataFrame({"n_files": [1]}))
+
+
+def test_read_by_device(somnowatch_export, fake_device, tmp_path: Path):
+    """Each device in a folder is read by its own parser"""
+    file_paths = sorted(somnowatch_export())
+    (tmp_path / "fake.dat").write_text("FAKE\n1\n2")
+
+    result = read_by_device(tmp_path)
+
+    assert sorted(result) == ["fake", "somnowatch"]
+    assert result["fake"].equals(pd.DataFrame({"n_files": [1]}))
+    pd.testing.assert_frame_equal(result["somnowatch"], read_somnowatch(file_paths))
+    assert list(read_by_device(tmp_path, pattern="*.txt")) == ["somnowatch"]
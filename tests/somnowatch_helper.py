@@ -0,0 +1,44 @@
+"""Helper to create files in the format of somnowatch exports."""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+SOMNOWATCH_SIGNAL_TYPES = ("X_AC_Type", "Y_AC_Type", "Z_AC_Type", "Mag_Type")
+
+
+def write_somnowatch_file(
+    file_path: Path,
+    *,
+    signal_type: str,
+    values: Iterable[float],
+    start_date: str = "18.01.2021 22:00:00",
+    sample_rate: int | float = 128,
+    length: int | None = None,
+    unit: str = "mg",
+) -> Path:
+    """Write a file in the format of a somnowatch export."""
+    values = np.asarray(values, dtype=float)
+    if length is None:
+        length = values.size
+    times = pd.to_datetime(start_date, format="%d.%m.%Y %H:%M:%S") + pd.to_timedelta(
+        np.arange(values.size) / sample_rate, unit="s"
+    )
+    lines = [
+        f"Signal Type: {signal_type}",
+        f"Start Time: {start_date}",
+        f"Sample Rate: {sample_rate}",
+        f"Length: {length}",
+        f"Unit: {unit}",
+        "",
+        "Data:",
+    ]
+    lines += [
+        f"{time.strftime('%H:%M:%S')},{time.microsecond // 1000:03d}; {value:g}".replace(".", ",")
+        for time, value in zip(times, values)
+    ]
+    file_path.write_text("\n".join(lines) + "\n")
+    return file_path
@@ -4,8 +4,12 @@ from textwrap import dedent
 import pytest
 
 from tremana.exceptions import TremanaException
+from tremana.exceptions import TremanaParsingDataLengthException
 from tremana.exceptions import TremanaParsingException
+from tremana.exceptions import TremanaParsingMixedDevicesException
+from tremana.exceptions import TremanaParsingMixedSampleRatesException
 from tremana.exceptions import TremanaParsingSampleRateException
+from tremana.exceptions import TremanaParsingUnknownDeviceException
 
 
 def test_TremanaException():
@@ -60,3 +64,72 @@ def test_TremanaParsingSampleRateException():
         ),
     ):
         raise TremanaParsingSampleRateException(sample_rate="1.2abc", origin_file="foo.txt")
+
+
+@pytest.mark.parametrize("actual_length, expected_str", ((None, "more than 10"), (5, "5")))
+def test_TremanaParsingDataLengthException(actual_length, expected_str):
+    with pytest.raises(
+        TremanaParsingDataLengthException,
+        match=dedent(
+            f"""\
+            The header states a length of 10 samples, but the data contain {expected_str} samples\\.
+
+            This Error was caused processing:
+                foo\\.txt
+
+            If you encounter a bug please open an issue at https://git\\.io/JtCN6\\."""  # noqa: E501
+        ),
+    ):
+        raise TremanaParsingDataLengthException(
+            expected_length=10, actual_length=actual_length, origin_file="foo.txt"
+        )
+
+
+def test_TremanaParsingUnknownDeviceException():
+    with pytest.raises(
+        TremanaParsingUnknownDeviceException,
+        match=dedent(
+            """\
+            The header doesn't match any of the supported devices \\['bar', 'foo'\\], so the file can't be read\\.
+
+            This Error was caused processing:
+                foo\\.txt
+
+            If you encounter a bug please open an issue at https://git\\.io/JtCN6\\."""  # noqa: E501
+        ),
+    ):
+        raise TremanaParsingUnknownDeviceException(devices=("foo", "bar"), origin_file="foo.txt")
+
+
+def test_TremanaParsingMixedDevicesException():
+    with pytest.raises(
+        TremanaParsingMixedDevicesException,
+        match=dedent(
+            """\
+            The files were created by different devices \\['bar', 'foo'\\], but a recording can only be read from the files of a single device\\.
+
+            This Error was caused processing:
+                foo
+
+            If you encounter a bug please open an issue at https://git\\.io/JtCN6\\."""  # noqa: E501
+        ),
+    ):
+        raise TremanaParsingMixedDevicesException(devices=("foo", "bar"), origin_file="foo")
+
+
+def test_TremanaParsingMixedSampleRatesException():
+    with pytest.raises(
+        TremanaParsingMixedSampleRatesException,
+        match=dedent(
+            """\
+            The channels have different sample rates \\[64.0, 128.0\\], so their samples can't be indexed by a common sample number\\. Align the channels to resample them to a common sample rate\\.
+
+            This Error was caused processing:
+                foo\\.txt
+
+            If you encounter a bug please open an issue at https://git\\.io/JtCN6\\."""  # noqa: E501
+        ),
+    ):
+        raise TremanaParsingMixedSampleRatesException(
+            sample_rates=(128.0, 64.0, 128.0), origin_file="foo.txt"
+        )
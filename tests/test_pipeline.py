@@ -0,0 +1,142 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.parsers import registry
+from tremana.parsers.registry import register_parser
+from tremana.pipeline import analyze_cohort
+from tremana.pipeline import analyze_recording
+from tremana.pipeline import combine_recording_results
+from tremana.pipeline import find_recordings
+
+
+@pytest.fixture
+def fake_device(monkeypatch: pytest.MonkeyPatch):
+    """Register a fake device, which files start with 'FAKE' followed by one value per line."""
+    monkeypatch.setattr(registry, "DEVICE_PARSERS", registry._load_builtin_parsers().copy())
+
+    def read(file_paths):
+        data = pd.DataFrame(
+            {file_path.stem: np.loadtxt(file_path, skiprows=1) for file_path in sorted(file_paths)}
+        )
+        data.attrs["sample_rate"] = 32
+        return data
+
+    register_parser("fake", sniff=lambda header_lines: header_lines[0] == "FAKE", read=read)
+
+
+def write_fake_file(file_path: Path, n_samples: int = 320) -> None:
+    rng = np.random.default_rng(0)
+    file_path.write_text("FAKE\n" + "\n".join(map(str, rng.normal(size=n_samples))))
+
+
+def test_find_recordings(somnowatch_export, fake_device, tmp_path: Path):
+    somnowatch_export(10, directory=tmp_path / "b")
+    somnowatch_export(10, directory=tmp_path / "a" / "nested")
+    (tmp_path / "a" / "notes.md").write_text("not an export")
+    write_fake_file(tmp_path / "b" / "wrist.dat")
+
+    result = find_recordings(tmp_path)
+
+    assert list(result) == [("a/nested", "somnowatch"), ("b", "fake"), ("b", "somnowatch")]
+    assert [file_path.name for file_path in result[("b", "somnowatch")]] == [
+        "Mag_Type.txt",
+        "X_AC_Type.txt",
+        "Y_AC_Type.txt",
+        "Z_AC_Type.txt",
+    ]
+    assert result[("b", "fake")] == [tmp_path / "b" / "wrist.dat"]
+    assert list(find_recordings(tmp_path, pattern="*.txt", max_workers=4)) == [
+        ("a/nested", "somnowatch"),
+        ("b", "somnowatch"),
+    ]
+
+
+@pytest.mark.parametrize("method", ("fft", "periodogram", "welch"))
+def test_analyze_recording(somnowatch_export, method: str):
+    file_paths = somnowatch_export(1280, sample_rate=64)
+
+    result = analyze_recording(file_paths, method=method)
+
+    assert list(result.index) == [f"{axis} amplitude in mg" for axis in ("X", "Y", "Z", "Mag")]
+    assert np.all(result["sample_rate"] == 64)
+    assert np.all(result["duration"] == 20)
+    assert np.all((result["H_cm"] > 0) & (result["H_cm"] < 1))
+
+
+def test_analyze_recording_unknown_method(somnowatch_export):
+    with pytest.raises(ValueError, match="Unknown method 'fourier'"):
+        analyze_recording(somnowatch_export(128), method="fourier")
+
+
+def test_analyze_recording_inconsistent_channels(somnowatch_export):
+    """Channels with a differing sample rate are resampled instead of failing"""
+    file_paths = somnowatch_export(1280, signal_types=("X_AC_Type", "Y_AC_Type"))
+    file_paths += somnowatch_export(640, signal_types=("Z_AC_Type",), sample_rate=64)
+
+    result = analyze_recording(file_paths)
+
+    assert np.all(result["sample_rate"] == 128)
+    assert np.all(result["duration"] == 10)
+    assert result["H_cm"].notna().all()
+
+
+def test_analyze_recording_of_other_device(fake_device, tmp_path: Path):
+    """Devices without a recording reader are converted from their dataframe"""
+    write_fake_file(tmp_path / "wrist.dat")
+
+    result = analyze_recording([tmp_path / "wrist.dat"], device="fake")
+
+    assert list(result.index) == ["wrist"]
+    assert result.at["wrist", "sample_rate"] == 32
+    assert result.at["wrist", "duration"] == 10
+
+
+def test_analyze_cohort(somnowatch_export, tmp_path: Path):
+    somnowatch_export(1024, directory=tmp_path / "a")
+    somnowatch_export(1024, directory=tmp_path / "b", length=10)
+
+    results = list(analyze_cohort(tmp_path))
+
+    assert [result.recording for result in results] == ["a", "b"]
+    assert results[0].device == "somnowatch"
+    assert results[0].error is None
+    assert results[0].processing_time > 0
+    assert results[1].metrics is None
+    assert results[1].error is not None
+    assert results[1].error.startswith("TremanaParsingDataLengthException")
+
+
+def test_analyze_cohort_mixed_devices(somnowatch_export, fake_device, tmp_path: Path):
+    """Files of different devices in a folder are analyzed as one recording per device"""
+    somnowatch_export(1024, directory=tmp_path / "a")
+    write_fake_file(tmp_path / "a" / "wrist.dat")
+
+    results = list(analyze_cohort(tmp_path))
+    table = combine_recording_results(results)
+
+    assert [(result.recording, result.device) for result in results] == [
+        ("a", "fake"),
+        ("a", "somnowatch"),
+    ]
+    assert all(result.error is None for result in results)
+    assert table.groupby("device")["channel"].count().to_dict() == {"fake": 1, "somnowatch": 4}
+
+
+@pytest.mark.parametrize("jobs", (1, 2))
+def test_analyze_cohort_profile(somnowatch_export, tmp_path: Path, jobs: int):
+    """Calls of the processing steps are recorded per recording, also in worker processes"""
+    somnowatch_export(1024, directory=tmp_path / "a")
+    somnowatch_export(1024, directory=tmp_path / "b")
+
+    results = list(analyze_cohort(tmp_path, jobs=jobs, profile=True))
+
+    for result in results:
+        assert result.profile is not None
+        names = [record.name.rsplit(".", 1)[-1] for record in result.profile]
+        assert "read_somnowatch_recording" in names
+        assert "center_of_mass" in names
+        assert names[-1] == "analyze_recording"
+    assert list(analyze_cohort(tmp_path))[0].profile is None
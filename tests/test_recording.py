@@ -0,0 +1,138 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.recording import Recording
+
+
+@pytest.fixture
+def recording() -> Recording:
+    values = np.arange(12, dtype=np.float64).reshape(4, 3)
+    return Recording(
+        values,
+        channels=["X", "Y", "Z"],
+        sample_rate=2,
+        start_date=pd.Timestamp("2021-01-01 22:00:00"),
+        metadata={"X": {"unit": "mg"}},
+    )
+
+
+def test_recording(recording: Recording):
+    assert recording.n_samples == 4
+    assert recording.n_channels == 3
+    assert recording.duration == 2
+    assert recording.nbytes == 96
+    assert np.shares_memory(recording["Y"], recording.values)
+    np.testing.assert_array_equal(recording["Y"], [1, 4, 7, 10])
+    assert repr(recording).startswith("Recording(4 samples x ['X', 'Y', 'Z'], sample_rate=2")
+
+
+def test_recording_values():
+    """Contiguous arrays aren't copied, 1D arrays are a single channel"""
+    values = np.zeros((10, 2), order="F")
+    assert Recording(values).values is values
+    assert Recording(values).channels.tolist() == [0, 1]
+    assert Recording(np.zeros(10)).values.shape == (10, 1)
+    assert Recording(np.zeros((10, 2))).values.flags.f_contiguous
+
+    with pytest.raises(ValueError, match="got an array with 3 dimensions"):
+        Recording(np.zeros((2, 2, 2)))
+    with pytest.raises(ValueError, match="Got 1 channel names for 2 channels"):
+        Recording(values, channels=["X"])
+
+
+def test_recording_select(recording: Recording):
+    assert recording.select(["X", "Y", "Z"]) is recording
+
+    result = recording.select(["Z", "X"])
+
+    np.testing.assert_array_equal(result.values, recording.values[:, [2, 0]])
+    assert result.channels.tolist() == ["Z", "X"]
+    assert result.metadata == {"X": {"unit": "mg"}}
+    assert result.sample_rate == 2
+
+
+def test_recording_select_unknown_channel(recording: Recording):
+    """Unknown channels raise instead of selecting the last channel"""
+    with pytest.raises(KeyError, match=r"\['W'\] not in the channels"):
+        recording.select(["X", "W"])
+
+
+def test_recording_time_index(recording: Recording):
+    expected = pd.DatetimeIndex(
+        ["2021-01-01 22:00:00", "2021-01-01 22:00:00.5", "2021-01-01 22:00:01"], name="time"
+    )
+
+    pd.testing.assert_index_equal(recording.time_index()[:3], expected)
+    pd.testing.assert_index_equal(recording.time_index(np.array([0, 2])), expected[[0, 2]])
+    pd.testing.assert_index_equal(Recording(np.zeros((3, 1))).time_index(), pd.Index([0, 1, 2]))
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_recording_to_pandas(recording: Recording, compact: bool):
+    data = recording.to_pandas(compact=compact)
+
+    assert np.shares_memory(data.to_numpy(), recording.values)
+    assert data.attrs["sample_rate"] == 2
+    assert list(data.columns) == ["X", "Y", "Z"]
+    if compact:
+        pd.testing.assert_index_equal(data.index, pd.RangeIndex(4))
+        assert isinstance(data.columns, pd.CategoricalIndex)
+        assert data.attrs["start_date"] == recording.start_date
+    else:
+        pd.testing.assert_index_equal(data.index, recording.time_index())
+
+
+@pytest.mark.parametrize("compact", (False, True))
+def test_recording_from_dataframe(recording: Recording, compact: bool):
+    result = Recording.from_dataframe(recording.to_pandas(compact=compact))
+
+    assert np.shares_memory(result.values, recording.values)
+    np.testing.assert_array_equal(result.values, recording.values)
+    assert result.channels.tolist() == ["X", "Y", "Z"]
+    assert result.sample_rate == 2
+    assert result.start_date == recording.start_date
+    assert Recording.from_dataframe(pd.DataFrame({"a": [1, 2]})).sample_rate == 128
+    assert Recording.from_dataframe(pd.DataFrame({"a": [1, 2]}), sample_rate=64).sample_rate == 64
+    assert Recording.from_dataframe(pd.DataFrame({"a": [1.0]}, dtype=np.float32)).values.dtype == (
+        np.float32
+    )
+
+
+def test_recording_save_load(recording: Recording, tmp_path: Path):
+    recording.save(tmp_path / "recording")
+    result = Recording.load(tmp_path / "recording")
+
+    assert isinstance(result.values, np.memmap)
+    np.testing.assert_array_equal(result.values, recording.values)
+    assert result.channels.tolist() == ["X", "Y", "Z"]
+    assert result.sample_rate == 2
+    assert result.start_date == recording.start_date
+    assert result.metadata == {"X": {"unit": "mg"}}
+    assert not isinstance(Recording.load(tmp_path / "recording", mmap_mode=None).values, np.memmap)
+
+    writable = Recording.load(tmp_path / "recording", mmap_mode="r+")
+    writable.values[0, 0] = -1
+    writable.save(tmp_path / "recording")
+    assert Recording.load(tmp_path / "recording").values[0, 0] == -1
+
+
+def test_recording_save_memmap_through_symlink(
+    recording: Recording, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    """Values memory-mapped through a symlinked directory are flushed instead of rewritten"""
+    recording.save(tmp_path / "recording")
+    (tmp_path / "link").symlink_to(tmp_path, target_is_directory=True)
+    writable = Recording.load(tmp_path / "link" / "recording", mmap_mode="r+")
+    writable.values[0, 0] = -1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("memory-mapped values must not be rewritten")
+
+    monkeypatch.setattr(np, "save", fail)
+    writable.save(tmp_path / "recording")
+    monkeypatch.undo()
+
+    assert Recording.load(tmp_path / "recording").values[0, 0] == -1
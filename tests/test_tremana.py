@@ -1,5 +1,11 @@
 """Tests for `tremana` package."""
+import json
+import subprocess
+import sys
+from pathlib import Path
 
+import pandas as pd
+import pytest
 from click.testing import CliRunner
 
 from tremana import cli
@@ -10,7 +16,109 @@ def test_command_line_interface():
     runner = CliRunner()
     result = runner.invoke(cli.main)
     assert result.exit_code == 0
-    assert "tremana.cli.main" in result.output
+    assert "analyze" in result.output
     help_result = runner.invoke(cli.main, ["--help"])
     assert help_result.exit_code == 0
     assert "--help  Show this message and exit." in help_result.output
+
+
+def test_analyze(somnowatch_export, tmp_path: Path):
+    """Results of all recordings are written and timings are reported"""
+    for patient in ("patient_1", "patient_2"):
+        somnowatch_export(1024, directory=tmp_path / "exports" / patient)
+    output = tmp_path / "results.csv"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli.main,
+        ["analyze", str(tmp_path / "exports"), "--jobs", "2", "--output", str(output)],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "patient_1 (somnowatch): " in result.output
+    assert "Analyzed 2 of 2 recordings" in result.output
+    results = pd.read_csv(output)
+    assert results.shape == (8, 6)
+    assert list(results.columns) == [
+        "recording",
+        "device",
+        "channel",
+        "sample_rate",
+        "duration",
+        "H_cm",
+    ]
+    assert set(results["recording"]) == {"patient_1", "patient_2"}
+
+
+def test_analyze_profile(somnowatch_export, tmp_path: Path):
+    """The profile summary is shown and written as Chrome trace"""
+    somnowatch_export(1024, directory=tmp_path / "exports" / "patient_1")
+    trace_path = tmp_path / "trace.json"
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli.main,
+        [
+            "analyze",
+            str(tmp_path / "exports"),
+            "--output",
+            str(tmp_path / "results.csv"),
+            "--profile",
+            str(trace_path),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "tremana.parsers.devices.somnowatch.read_somnowatch_recording" in result.output
+    assert f"Profile -> {trace_path}" in result.output
+    assert json.loads(trace_path.read_text())["traceEvents"]
+
+
+def test_analyze_failed_recording(somnowatch_export, tmp_path: Path):
+    somnowatch_export(1024, directory=tmp_path / "patient_1")
+    somnowatch_export(1024, directory=tmp_path / "patient_2", length=10)
+    output = tmp_path / "results.csv"
+    runner = CliRunner(mix_stderr=False)
+
+    result = runner.invoke(
+        cli.main, ["analyze", str(tmp_path), "--method", "fft", "--output", str(output)]
+    )
+
+    assert result.exit_code == 1
+    assert "patient_2 (somnowatch): failed" in result.stderr
+    assert "TremanaParsingDataLengthException" in result.stderr
+    assert "Analyzed 1 of 2 recordings" in result.stdout
+    assert set(pd.read_csv(output)["recording"]) == {"patient_1"}
+
+
+HEAVY_MODULES = ("matplotlib", "numpy", "pandas", "scipy")
+CLI_CODE = "from tremana.cli import main\ntry:\n    main({!r})\nexcept SystemExit:\n    pass"
+
+
+@pytest.mark.parametrize(
+    "code",
+    (
+        "import tremana",
+        "import tremana.analysis, tremana.parsers.devices, tremana.utils",
+        CLI_CODE.format(["--help"]),
+        CLI_CODE.format(["analyze", "--help"]),
+    ),
+)
+def test_no_heavy_imports(code: str):
+    """Importing the package and showing the CLI help doesn't import heavy dependencies"""
+    check = f"import sys\nprint(sorted(set({HEAVY_MODULES!r}) & set(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-c", f"{code}\n{check}"], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_lazy_submodules():
+    import tremana
+
+    assert tremana.analysis.metrics.center_of_mass is not None
+    assert "pipeline" in dir(tremana)
+    with pytest.raises(AttributeError, match="module 'tremana' has no attribute 'foo'"):
+        tremana.foo
+    assert "read" in dir(tremana)
+    assert tremana.read is tremana.parsers.registry.read
@@ -9,6 +9,7 @@ from tremana.warnings import TremanaNotSupportedWarning
 from tremana.warnings import TremanaParsingIgnoredSignalTypeWarning
 from tremana.warnings import TremanaParsingInconsistentMetadataWarning
 from tremana.warnings import TremanaParsingIncorrectDateFormatWarning
+from tremana.warnings import TremanaParsingUnknownDeviceWarning
 from tremana.warnings import TremanaSupressableWarning
 from tremana.warnings import filter_tremana_warnings
 
@@ -148,3 +149,19 @@ def test_TremanaParsingIncorrectDateFormatWarning():
         raise TremanaParsingIncorrectDateFormatWarning(
             date_str="01.01.1970 00:00:00", format_str="%Y-%m-%d %H:%M:%S"
         )
+
+
+def test_TremanaParsingUnknownDeviceWarning():
+    with pytest.raises(
+        TremanaParsingUnknownDeviceWarning,
+        match=dedent(
+            """\
+            The header doesn't match any of the supported devices, so the file is skipped\\.
+
+            This warning was caused processing:
+                foo\\.bin
+
+            If you want to suppress this warning please consult the documentation\\."""
+        ),
+    ):
+        raise TremanaParsingUnknownDeviceWarning(origin_file="foo.bin")
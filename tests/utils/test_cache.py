@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+
+import numpy as np
+
+from tremana.utils.cache import cache_entry_stem
+from tremana.utils.cache import read_cached_metadata
+from tremana.utils.cache import read_cached_values
+from tremana.utils.cache import write_cache_entry
+
+
+def test_cache_entry_roundtrip(tmp_path: Path):
+    source_file = tmp_path / "source.txt"
+    source_file.write_text("foo")
+    cache_dir = tmp_path / "cache"
+
+    assert read_cached_metadata(cache_dir, source_file) is None
+    assert read_cached_values(cache_dir, source_file) is None
+
+    write_cache_entry(cache_dir, source_file, metadata={"foo": 1}, values=np.arange(3.0))
+
+    assert read_cached_metadata(cache_dir, str(source_file)) == {"foo": 1}
+    values = read_cached_values(cache_dir, source_file)
+    assert isinstance(values, np.memmap)
+    assert np.array_equal(values, np.arange(3.0))
+    assert not isinstance(read_cached_values(cache_dir, source_file, mmap=False), np.memmap)
+
+
+def test_cache_entry_stale(tmp_path: Path):
+    """Entries are removed when the source file changes"""
+    source_file = tmp_path / "source.txt"
+    source_file.write_text("foo")
+    cache_dir = tmp_path / "cache"
+    write_cache_entry(cache_dir, source_file, metadata={"foo": 1}, values=np.arange(3.0))
+
+    stat_result = os.stat(source_file)
+    os.utime(source_file, ns=(stat_result.st_atime_ns, stat_result.st_mtime_ns + 10**9))
+
+    assert read_cached_values(cache_dir, source_file) is None
+    assert list(cache_dir.iterdir()) == []
+    assert not cache_entry_stem(cache_dir, source_file).with_suffix(".npy").exists()
@@ -1,29 +1,35 @@
-from datetime import datetime
-
 import pandas as pd
-import pytest
 
-from tremana.utils.dataframe_helper import extract_position_by_value
+from tremana.utils.dataframe_helper import majority_by_group
 
 
-@pytest.mark.parametrize(
-    "value, expected",
-    (
-        (1, [("foo1", "int_val")]),
-        (True, [("foo1", "bool_val"), ("foo3", "bool_val")]),
-        ("foo", [("foo1", "str_val")]),
-        (datetime(1970, 1, 2), [("foo2", "date_val")]),
-    ),
-)
-def test_extract_position_by_value(value, expected):
+def test_majority_by_group():
     df = pd.DataFrame(
         {
-            "int_val": [1, 2, 3],
-            "bool_val": [True, False, True],
-            "str_val": ["foo", "bar", "baz"],
-            "date_val": [datetime(1970, 1, 1), datetime(1970, 1, 2), datetime(1970, 1, 3)],
+            "int_val": [1, 1, 2, 3, 3, 4],
+            "str_val": ["a", "b", "b", "c", "c", "c"],
         },
-        index=["foo1", "foo2", "foo3"],
+        index=list("uvwxyz"),
     )
+    groups = pd.Series(["g1", "g1", "g1", "g2", "g2", "g2"], index=df.index)
+
+    result = majority_by_group(df, groups)
+
+    expected = pd.DataFrame(
+        {
+            "int_val": [1, 1, 1, 3, 3, 3],
+            "str_val": ["b", "b", "b", "c", "c", "c"],
+        },
+        index=list("uvwxyz"),
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_majority_by_group_tie():
+    """Ties result in the smallest value same as DataFrame.mode"""
+    df = pd.DataFrame({"val": [2, 1, 1, 2, 3]})
+    groups = pd.Series(["g"] * 5)
+
+    result = majority_by_group(df, groups)
 
-    assert extract_position_by_value(df, value) == expected
+    assert list(result["val"]) == [df.mode().at[0, "val"]] * 5
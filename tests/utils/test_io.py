@@ -1,11 +1,16 @@
+from pathlib import Path
+
 import pytest
 from py.path import local as TmpDir
 
+from tremana.utils.io import concurrent_read_headers
 from tremana.utils.io import lazy_read_headers
 
 
+@pytest.mark.parametrize("read_headers", (lazy_read_headers, concurrent_read_headers))
+@pytest.mark.parametrize("prefix_size", (4, 4096))
 @pytest.mark.parametrize("nr_of_lines", (5, 10, 20))
-def test_lazy_read_headers(tmpdir: TmpDir, nr_of_lines: int):
+def test_lazy_read_headers(tmpdir: TmpDir, nr_of_lines: int, prefix_size: int, read_headers):
     expected = []
     files_to_read = []
     for file_name in ("a.txt", "b.txt"):
@@ -15,9 +20,66 @@ def test_lazy_read_headers(tmpdir: TmpDir, nr_of_lines: int):
         files_to_read.append(file)
         expected.append(lines[:nr_of_lines])
 
-    headers_from_paths = lazy_read_headers(files_to_read, lines_to_read=nr_of_lines)
+    headers_from_paths = read_headers(
+        files_to_read, lines_to_read=nr_of_lines, prefix_size=prefix_size
+    )
+
+    headers_from_string = read_headers(
+        map(str, files_to_read), lines_to_read=nr_of_lines, prefix_size=prefix_size
+    )
+
+    assert list(headers_from_paths) == expected
+    assert list(headers_from_string) == expected
+
+
+def test_lazy_read_headers_is_lazy(tmp_path: Path):
+    """Files are only opened when the header is requested"""
+    file_path = tmp_path / "a.txt"
+    file_path.write_text("a\nb")
+
+    headers = lazy_read_headers([file_path, tmp_path / "missing.txt"], lines_to_read=1)
+
+    assert next(headers) == ["a"]
+    with pytest.raises(FileNotFoundError):
+        next(headers)
+
+
+def test_read_headers_short_file(tmp_path: Path):
+    """Missing lines are empty strings and windows line endings are removed"""
+    file_path = tmp_path / "a.txt"
+    file_path.write_bytes(b"a\r\nb\r\n")
+
+    assert list(lazy_read_headers([file_path], lines_to_read=4)) == [["a", "b", "", ""]]
+
+
+def test_concurrent_read_headers_order(tmp_path: Path):
+    file_paths = []
+    for index in range(100):
+        file_path = tmp_path / f"{index}.txt"
+        file_path.write_text(f"{index}\nfoo")
+        file_paths.append(file_path)
+
+    result = concurrent_read_headers(file_paths, lines_to_read=1, max_workers=3)
+
+    assert list(result) == [[str(index)] for index in range(100)]
+
+
+@pytest.mark.parametrize("read_headers", (lazy_read_headers, concurrent_read_headers))
+def test_read_headers_max_size(tmp_path: Path, read_headers):
+    """Reading stops after max_size bytes and undecodable bytes can be replaced"""
+    file_path = tmp_path / "a.bin"
+    file_path.write_bytes(b"a" * 100 + b"\nfoo\n")
+    binary_file_path = tmp_path / "b.bin"
+    binary_file_path.write_bytes(b"\x00\xff\xfe" * 100)
 
-    headers_from_string = lazy_read_headers(map(str, files_to_read), lines_to_read=nr_of_lines)
+    result = read_headers(
+        [file_path, binary_file_path],
+        lines_to_read=1,
+        prefix_size=16,
+        max_size=32,
+        errors="replace",
+    )
 
-    assert headers_from_paths == expected
-    assert headers_from_string == expected
+    header, binary_header = result
+    assert header == ["a" * 32]
+    assert len(binary_header) == 1
@@ -0,0 +1,170 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tremana.analysis.metrics import center_of_mass
+from tremana.analysis.transformations import fft_spectra
+from tremana.parsers.devices.somnowatch import iter_somnowatch
+from tremana.parsers.devices.somnowatch import read_somnowatch
+from tremana.utils.io import lazy_read_headers
+from tremana.utils.profiling import INSTRUMENTED_FUNCTIONS
+from tremana.utils.profiling import Profiler
+from tremana.utils.profiling import in_caller_context
+from tremana.utils.profiling import instrument
+from tremana.utils.profiling import record_bytes_read
+
+
+def test_instrument_disabled():
+    """Without an active profiler calls aren't recorded"""
+    profiler = Profiler()
+
+    @instrument
+    def add(a, b):
+        """Add a and b."""
+        return a + b
+
+    assert add(1, b=2) == 3
+    assert add.__doc__ == "Add a and b."
+    assert INSTRUMENTED_FUNCTIONS[f"{__name__}.{add.__qualname__}"] is add
+    assert profiler.records == []
+
+
+def test_profiler_records_calls():
+    values = np.ones((100, 2))
+
+    @instrument
+    def double(array):
+        return array * 2
+
+    @instrument
+    def fail():
+        raise ValueError("foo")
+
+    with Profiler() as profiler:
+        double(values)
+        with pytest.raises(ValueError):
+            fail()
+    double(values)
+
+    assert [record.name.rsplit(".", 1)[-1] for record in profiler.records] == ["double", "fail"]
+    assert profiler.records[0].input_nbytes == values.nbytes
+    assert profiler.records[0].output_nbytes == values.nbytes
+    assert profiler.records[0].duration > 0
+    assert profiler.records[1].output_nbytes == 0
+
+
+def test_profiler_generator():
+    """Generators are recorded once when they are closed"""
+
+    @instrument
+    def count(stop):
+        for value in range(stop):
+            yield np.full(10, value)
+
+    with Profiler() as profiler:
+        generator = count(5)
+        next(generator)
+        assert profiler.records == []
+        assert len(list(generator)) == 4
+        next(count(5))
+
+    assert len(profiler.records) == 2
+    assert profiler.records[0].output_nbytes == 5 * 80
+    assert profiler.records[1].output_nbytes == 80
+
+
+def test_profiler_somnowatch_analysis(somnowatch_export, tmp_path: Path):
+    """The processing steps are recorded with the bytes read from the files"""
+    file_paths = somnowatch_export(1024)
+    file_size = sum(file_path.stat().st_size for file_path in file_paths)
+
+    with Profiler() as profiler:
+        list(lazy_read_headers(file_paths, lines_to_read=5))
+        data = read_somnowatch(file_paths, workers=2)
+        center_of_mass(fft_spectra(data))
+        list(iter_somnowatch(file_paths, chunk_size=256))
+
+    records = profiler.to_dataframe().set_index("name")
+    header_size = 4 * 4096
+    assert (
+        list(records.loc["tremana.utils.io.lazy_read_headers", "bytes_read"]) == [header_size] * 3
+    )
+    assert records.at["tremana.parsers.devices.somnowatch.read_somnowatch", "bytes_read"] == (
+        header_size + file_size
+    )
+    assert records.at["tremana.parsers.devices.somnowatch.iter_somnowatch", "bytes_read"] == (
+        header_size + file_size
+    )
+    assert records.at["tremana.analysis.transformations.fft_spectra", "input_nbytes"] == (
+        data.memory_usage().sum()
+    )
+
+    summary = profiler.summary()
+    assert summary.at["tremana.parsers.devices.somnowatch._somnowatch_read_channel", "calls"] == 4
+    assert list(summary.columns) == [
+        "calls",
+        "total_time",
+        "mean_time",
+        "bytes_read",
+        "input_nbytes",
+        "output_nbytes",
+    ]
+
+    trace_path = tmp_path / "trace.json"
+    profiler.write_chrome_trace(trace_path)
+    trace = json.loads(trace_path.read_text())
+    assert len(trace["traceEvents"]) == len(profiler.records)
+    assert {event["ph"] for event in trace["traceEvents"]} == {"X"}
+    assert min(event["ts"] for event in trace["traceEvents"]) == 0
+
+
+def test_profiler_bytes_read_of_concurrent_calls():
+    """Concurrent calls only count their own reads, callers the reads of their workers"""
+    barrier = threading.Barrier(4)
+
+    @instrument
+    def read(nbytes):
+        barrier.wait()
+        record_bytes_read(nbytes)
+        barrier.wait()
+
+    @instrument
+    def read_all(sizes):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(in_caller_context(read), sizes))
+
+    with Profiler() as profiler:
+        read_all([1, 10, 100, 1000])
+
+    bytes_read = profiler.to_dataframe().groupby("name")["bytes_read"].agg(sorted)
+    assert bytes_read[read.__module__ + "." + read.__qualname__] == [1, 10, 100, 1000]
+    assert bytes_read[read_all.__module__ + "." + read_all.__qualname__] == [1111]
+    assert profiler.bytes_read == 1111
+
+
+def test_profiler_bytes_read_of_threaded_read(somnowatch_export):
+    """Each channel read by a worker thread is recorded with the size of its file"""
+    file_paths = somnowatch_export(1024)
+
+    with Profiler() as profiler:
+        read_somnowatch(file_paths, workers=4)
+
+    records = profiler.to_dataframe()
+    channel_records = records[
+        records["name"] == "tremana.parsers.devices.somnowatch._somnowatch_read_channel"
+    ]
+    assert sorted(channel_records["bytes_read"]) == sorted(
+        file_path.stat().st_size for file_path in file_paths
+    )
+
+
+def test_profiler_empty():
+    profiler = Profiler()
+
+    assert profiler.to_chrome_trace()["traceEvents"] == []
+    assert isinstance(profiler.summary(), pd.DataFrame)
@@ -1,4 +1,5 @@
 """Top-level package for tremana."""
+from tremana.utils.lazy_import import lazy_submodules
 
 __author__ = """Sebastian Weigand"""
 __email__ = "s.weigand.phy@gmail.com"
@@ -6,3 +7,20 @@ __version__ = "0.0.1"
 
 
 __repo_short_url__ = "https://git.io/JtCN6"
+
+# Submodules are imported on first access, so 'import tremana' and the CLI start fast
+__getattr__, __dir__ = lazy_submodules(
+    __name__,
+    (
+        "analysis",
+        "cli",
+        "constants",
+        "exceptions",
+        "parsers",
+        "pipeline",
+        "recording",
+        "utils",
+        "warnings",
+    ),
+    attributes={"read": "tremana.parsers.registry"},
+)
@@ -1 +1,15 @@
 """Module containing functions to transform data and metrics."""
+from tremana.utils.lazy_import import lazy_submodules
+
+__getattr__, __dir__ = lazy_submodules(
+    __name__,
+    (
+        "activity",
+        "alignment",
+        "filtering",
+        "metrics",
+        "spectra_cache",
+        "streaming",
+        "transformations",
+    ),
+)
@@ -0,0 +1,176 @@
+"""Segmentation of recordings into active and rest periods.
+
+Most of an overnight recording is rest without tremor, so the spectra only need to be
+calculated for the active windows (see the ``active`` argument of ``windowed_spectra``).
+The activity of all windows is calculated in O(n) from cumulative sums.
+"""
+from __future__ import annotations
+
+from math import gcd
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from tremana.analysis.transformations import _select_values
+from tremana.recording import Recording
+from tremana.utils.profiling import instrument
+
+# Windows with an activity above this factor times the median activity are active
+ACTIVITY_THRESHOLD_FACTOR = 2.0
+
+
+def _window_activity(values: np.ndarray, window_length: int, hop: int) -> np.ndarray:
+    """Calculate the activity of sliding windows over the first axis of ``values``.
+
+    The sums of the values and their squares are calculated per block of
+    ``gcd(window_length, hop)`` samples, the window sums are differences
+    of the cumulative block sums.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D array (sample x channel).
+    window_length : int
+        Number of samples per window.
+    hop : int
+        Number of samples between the starts of consecutive windows.
+
+    Returns
+    -------
+    np.ndarray
+        Root of the summed variances of the channels per window,
+        NaN for windows containing NaN values.
+    """
+    n_windows = max((values.shape[0] - window_length) // hop + 1, 0)
+    if n_windows == 0:
+        return np.empty(0)
+    block_size = gcd(window_length, hop)
+    n_blocks = ((n_windows - 1) * hop + window_length) // block_size
+    block_starts = np.arange(n_blocks) * block_size
+    values = values[slice(n_blocks * block_size)]
+    block_sums = np.add.reduceat(values, block_starts, axis=0).astype(np.float64)
+    nan_blocks = np.isnan(block_sums).any(axis=1)
+    block_sums[nan_blocks] = 0
+    # removing the mean (e.g. gravity) avoids cancellation in the variances
+    offset = block_sums.sum(axis=0) / max((~nan_blocks).sum() * block_size, 1)
+    block_sums -= offset * block_size
+    block_sums[nan_blocks] = 0
+    centered = values - offset.astype(values.dtype)
+    block_square_sums = np.add.reduceat(
+        np.square(centered, out=centered), block_starts, axis=0
+    ).astype(np.float64)
+    block_square_sums[nan_blocks] = 0
+
+    window_starts = np.arange(n_windows) * (hop // block_size)
+    window_ends = window_starts + window_length // block_size
+
+    def window_sums(block_values: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate(
+            (np.zeros((1,) + block_values.shape[1:]), np.cumsum(block_values, axis=0))
+        )
+        return cumulative[window_ends] - cumulative[window_starts]
+
+    sums = window_sums(block_sums)
+    variances = (window_sums(block_square_sums) - sums**2 / window_length) / window_length
+    activity = np.sqrt(np.clip(variances, 0, None).sum(axis=1))
+    activity[window_sums(nan_blocks.astype(np.float64)) > 0] = np.nan
+    return activity
+
+
+@instrument
+def window_activity(
+    input_dataframe: pd.DataFrame | Recording,
+    columns: Iterable[str] | None = None,
+    window_length: int = 1024,
+    hop: int | None = None,
+) -> pd.Series:
+    """Calculate the activity of sliding windows over accelerometry data.
+
+    The activity is the root mean square of the magnitude of the acceleration
+    of ``columns`` (e.g. the X, Y and Z channels) after removing the mean of each window,
+    which is the standard deviation for a single channel.
+    The windows are the same as the ones of ``windowed_spectra``.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
+    columns : Iterable[str], optional
+        Columns to combine, by default None which results in all columns to be used
+    window_length : int
+        Number of samples per window, by default 1024
+    hop : int, optional
+        Number of samples between the starts of consecutive windows,
+        by default None which results in ``window_length // 2``
+
+    Returns
+    -------
+    pd.Series
+        Activity indexed by the time of the start of each window,
+        NaN for windows containing missing values.
+
+    See Also
+    --------
+    active_windows
+    """
+    if hop is None:
+        hop = window_length // 2
+    values, _ = _select_values(input_dataframe, columns)
+    activity = _window_activity(values, window_length, hop)
+    positions = np.arange(activity.size) * hop
+    return pd.Series(
+        activity,
+        index=input_dataframe.time_index(positions)
+        if isinstance(input_dataframe, Recording)
+        else input_dataframe.index[positions],
+        name="activity",
+    )
+
+
+@instrument
+def active_windows(
+    input_dataframe: pd.DataFrame | Recording,
+    columns: Iterable[str] | None = None,
+    window_length: int = 1024,
+    hop: int | None = None,
+    threshold: float | None = None,
+) -> pd.Series:
+    """Mark the sliding windows over accelerometry data which contain movement.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
+    columns : Iterable[str], optional
+        Columns to combine, by default None which results in all columns to be used
+    window_length : int
+        Number of samples per window, by default 1024
+    hop : int, optional
+        Number of samples between the starts of consecutive windows,
+        by default None which results in ``window_length // 2``
+    threshold : float, optional
+        Minimal activity of active windows in the unit of the data, by default None
+        which uses ``ACTIVITY_THRESHOLD_FACTOR`` times the median activity
+        (suited for recordings which are mostly rest)
+
+    Returns
+    -------
+    pd.Series
+        Whether each window is active, indexed by the time of the start of each window.
+        Windows containing missing values aren't active.
+
+    See Also
+    --------
+    window_activity
+    tremana.analysis.transformations.windowed_spectra
+
+    Examples
+    --------
+    >>> active = active_windows(data, columns=["X", "Y", "Z"], window_length=1024)
+    >>> spectra = windowed_spectra(data, window_length=1024, active=active)
+    """
+    activity = window_activity(input_dataframe, columns, window_length=window_length, hop=hop)
+    if threshold is None:
+        threshold = ACTIVITY_THRESHOLD_FACTOR * np.nanmedian(activity) if len(activity) else 0
+    return (activity > threshold).rename("active")
@@ -0,0 +1,173 @@
+"""Alignment of channels with differing sample rates, start dates or lengths.
+
+The channels are resampled to a common sample rate with polyphase filtering
+(``scipy.signal.resample_poly``) and their start offsets are trimmed or padded,
+so they can be combined into a single ``Recording``.
+"""
+from __future__ import annotations
+
+from fractions import Fraction
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+from typing import Mapping
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+from scipy.signal import resample_poly
+
+from tremana.recording import Recording
+from tremana.utils.profiling import instrument
+
+# Maximal denominator of the resampling ratio, which bounds the length of the polyphase filter
+MAX_RESAMPLING_DENOMINATOR = 1000
+
+
+def resampling_factors(source_rate: int | float, target_rate: int | float) -> tuple[int, int]:
+    """Up- and downsampling factor to resample from ``source_rate`` to ``target_rate``.
+
+    Parameters
+    ----------
+    source_rate : int | float
+        Sample rate of the data.
+    target_rate : int | float
+        Sample rate after resampling.
+
+    Returns
+    -------
+    tuple[int, int]
+        Upsampling and downsampling factor, the ratio is approximated with a denominator
+        of at most ``MAX_RESAMPLING_DENOMINATOR``.
+    """
+    ratio = (
+        Fraction(target_rate).limit_denominator(MAX_RESAMPLING_DENOMINATOR)
+        / Fraction(source_rate).limit_denominator(MAX_RESAMPLING_DENOMINATOR)
+    ).limit_denominator(MAX_RESAMPLING_DENOMINATOR)
+    return ratio.numerator, ratio.denominator
+
+
+def _resample_group(values: np.ndarray, source_rate: float, target_rate: float) -> np.ndarray:
+    """Resample the stacked channels of a group with the same rate and length.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Samples with the shape (sample x channel).
+    source_rate : float
+        Sample rate of the channels.
+    target_rate : float
+        Sample rate after resampling.
+
+    Returns
+    -------
+    np.ndarray
+        Resampled channels, the same array if no resampling is needed.
+    """
+    up, down = resampling_factors(source_rate, target_rate)
+    if up == down:
+        return values
+    return resample_poly(values, up, down, axis=0).astype(values.dtype, copy=False)
+
+
+@instrument
+def align_channels(
+    values: Sequence[np.ndarray],
+    sample_rates: Sequence[int | float],
+    start_dates: Sequence[pd.Timestamp],
+    *,
+    channels: Iterable[Hashable] | None = None,
+    sample_rate: int | float | None = None,
+    trim: bool = True,
+    metadata: Mapping[Hashable, Any] | None = None,
+) -> Recording:
+    """Bring channels with differing sample rates, start dates or lengths onto a common grid.
+
+    Channels with the same sample rate and length are stacked and resampled
+    in one batched call. The start offsets are rounded to whole samples
+    of the common sample rate.
+
+    Parameters
+    ----------
+    values : Sequence[np.ndarray]
+        Samples of each channel.
+    sample_rates : Sequence[int | float]
+        Sample rate of each channel.
+    start_dates : Sequence[pd.Timestamp]
+        Time of the first sample of each channel.
+    channels : Iterable[Hashable], optional
+        Names of the channels, by default None which uses their position
+    sample_rate : int | float, optional
+        Common sample rate, by default None which uses the most common sample rate
+    trim : bool
+        Whether to trim the channels to the time all channels were recorded,
+        by default True. Otherwise channels are padded with NaN to the time
+        any channel was recorded.
+    metadata : Mapping[Hashable, Any], optional
+        Metadata of each channel, by default None
+
+    Returns
+    -------
+    Recording
+        Aligned channels.
+
+    Raises
+    ------
+    ValueError
+        If the number of sample rates or start dates doesn't match the number of channels.
+
+    Examples
+    --------
+    >>> recording = align_channels(
+    ...     [x_values, y_values],
+    ...     sample_rates=[128, 64],
+    ...     start_dates=[pd.Timestamp("2021-01-18 22:00"), pd.Timestamp("2021-01-18 22:00:01")],
+    ... )
+    """
+    n_channels = len(values)
+    if len(sample_rates) != n_channels or len(start_dates) != n_channels:
+        raise ValueError(
+            f"Got {len(sample_rates)} sample rates and {len(start_dates)} start dates "
+            f"for {n_channels} channels."
+        )
+    if sample_rate is None:
+        sample_rate = pd.Series(sample_rates, dtype=float).mode().iat[0]
+    dtype: np.dtype = np.result_type(*(channel_values.dtype for channel_values in values))
+    if dtype not in (np.float32, np.float64):
+        dtype = np.dtype(np.float64)
+
+    groups: dict[tuple[float, int], list[int]] = {}
+    for channel, (channel_values, channel_rate) in enumerate(zip(values, sample_rates)):
+        groups.setdefault((channel_rate, len(channel_values)), []).append(channel)
+    resampled: list[np.ndarray] = [np.empty(0, dtype=dtype)] * n_channels
+    for (channel_rate, _), group in groups.items():
+        group_values = _resample_group(
+            np.stack([values[channel] for channel in group], axis=1).astype(dtype, copy=False),
+            channel_rate,
+            sample_rate,
+        )
+        for position, channel in enumerate(group):
+            resampled[channel] = group_values[:, position]
+
+    earliest_start = min(start_dates)
+    offsets = [
+        round((start_date - earliest_start).total_seconds() * sample_rate)
+        for start_date in start_dates
+    ]
+    ends = [offset + len(channel_values) for offset, channel_values in zip(offsets, resampled)]
+    start, end = (max(offsets), min(ends)) if trim else (0, max(ends))
+    aligned = np.full((max(end - start, 0), n_channels), np.nan, dtype=dtype, order="F")
+    for channel, (offset, channel_values) in enumerate(zip(offsets, resampled)):
+        first = max(start - offset, 0)
+        last = min(end - offset, len(channel_values))
+        if last > first:
+            aligned[
+                slice(offset + first - start, offset + last - start), channel
+            ] = channel_values[slice(first, last)]
+    return Recording(
+        aligned,
+        channels=channels,
+        sample_rate=sample_rate,
+        start_date=earliest_start + pd.Timedelta(seconds=start / sample_rate),
+        metadata=metadata,
+    )
@@ -0,0 +1,250 @@
+"""Band-pass filtering of accelerometry data before the spectra are calculated.
+
+The filters are Butterworth filters in second-order sections (SOS), which are
+designed once per sample rate and band and applied to all channels at once.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Iterable
+from typing import Iterator
+from typing import TypeVar
+
+import numpy as np
+import pandas as pd
+from scipy.signal import butter
+from scipy.signal import detrend as detrend_signal
+from scipy.signal import sosfilt
+from scipy.signal import sosfilt_zi
+from scipy.signal import sosfiltfilt
+
+from tremana.analysis.transformations import _sampling_rate
+from tremana.analysis.transformations import _select_values
+from tremana.recording import Recording
+from tremana.utils.profiling import instrument
+
+DataType = TypeVar("DataType", pd.DataFrame, Recording)
+
+# Default band of the filter, which contains physiological and pathological tremor
+FILTER_BAND = (1.0, 20.0)
+
+
+@lru_cache(maxsize=64)
+def design_bandpass(
+    sample_rate: float, band: tuple[float, float] = FILTER_BAND, order: int = 4
+) -> np.ndarray:
+    """Design a Butterworth band-pass filter as second-order sections.
+
+    The coefficients are cached per ``(sample_rate, band, order)``,
+    so they are only designed once for all recordings with the same sample rate.
+    ``band`` needs to be a tuple to be hashable.
+
+    Parameters
+    ----------
+    sample_rate : float
+        Number of samples per second.
+    band : tuple[float, float]
+        Lower and upper cutoff frequency in Hz, by default ``FILTER_BAND``
+    order : int
+        Order of the filter, by default 4
+
+    Returns
+    -------
+    np.ndarray
+        Read-only second-order sections with the shape (n_sections x 6),
+        which are shared between calls.
+
+    Raises
+    ------
+    ValueError
+        If the band isn't between 0 and the Nyquist frequency.
+    """
+    low, high = band
+    if not 0 < low < high < sample_rate / 2:
+        raise ValueError(
+            f"The band {band!r} needs to be between 0 and the Nyquist frequency "
+            f"({sample_rate / 2} Hz)."
+        )
+    sos = butter(order, band, btype="bandpass", output="sos", fs=sample_rate)
+    sos.flags.writeable = False
+    return sos
+
+
+@instrument
+def bandpass_filter(
+    input_dataframe: DataType,
+    columns: Iterable[str] | None = None,
+    sampling_rate: int | float | None = None,
+    band: tuple[float, float] = FILTER_BAND,
+    order: int = 4,
+    detrend: bool = True,
+) -> DataType:
+    """Detrend and band-pass filter accelerometry data without phase shift.
+
+    All channels are filtered forward and backward (``scipy.signal.sosfiltfilt``)
+    in one call.
+
+    Parameters
+    ----------
+    input_dataframe : DataType
+        Dataframe or recording containing accelerometry data.
+    columns : Iterable[str], optional
+        Columns to filter, by default None which results in all columns to be used
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of a recording and 128 otherwise
+    band : tuple[float, float]
+        Lower and upper cutoff frequency in Hz, by default ``FILTER_BAND``
+    order : int
+        Order of the filter, by default 4
+    detrend : bool
+        Whether to remove a linear trend before filtering, which reduces the
+        transients at the edges, by default True
+
+    Returns
+    -------
+    DataType
+        Filtered data of the same type with the selected columns.
+
+    See Also
+    --------
+    BandpassFilter
+    """
+    values, columns = _select_values(input_dataframe, columns)
+    sos = design_bandpass(
+        float(_sampling_rate(input_dataframe, sampling_rate)), tuple(band), order
+    )
+    dtype = values.dtype
+    if detrend:
+        values = detrend_signal(values, axis=0)
+    # scipy only accepts writable sections
+    filtered = sosfiltfilt(np.array(sos), values, axis=0).astype(dtype, copy=False)
+    if isinstance(input_dataframe, Recording):
+        return Recording(
+            filtered,
+            channels=columns,
+            sample_rate=input_dataframe.sample_rate,
+            start_date=input_dataframe.start_date,
+            metadata={
+                channel: input_dataframe.metadata[channel]
+                for channel in columns
+                if channel in input_dataframe.metadata
+            },
+        )
+    result = pd.DataFrame(filtered, index=input_dataframe.index, columns=columns)
+    result.attrs.update(input_dataframe.attrs)
+    return result
+
+
+class BandpassFilter:
+    """Band-pass filter for streams of accelerometry data.
+
+    The state of the filter is carried from one block to the next, so the result is
+    the same as filtering all samples at once with ``scipy.signal.sosfilt``.
+    Unlike ``bandpass_filter`` the filter is causal, which delays the signal.
+
+    Examples
+    --------
+    >>> stream_filter = BandpassFilter(sampling_rate=128)
+    >>> for block in iter_somnowatch(file_paths, chunk_size=128):
+    ...     filtered = stream_filter.filter(block.to_numpy())
+    """
+
+    def __init__(
+        self,
+        sampling_rate: int | float = 128,
+        band: tuple[float, float] = FILTER_BAND,
+        order: int = 4,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        sampling_rate : int | float
+            Number of sample per second, by default 128
+        band : tuple[float, float]
+            Lower and upper cutoff frequency in Hz, by default ``FILTER_BAND``
+        order : int
+            Order of the filter, by default 4
+
+
+        .. # noqa: DAR101
+        """
+        # scipy only accepts writable sections, so the cached ones are copied
+        self.sos = np.array(design_bandpass(float(sampling_rate), tuple(band), order))
+        self._zi_step = sosfilt_zi(self.sos)[:, :, np.newaxis]
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard the state of the filter."""
+        self.zi: np.ndarray | None = None
+
+    def filter(self, block: np.ndarray | pd.DataFrame) -> np.ndarray:
+        """Filter the next block of samples.
+
+        The state of the filter is initialized with the first sample of the first block,
+        as if the signal was constant before, which avoids a step response.
+
+        Parameters
+        ----------
+        block : np.ndarray | pd.DataFrame
+            Samples with the shape (sample x channel).
+
+        Returns
+        -------
+        np.ndarray
+            Filtered samples with the shape (sample x channel).
+        """
+        values = np.asarray(block, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        if values.shape[0] == 0:
+            return values
+        if self.zi is None:
+            self.zi = self._zi_step * values[0]
+        filtered, self.zi = sosfilt(self.sos, values, axis=0, zi=self.zi)
+        return filtered
+
+
+@instrument
+def iter_bandpass_filter(
+    chunks: Iterable[pd.DataFrame],
+    columns: Iterable[str] | None = None,
+    sampling_rate: int | float = 128,
+    band: tuple[float, float] = FILTER_BAND,
+    order: int = 4,
+) -> Iterator[pd.DataFrame]:
+    """Band-pass filter consecutive chunks of accelerometry data.
+
+    Parameters
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Consecutive chunks of accelerometry data (e.g. from ``iter_somnowatch``).
+    columns : Iterable[str], optional
+        Columns to filter, by default None which results in all columns to be used
+    sampling_rate : int | float
+        Number of sample per second, by default 128
+    band : tuple[float, float]
+        Lower and upper cutoff frequency in Hz, by default ``FILTER_BAND``
+    order : int
+        Order of the filter, by default 4
+
+    Yields
+    ------
+    pd.DataFrame
+        Filtered chunk with the index of the input chunk.
+
+    See Also
+    --------
+    BandpassFilter
+    tremana.parsers.devices.somnowatch.iter_somnowatch
+    """
+    stream_filter = BandpassFilter(sampling_rate=sampling_rate, band=band, order=order)
+    for chunk in chunks:
+        values, channels = _select_values(chunk, columns)
+        filtered = pd.DataFrame(
+            stream_filter.filter(values).astype(values.dtype, copy=False),
+            index=chunk.index,
+            columns=channels,
+        )
+        filtered.attrs.update(chunk.attrs)
+        yield filtered
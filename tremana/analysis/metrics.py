@@ -1,10 +1,70 @@
 """Module containing metrics to be calculated on tremor accelerometry data or their FFT."""
+from __future__ import annotations
+
+from typing import Iterable
 
 import numpy as np
 import pandas as pd
+from scipy.special import entr
+
+from tremana.analysis.transformations import BatchSpectra
+from tremana.analysis.transformations import WindowedSpectra
+from tremana.utils.profiling import instrument
+
 
+def _center_of_mass(spectra: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Calculate the center of mass of spectra along ``axis`` for all spectra at once.
+
+    Parameters
+    ----------
+    spectra : np.ndarray
+        Array of spectra with the frequency along ``axis``.
+    axis : int
+        Frequency axis of ``spectra``, by default 0
+
+    Returns
+    -------
+    np.ndarray
+        Center of mass with the shape of ``spectra`` without ``axis``.
+
+    See Also
+    --------
+    center_of_mass
+    """
+    spectra = np.moveaxis(spectra, axis, 0)
+    N = spectra.shape[0]
+    sorted_spectra = np.sort(spectra, axis=0)[::-1]
+    weights = np.arange(0, N)
+    return np.tensordot(weights, sorted_spectra, axes=1) / sorted_spectra.sum(axis=0) / (N - 1)
+
+
+@instrument
+def batch_center_of_mass(spectra: BatchSpectra | np.ndarray) -> np.ndarray:
+    """Calculate the center of mass of the spectra of multiple recordings.
+
+    Parameters
+    ----------
+    spectra : BatchSpectra | np.ndarray
+        Spectra of multiple recordings as (recording x frequency x channel) array
+        (e.g. from ``batch_fft_spectra``).
 
-def center_of_mass(fft_spectra: pd.DataFrame) -> pd.DataFrame:
+    Returns
+    -------
+    np.ndarray
+        Center of mass with the shape (recording x channel).
+
+    See Also
+    --------
+    center_of_mass
+    tremana.analysis.transformations.batch_fft_spectra
+    tremana.analysis.transformations.batch_power_density_spectra
+    """
+    values = spectra.values if isinstance(spectra, BatchSpectra) else spectra
+    return _center_of_mass(values, axis=1)
+
+
+@instrument
+def center_of_mass(fft_spectra: pd.DataFrame | np.ndarray | WindowedSpectra) -> pd.DataFrame:
     r"""Calculate the center of mass of FFT spectra.
 
     .. math::
@@ -13,19 +73,252 @@ def center_of_mass(fft_spectra: pd.DataFrame) -> pd.DataFrame:
 
     Parameters
     ----------
-    fft_spectra : pd.DataFrame
-        Dataframe with each column being a FFT spectrum.
+    fft_spectra : pd.DataFrame | np.ndarray | WindowedSpectra
+        Dataframe or 2D array with each column being a FFT spectrum,
+        or the spectra of sliding windows.
 
     Returns
     -------
     pd.DataFrame
         Dataframe with the center of mass in the with columns names same as the spectra.
+        For ``WindowedSpectra`` the index are the times of the windows.
+
+    See Also
+    --------
+    tremana.analysis.transformations.windowed_spectra
+    """
+    if isinstance(fft_spectra, WindowedSpectra):
+        return pd.DataFrame(
+            _center_of_mass(fft_spectra.values, axis=1),
+            index=fft_spectra.times,
+            columns=fft_spectra.channels,
+        )
+    columns = fft_spectra.columns if isinstance(fft_spectra, pd.DataFrame) else None
+    spectra = np.asarray(fft_spectra)
+    if spectra.ndim == 1:
+        spectra = spectra[:, np.newaxis]
+    return pd.DataFrame(_center_of_mass(spectra)[np.newaxis, :], index=["H_cm"], columns=columns)
+
+
+TREMOR_METRICS = (
+    "H_cm",
+    "dominant_frequency",
+    "band_power_ratio",
+    "spectral_entropy",
+    "peak_width",
+)
+TREMOR_BAND = (3.0, 12.0)
+
+
+def _peak_half_power_frequencies(
+    power: np.ndarray, frequencies: np.ndarray, peak: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find the frequencies left and right of peaks where the power drops to half the peak.
+
+    The crossings are linearly interpolated between frequency bins, if the power doesn't
+    drop to half the peak the first or last frequency is used.
+
+    Parameters
+    ----------
+    power : np.ndarray
+        Power spectra with the frequency along the first axis.
+    frequencies : np.ndarray
+        Frequencies of the spectra.
+    peak : np.ndarray
+        Index of the peak of each spectrum.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Left and right half power frequency of each spectrum.
     """
+    n_frequencies = power.shape[0]
+    half_power = np.take_along_axis(power, peak[np.newaxis], axis=0)[0] / 2
+    below = power < half_power
+    index = np.arange(n_frequencies).reshape((-1,) + (1,) * (power.ndim - 1))
+    left = np.where(below & (index < peak), index, -1).max(axis=0)
+    right = np.where(below & (index > peak), index, n_frequencies).min(axis=0)
+
+    def crossing(outer: np.ndarray, inner: np.ndarray) -> np.ndarray:
+        outer_power = np.take_along_axis(power, outer[np.newaxis], axis=0)[0]
+        inner_power = np.take_along_axis(power, inner[np.newaxis], axis=0)[0]
+        # spectra without crossing result in invalid values, which are replaced afterwards
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fraction = (half_power - outer_power) / (inner_power - outer_power)
+        return frequencies[outer] + fraction * (frequencies[inner] - frequencies[outer])
+
+    left_outer = np.maximum(left, 0)
+    right_outer = np.minimum(right, n_frequencies - 1)
+    left_frequency = np.where(
+        left < 0, frequencies[0], crossing(left_outer, np.minimum(left_outer + 1, peak))
+    )
+    right_frequency = np.where(
+        right >= n_frequencies,
+        frequencies[-1],
+        crossing(right_outer, np.maximum(right_outer - 1, peak)),
+    )
+    return left_frequency, right_frequency
+
+
+def _tremor_metrics(
+    spectra: np.ndarray,
+    frequencies: np.ndarray,
+    metrics: tuple[str, ...] = TREMOR_METRICS,
+    band: tuple[float, float] = TREMOR_BAND,
+    amplitude: bool = False,
+    axis: int = 0,
+) -> dict[str, np.ndarray]:
+    """Calculate tremor metrics of spectra along ``axis`` for all spectra at once.
+
+    Parameters
+    ----------
+    spectra : np.ndarray
+        Array of spectra with the frequency along ``axis``.
+    frequencies : np.ndarray
+        Ascending frequencies of the spectra.
+    metrics : tuple[str, ...]
+        Metrics to calculate, by default TREMOR_METRICS
+    band : tuple[float, float]
+        Frequency band of the tremor in Hz, by default TREMOR_BAND
+    amplitude : bool
+        Whether ``spectra`` are amplitude spectra which are squared for the power
+        based metrics, by default False
+    axis : int
+        Frequency axis of ``spectra``, by default 0
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Values of each metric with the shape of ``spectra`` without ``axis``.
+
+    Raises
+    ------
+    ValueError
+        If a metric isn't supported or no frequency is inside of ``band``.
+
+    See Also
+    --------
+    tremor_metrics
+    """
+    unknown_metrics = set(metrics) - set(TREMOR_METRICS)
+    if unknown_metrics:
+        raise ValueError(
+            f"Unknown metrics {sorted(unknown_metrics)!r}, "
+            f"supported metrics are {list(TREMOR_METRICS)!r}."
+        )
+    band_indices = np.flatnonzero((frequencies >= band[0]) & (frequencies <= band[1]))
+    if band_indices.size == 0:
+        raise ValueError(f"No frequency of the spectra is inside of the band {band!r}.")
+    spectra = np.moveaxis(spectra, axis, 0)
+    power = spectra**2 if amplitude else spectra
+    # frequencies are ascending, so the band is a slice (view) of the spectra
+    band_power = power[slice(band_indices[0], band_indices[-1] + 1)]
+    total_power = power.sum(axis=0)
+
     results = {}
-    N = fft_spectra.shape[0]
-    weights = np.arange(0, N)
-    for column in fft_spectra.columns:
-        sorted_spectrum = fft_spectra[column].sort_values(ascending=False)
-        results[column] = 1 / (N - 1) * sorted_spectrum.dot(weights).sum() / sorted_spectrum.sum()
+    if "H_cm" in metrics:
+        results["H_cm"] = _center_of_mass(spectra)
+    if "dominant_frequency" in metrics or "peak_width" in metrics:
+        peak = band_indices[0] + band_power.argmax(axis=0)
+        results["dominant_frequency"] = frequencies[peak]
+    if "band_power_ratio" in metrics:
+        results["band_power_ratio"] = band_power.sum(axis=0) / total_power
+    if "spectral_entropy" in metrics:
+        results["spectral_entropy"] = entr(power / total_power).sum(axis=0) / np.log(
+            power.shape[0]
+        )
+    if "peak_width" in metrics:
+        left_frequency, right_frequency = _peak_half_power_frequencies(power, frequencies, peak)
+        results["peak_width"] = right_frequency - left_frequency
+    return {metric: results[metric] for metric in metrics}
+
+
+@instrument
+def tremor_metrics(
+    spectra: pd.DataFrame | np.ndarray | WindowedSpectra | BatchSpectra,
+    metrics: Iterable[str] = TREMOR_METRICS,
+    band: tuple[float, float] = TREMOR_BAND,
+    amplitude: bool = False,
+    frequencies: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """Calculate multiple tremor metrics of spectra at once.
+
+    All spectra (channels and windows) are processed together as one array.
+    Supported metrics (``TREMOR_METRICS``) are:
+
+    * ``H_cm``: center of mass (see ``center_of_mass``)
+    * ``dominant_frequency``: frequency with the highest power inside of ``band``
+    * ``band_power_ratio``: power inside of ``band`` divided by the total power
+    * ``spectral_entropy``: Shannon entropy of the power distribution normalized to [0, 1]
+    * ``peak_width``: full width at half maximum of the dominant peak in Hz
+
+    Parameters
+    ----------
+    spectra : pd.DataFrame | np.ndarray | WindowedSpectra | BatchSpectra
+        Dataframe (indexed by frequency) or 2D array with each column being a spectrum,
+        the spectra of sliding windows or of multiple recordings.
+    metrics : Iterable[str]
+        Metrics to calculate, by default TREMOR_METRICS
+    band : tuple[float, float]
+        Frequency band of the tremor in Hz, by default TREMOR_BAND
+    amplitude : bool
+        Whether ``spectra`` are amplitude spectra (e.g. ``fft_spectra``), which are squared
+        for the power based metrics, by default False
+    frequencies : np.ndarray, optional
+        Frequencies of the spectra, only used and required if ``spectra`` is an array.
 
-    return pd.DataFrame(results, index=["H_cm"])
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe with one column per metric and one row per channel,
+        for ``WindowedSpectra`` one row per window and channel (``time``, ``channel``)
+        and for ``BatchSpectra`` one row per recording and channel (``recording``, ``channel``).
+
+    Raises
+    ------
+    ValueError
+        If ``spectra`` is an array and ``frequencies`` aren't given.
+
+    See Also
+    --------
+    center_of_mass
+    tremana.analysis.transformations.power_density_spectra
+    tremana.analysis.transformations.windowed_spectra
+
+
+    .. # noqa: DAR402 ValueError
+    """
+    metrics = tuple(metrics)
+    if isinstance(spectra, BatchSpectra):
+        results = _tremor_metrics(
+            spectra.values, spectra.frequencies, metrics, band, amplitude, axis=1
+        )
+        n_recordings, n_channels = spectra.values.shape[::2]
+        return pd.DataFrame(
+            {metric: values.ravel() for metric, values in results.items()},
+            index=pd.MultiIndex.from_product(
+                [range(n_recordings), range(n_channels)], names=["recording", "channel"]
+            ),
+        )
+    if isinstance(spectra, WindowedSpectra):
+        results = _tremor_metrics(
+            spectra.values, spectra.frequencies, metrics, band, amplitude, axis=1
+        )
+        return pd.DataFrame(
+            {metric: values.ravel() for metric, values in results.items()},
+            index=pd.MultiIndex.from_product(
+                [spectra.times, spectra.channels], names=["time", "channel"]
+            ),
+        )
+    if isinstance(spectra, pd.DataFrame):
+        frequencies = spectra.index.to_numpy()
+        channels = spectra.columns
+    elif frequencies is None:
+        raise ValueError("The frequencies are required to calculate metrics of an array.")
+    values = np.asarray(spectra)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    if not isinstance(spectra, pd.DataFrame):
+        channels = pd.RangeIndex(values.shape[1])
+    results = _tremor_metrics(values, np.asarray(frequencies), metrics, band, amplitude)
+    return pd.DataFrame(results, index=channels.rename("channel"))
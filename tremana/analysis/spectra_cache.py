@@ -0,0 +1,389 @@
+"""Memoization of spectra for repeated calculations on the same recording.
+
+Results are kept in memory in least recently used (LRU) order up to a size limit
+and can additionally be stored on disk, so they survive the session.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from functools import wraps
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import NamedTuple
+from typing import TypeVar
+from typing import cast
+
+import numpy as np
+import pandas as pd
+
+from tremana.recording import Recording
+
+FuncType = TypeVar("FuncType", bound=Callable[..., pd.DataFrame])
+
+
+class SpectraCacheStats(NamedTuple):
+    """NamedTuple representing the statistics of a ``SpectraCache``."""
+
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    entries: int
+    nbytes: int
+
+
+def hash_dataframe(input_dataframe: pd.DataFrame | Recording) -> str:
+    """Calculate a hash of the values, column names and data types of a dataframe.
+
+    The index isn't part of the hash, since the spectra only depend on the values.
+    Recordings are hashed by their values, channels and sample rate.
+    Columns which aren't stored as plain numpy array (e.g. object or categorical columns)
+    are hashed with ``pd.util.hash_pandas_object``.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording to hash.
+
+    Returns
+    -------
+    str
+        Hex digest of the hash.
+    """
+    data_hash = hashlib.blake2b(digest_size=16)
+    if isinstance(input_dataframe, Recording):
+        data_hash.update(repr(list(input_dataframe.channels)).encode())
+        data_hash.update(
+            repr((input_dataframe.values.dtype, input_dataframe.sample_rate)).encode()
+        )
+        data_hash.update(input_dataframe.values.ravel(order="K").data)
+        return data_hash.hexdigest()
+    data_hash.update(repr(list(input_dataframe.columns)).encode())
+    data_hash.update(repr(list(input_dataframe.dtypes)).encode())
+    for _, column in input_dataframe.items():
+        if isinstance(column.dtype, np.dtype) and not column.dtype.hasobject:
+            data_hash.update(np.ascontiguousarray(column.to_numpy()).data)
+        else:
+            data_hash.update(pd.util.hash_pandas_object(column, index=False).to_numpy().data)
+    return data_hash.hexdigest()
+
+
+def _update_parameter_hash(parameter_hash: hashlib.blake2b, value: Any) -> None:
+    """Add the value of a parameter to a hash.
+
+    Arrays and dataframes are hashed by their content, since their ``repr``
+    is truncated for big sizes. Other values are hashed by their ``repr``.
+
+    Parameters
+    ----------
+    parameter_hash : hashlib.blake2b
+        Hash to update.
+    value : Any
+        Value of the parameter.
+    """
+    if isinstance(value, pd.Series):
+        value = value.to_frame()
+    if isinstance(value, (pd.DataFrame, Recording)):
+        text = f"{type(value).__name__}({hash_dataframe(value)})"
+    elif isinstance(value, (list, tuple)):
+        text = f"{type(value).__name__}({len(value)})"
+    elif isinstance(value, np.ndarray):
+        text = f"ndarray({value.dtype}, {value.shape})"
+    else:
+        text = repr(value)
+    # prefix the length, so consecutive values can't be confused
+    parameter_hash.update(f"{len(text)}:{text}".encode())
+    if isinstance(value, (list, tuple)):
+        for item in value:
+            _update_parameter_hash(parameter_hash, item)
+    elif isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            for item in value.ravel():
+                _update_parameter_hash(parameter_hash, item)
+        else:
+            parameter_hash.update(np.ascontiguousarray(value).data)
+
+
+def _dataframe_nbytes(dataframe: pd.DataFrame) -> int:
+    """Size of the values and index of a dataframe.
+
+    Parameters
+    ----------
+    dataframe : pd.DataFrame
+        Dataframe to calculate the size of.
+
+    Returns
+    -------
+    int
+        Size in bytes.
+    """
+    return int(dataframe.memory_usage(index=True).sum())
+
+
+class SpectraCache:
+    """LRU cache for spectra, keyed on a content hash of the input data and the parameters.
+
+    Functions are memoized with ``memoize``, they need to take the input dataframe
+    (or ``Recording``) as first argument and return a dataframe (e.g. ``fft_spectra``).
+    Cached results are returned as copies, so they can be modified safely.
+
+    Examples
+    --------
+    >>> cache = SpectraCache(max_nbytes=2**30, disk_dir="spectra_cache")
+    >>> cached_fft_spectra = cache.memoize(fft_spectra)
+    >>> spectra = cached_fft_spectra(data, sampling_rate=128)  # calculated
+    >>> spectra = cached_fft_spectra(data, sampling_rate=128)  # from the cache
+    >>> cache.stats()
+    """
+
+    def __init__(
+        self,
+        max_nbytes: int = 2**29,
+        disk_dir: None | str | os.PathLike[str] = None,
+        max_disk_nbytes: int | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        max_nbytes : int
+            Maximal size of the results held in memory, by default 2**29 (512 MiB)
+        disk_dir : str | os.PathLike[str], optional
+            Directory to additionally store results in,
+            by default None which only keeps results in memory
+        max_disk_nbytes : int, optional
+            Maximal size of the results stored on disk,
+            by default None which doesn't limit the size
+
+
+        .. # noqa: DAR101
+        """
+        self.max_nbytes = max_nbytes
+        self.disk_dir = None if disk_dir is None else Path(disk_dir)
+        self.max_disk_nbytes = max_disk_nbytes
+        self._entries: OrderedDict[str, pd.DataFrame] = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def stats(self) -> SpectraCacheStats:
+        """Statistics of the cache usage.
+
+        Returns
+        -------
+        SpectraCacheStats
+            Number of memory hits, disk hits, misses and evicted entries
+            as well as number and size of the entries in memory.
+        """
+        with self._lock:
+            return SpectraCacheStats(
+                self._hits,
+                self._disk_hits,
+                self._misses,
+                self._evictions,
+                len(self._entries),
+                self._nbytes,
+            )
+
+    def key(self, func: Callable[..., pd.DataFrame], *args: Any, **kwargs: Any) -> str:
+        """Calculate the cache key of a call of ``func``.
+
+        Positional and keyword arguments as well as omitted default arguments
+        result in the same key. Arrays and dataframes passed as parameters are
+        hashed by their content.
+
+        Parameters
+        ----------
+        func : Callable[..., pd.DataFrame]
+            Function which is called.
+        *args : Any
+            Positional arguments of the call, the first one is the input dataframe.
+        **kwargs : Any
+            Keyword arguments of the call.
+
+        Returns
+        -------
+        str
+            Key of the call.
+        """
+        bound_arguments = inspect.signature(func).bind(*args, **kwargs)
+        bound_arguments.apply_defaults()
+        input_dataframe, *parameters = bound_arguments.arguments.items()
+        parameter_hash = hashlib.blake2b(
+            f"{func.__module__}.{func.__qualname__}".encode(), digest_size=16
+        )
+        for name, value in parameters:
+            _update_parameter_hash(parameter_hash, name)
+            _update_parameter_hash(parameter_hash, value)
+        return f"{parameter_hash.hexdigest()}-{hash_dataframe(input_dataframe[1])}"
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Get a copy of the cached result of ``key``.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result.
+
+        Returns
+        -------
+        pd.DataFrame | None
+            Cached result or None if it isn't cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key].copy()
+            disk_path = self._disk_path(key)
+            if disk_path is not None and disk_path.is_file():
+                result = pd.read_pickle(disk_path)
+                # mark the entry as recently used for the eviction on disk
+                os.utime(disk_path)
+                self._disk_hits += 1
+                self._store_in_memory(key, result)
+                return result.copy()
+            self._misses += 1
+            return None
+
+    def put(self, key: str, result: pd.DataFrame) -> None:
+        """Add a result to the cache.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result.
+        result : pd.DataFrame
+            Result to cache, a copy is stored.
+        """
+        result = result.copy()
+        with self._lock:
+            self._store_in_memory(key, result)
+            disk_path = self._disk_path(key)
+            if disk_path is not None:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = disk_path.with_suffix(".tmp")
+                result.to_pickle(tmp_path)
+                os.replace(tmp_path, disk_path)
+                self._evict_disk()
+
+    def evict(self, key: str) -> None:
+        """Remove the result of ``key`` from memory and disk.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= _dataframe_nbytes(self._entries.pop(key))
+                self._evictions += 1
+            disk_path = self._disk_path(key)
+            if disk_path is not None:
+                try:
+                    disk_path.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def clear(self, *, disk: bool = False) -> None:
+        """Remove all results from memory and optionally from disk.
+
+        Parameters
+        ----------
+        disk : bool
+            Whether to also remove the results stored on disk, by default False
+        """
+        with self._lock:
+            self._evictions += len(self._entries)
+            self._entries.clear()
+            self._nbytes = 0
+            if disk and self.disk_dir is not None:
+                for disk_path in self.disk_dir.glob("*.pkl"):
+                    disk_path.unlink()
+
+    def memoize(self, func: FuncType) -> FuncType:
+        """Wrap ``func`` so its results are cached.
+
+        Parameters
+        ----------
+        func : FuncType
+            Function taking the input dataframe as first argument and returning a dataframe.
+
+        Returns
+        -------
+        FuncType
+            Function with the same signature as ``func`` using the cache.
+        """
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> pd.DataFrame:
+            key = self.key(func, *args, **kwargs)
+            result = self.get(key)
+            if result is None:
+                result = func(*args, **kwargs)
+                self.put(key, result)
+            return result
+
+        return cast(FuncType, wrapper)
+
+    def _disk_path(self, key: str) -> Path | None:
+        """Path of the result of ``key`` on disk.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result.
+
+        Returns
+        -------
+        Path | None
+            Path of the pickle file or None if there is no disk tier.
+        """
+        return None if self.disk_dir is None else self.disk_dir / f"{key}.pkl"
+
+    def _store_in_memory(self, key: str, result: pd.DataFrame) -> None:
+        """Store a result in memory and evict the least recently used ones above the limit.
+
+        Results which are bigger than ``max_nbytes`` on their own aren't kept in memory.
+
+        Parameters
+        ----------
+        key : str
+            Key of the result.
+        result : pd.DataFrame
+            Result to store.
+        """
+        nbytes = _dataframe_nbytes(result)
+        if nbytes > self.max_nbytes:
+            return
+        if key in self._entries:
+            self._nbytes -= _dataframe_nbytes(self._entries.pop(key))
+        self._entries[key] = result
+        self._nbytes += nbytes
+        while self._nbytes > self.max_nbytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._nbytes -= _dataframe_nbytes(evicted)
+            self._evictions += 1
+
+    def _evict_disk(self) -> None:
+        """Remove the least recently used results on disk above ``max_disk_nbytes``."""
+        if self.disk_dir is None or self.max_disk_nbytes is None:
+            return
+        disk_entries = sorted(
+            ((disk_path, disk_path.stat()) for disk_path in self.disk_dir.glob("*.pkl")),
+            key=lambda entry: entry[1].st_mtime_ns,
+        )
+        disk_nbytes = sum(stat_result.st_size for _, stat_result in disk_entries)
+        for disk_path, stat_result in disk_entries:
+            if disk_nbytes <= self.max_disk_nbytes:
+                break
+            disk_path.unlink()
+            disk_nbytes -= stat_result.st_size
@@ -0,0 +1,253 @@
+"""Online estimation of spectra and metrics for streams of accelerometry data."""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from scipy.fft import rfft
+
+from tremana.analysis.metrics import _center_of_mass
+from tremana.analysis.transformations import WindowType
+from tremana.analysis.transformations import _get_taper
+
+
+class SpectralUpdate(NamedTuple):
+    """NamedTuple representing the estimate of an ``OnlineSpectralEstimator`` at a sample.
+
+    ``sample`` is the number of samples received when the estimate was emitted,
+    ``power_density`` has the shape (frequency x channel) and ``center_of_mass``
+    one value per channel.
+    """
+
+    sample: int
+    power_density: np.ndarray
+    center_of_mass: np.ndarray
+
+
+class OnlineSpectralEstimator:
+    """Running Welch power density spectra and center of mass of a stream of samples.
+
+    Samples are added in blocks of any size with ``update``. Every ``hop`` samples
+    the latest ``nperseg`` samples form a new segment (like ``scipy.signal.welch``),
+    whose spectrum is added to the running average.
+    The samples are kept in a preallocated ring buffer and the running sums are updated
+    in place, so the cost per sample is constant no matter how long the stream runs.
+    With ``n_segments`` the sum is recomputed from the stored segments once per cycle,
+    so rounding errors of adding and subtracting the segments don't accumulate.
+
+    With ``n_segments=None`` the spectra are the same as
+    ``power_density_spectra(data, method="welch")`` of all samples received so far.
+
+    Examples
+    --------
+    >>> estimator = OnlineSpectralEstimator(n_channels=4, sampling_rate=128)
+    >>> for block in iter_somnowatch(file_paths, chunk_size=128):
+    ...     for spectral_update in estimator.update(block):
+    ...         print(spectral_update.sample, spectral_update.center_of_mass)
+    """
+
+    def __init__(
+        self,
+        n_channels: int,
+        sampling_rate: int | float = 128,
+        nperseg: int = 256,
+        noverlap: int | None = None,
+        n_segments: int | None = None,
+        emit_every: int | None = None,
+        window: WindowType = "hann",
+        norm: bool = False,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        n_channels : int
+            Number of channels of the stream.
+        sampling_rate : int | float
+            Number of sample per second, by default 128
+        nperseg : int
+            Number of samples per segment, by default 256
+        noverlap : int, optional
+            Number of samples segments overlap, by default None which results in ``nperseg // 2``
+        n_segments : int, optional
+            Number of latest segments averaged, by default None which averages all segments
+        emit_every : int, optional
+            Number of samples between emitted estimates starting with the first segment,
+            needs to be a multiple of the hop (``nperseg - noverlap``),
+            by default None which emits an estimate per segment
+        window : str | tuple | np.ndarray
+            Taper applied to each segment, either the values or a specification
+            understood by ``scipy.signal.get_window``, by default "hann"
+        norm : bool
+            Whether to normalize the spectra to 1 or not, by default False
+
+        Raises
+        ------
+        ValueError
+            If ``noverlap`` isn't smaller than ``nperseg`` or ``emit_every``
+            isn't a multiple of the hop.
+
+
+        .. # noqa: DAR101
+        .. # noqa: DAR401 ValueError
+        """
+        if noverlap is None:
+            noverlap = nperseg // 2
+        if not 0 <= noverlap < nperseg:
+            raise ValueError(
+                f"noverlap ({noverlap}) needs to be smaller than nperseg ({nperseg})."
+            )
+        self.hop = nperseg - noverlap
+        if emit_every is None:
+            emit_every = self.hop
+        if emit_every <= 0 or emit_every % self.hop != 0:
+            raise ValueError(f"emit_every ({emit_every}) needs to be a multiple of {self.hop}.")
+        self.n_channels = n_channels
+        self.sampling_rate = sampling_rate
+        self.nperseg = nperseg
+        self.n_segments = n_segments
+        self.emit_every = emit_every
+        self.norm = norm
+        self.frequencies = np.fft.rfftfreq(nperseg, d=1 / sampling_rate)
+
+        taper = _get_taper(window, nperseg)
+        self._taper = taper[:, np.newaxis]
+        # same scaling as power_density_spectra(method="welch"):
+        # welch(scaling="spectrum") of a one-sided spectrum multiplied by 2
+        one_sided = np.full(self.frequencies.size, 2.0)
+        one_sided[0] = 1
+        if nperseg % 2 == 0:
+            one_sided[-1] = 1
+        self._scaling = (2 * one_sided / taper.sum() ** 2)[:, np.newaxis]
+
+        self._ring = np.zeros((nperseg, n_channels))
+        self._segment = np.empty((nperseg, n_channels))
+        self._power = np.empty((self.frequencies.size, n_channels))
+        self._power_sum = np.zeros((self.frequencies.size, n_channels))
+        self._segment_powers = (
+            None
+            if n_segments is None
+            else np.zeros((n_segments, self.frequencies.size, n_channels))
+        )
+        self.reset()
+
+    def reset(self) -> None:
+        """Discard all received samples and the running spectra."""
+        self.n_samples = 0
+        self.n_segments_total = 0
+        self._ring_position = 0
+        self._power_sum[:] = 0
+        if self._segment_powers is not None:
+            self._segment_powers[:] = 0
+
+    @property
+    def power_density(self) -> np.ndarray:
+        """Current estimate of the power density spectra (frequency x channel).
+
+        Returns
+        -------
+        np.ndarray
+            Average spectra of the considered segments, NaN before the first segment.
+        """
+        n_averaged = self.n_segments_total
+        if self.n_segments is not None:
+            n_averaged = min(n_averaged, self.n_segments)
+        if n_averaged == 0:
+            return np.full_like(self._power_sum, np.nan)
+        power_density = self._power_sum / n_averaged
+        if self.norm:
+            power_density /= power_density.max(axis=0)
+        return power_density
+
+    def update(self, block: np.ndarray | pd.DataFrame) -> list[SpectralUpdate]:
+        """Add a block of samples to the stream.
+
+        Parameters
+        ----------
+        block : np.ndarray | pd.DataFrame
+            Samples with the shape (sample x channel).
+
+        Returns
+        -------
+        list[SpectralUpdate]
+            Estimates emitted while processing the block (one per ``emit_every`` samples).
+
+        Raises
+        ------
+        ValueError
+            If the number of channels of ``block`` differs from ``n_channels``.
+        """
+        values = np.asarray(block, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        if values.shape[1] != self.n_channels:
+            raise ValueError(
+                f"Expected blocks with {self.n_channels} channels, got {values.shape[1]}."
+            )
+        updates = []
+        position = 0
+        while position < values.shape[0]:
+            # samples until the next segment is complete
+            samples_to_segment = self.hop - (self.n_samples - self.nperseg) % self.hop
+            if self.n_samples < self.nperseg:
+                samples_to_segment = self.nperseg - self.n_samples
+            next_position = min(position + samples_to_segment, values.shape[0])
+            self._write(values[position:next_position])
+            position = next_position
+            if self.n_samples >= self.nperseg and (self.n_samples - self.nperseg) % self.hop == 0:
+                self._add_segment()
+                if (self.n_samples - self.nperseg) % self.emit_every == 0:
+                    power_density = self.power_density
+                    updates.append(
+                        SpectralUpdate(
+                            self.n_samples, power_density, _center_of_mass(power_density)
+                        )
+                    )
+        return updates
+
+    def _write(self, values: np.ndarray) -> None:
+        """Write samples into the ring buffer.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            Samples with the shape (sample x channel), at most ``nperseg`` samples.
+        """
+        n_values = values.shape[0]
+        end = self._ring_position + n_values
+        if end <= self.nperseg:
+            self._ring[slice(self._ring_position, end)] = values
+        else:
+            split = self.nperseg - self._ring_position
+            self._ring[slice(self._ring_position, None)] = values[:split]
+            self._ring[: end - self.nperseg] = values[split:]
+        self._ring_position = end % self.nperseg
+        self.n_samples += n_values
+
+    def _add_segment(self) -> None:
+        """Add the spectrum of the latest ``nperseg`` samples to the running average."""
+        # unroll the ring buffer, so the oldest sample is first
+        tail = self.nperseg - self._ring_position
+        self._segment[:tail] = self._ring[slice(self._ring_position, None)]
+        self._segment[tail:] = self._ring[: self._ring_position]
+        self._segment -= self._segment.mean(axis=0)
+        self._segment *= self._taper
+        # the segment is rebuilt from the ring buffer, so the FFT may use it as work space
+        spectrum = rfft(self._segment, axis=0, overwrite_x=True)
+        np.abs(spectrum, out=self._power)
+        self._power **= 2
+        self._power *= self._scaling
+        self.n_segments_total += 1
+        if self._segment_powers is None:
+            self._power_sum += self._power
+            return
+        slot = (self.n_segments_total - 1) % self._segment_powers.shape[0]
+        if slot == self._segment_powers.shape[0] - 1:
+            # all stored segments were replaced, so the sum is recomputed to discard the
+            # rounding errors of adding and subtracting (amortized cost per segment)
+            self._segment_powers[slot] = self._power
+            np.sum(self._segment_powers, axis=0, out=self._power_sum)
+        else:
+            self._power_sum -= self._segment_powers[slot]
+            self._segment_powers[slot] = self._power
+            self._power_sum += self._power
@@ -2,29 +2,340 @@
 from __future__ import annotations
 
 from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from typing import Sequence
+from typing import Union
 
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import as_strided
+from scipy.signal import get_window
 from scipy.signal import periodogram
+from scipy.signal import welch
 
+from tremana.recording import Recording
+from tremana.utils.profiling import instrument
 
+WindowType = Union[str, tuple, np.ndarray]
+
+
+class WindowedSpectra(NamedTuple):
+    """NamedTuple representing the spectra of sliding windows over multiple channels.
+
+    ``values`` has the shape (time x frequency x channel), where the times are the
+    index values (or times of a ``Recording``) of the input data at the start of each window.
+    """
+
+    times: pd.Index
+    frequencies: np.ndarray
+    channels: pd.Index
+    values: np.ndarray
+
+
+class BatchSpectra(NamedTuple):
+    """NamedTuple representing the spectra of multiple recordings.
+
+    ``values`` has the shape (recording x frequency x channel).
+    """
+
+    frequencies: np.ndarray
+    values: np.ndarray
+
+    def to_dataframe(
+        self, recordings: Sequence[str] | None = None, channels: Sequence[str] | None = None
+    ) -> pd.DataFrame:
+        """Convert the spectra to a dataframe.
+
+        Parameters
+        ----------
+        recordings : Sequence[str], optional
+            Names of the recordings, by default None which uses their position
+        channels : Sequence[str], optional
+            Names of the channels, by default None which uses their position
+
+        Returns
+        -------
+        pd.DataFrame
+            Spectra indexed by recording and frequency with one column per channel.
+        """
+        n_recordings, n_frequencies, n_channels = self.values.shape
+        return pd.DataFrame(
+            self.values.reshape(n_recordings * n_frequencies, n_channels),
+            index=pd.MultiIndex.from_product(
+                [range(n_recordings) if recordings is None else recordings, self.frequencies],
+                names=["recording", "frequency"],
+            ),
+            columns=range(n_channels) if channels is None else channels,
+        )
+
+
+def _select_values(
+    input_dataframe: pd.DataFrame | Recording, columns: Iterable[str] | None = None
+) -> tuple[np.ndarray, pd.Index]:
+    """Extract the values of ``columns`` as 2D float array (sample x column).
+
+    float32 values (e.g. from ``read_somnowatch(..., compact=True)``) are kept as they are,
+    all other data types are converted to float64.
+    The values of a ``Recording`` with all channels selected aren't copied.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
+    columns : Iterable[str], optional
+        Columns to extract, by default None which results in all columns to be used
+
+    Returns
+    -------
+    tuple[np.ndarray, pd.Index]
+        Values and names of the selected columns.
+    """
+    if isinstance(input_dataframe, Recording):
+        if columns is not None:
+            input_dataframe = input_dataframe.select(columns)
+        values = input_dataframe.values
+        if values.dtype not in (np.float32, np.float64):
+            values = values.astype(np.float64)
+        return values, input_dataframe.channels
+    if columns is not None:
+        input_dataframe = input_dataframe[list(columns)]
+    dtype = np.float32 if (input_dataframe.dtypes == np.float32).all() else np.float64
+    return input_dataframe.to_numpy(dtype=dtype), input_dataframe.columns
+
+
+def _sampling_rate(
+    input_dataframe: pd.DataFrame | Recording, sampling_rate: int | float | None
+) -> int | float:
+    """Return the sampling rate used for the transformation of ``input_dataframe``.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
+    sampling_rate : int | float, optional
+        Explicitly passed sampling rate.
+
+    Returns
+    -------
+    int | float
+        ``sampling_rate`` if given, else the sample rate of a recording,
+        ``attrs["sample_rate"]`` of a dataframe (set by the readers) or 128.
+    """
+    if sampling_rate is not None:
+        return sampling_rate
+    if isinstance(input_dataframe, Recording):
+        return input_dataframe.sample_rate
+    return input_dataframe.attrs.get("sample_rate", 128)
+
+
+def _batch_sampling_rate(
+    recordings: np.ndarray | list[pd.DataFrame | Recording | np.ndarray],
+    sampling_rate: int | float | None,
+) -> int | float:
+    """Return the sampling rate shared by all ``recordings`` of a batch.
+
+    Parameters
+    ----------
+    recordings : np.ndarray | list[pd.DataFrame | Recording | np.ndarray]
+        Recordings as (recording x sample x channel) array or list of recordings.
+    sampling_rate : int | float, optional
+        Explicitly passed sampling rate.
+
+    Returns
+    -------
+    int | float
+        ``sampling_rate`` if given, else the sample rate of the recordings and dataframes
+        (see ``_sampling_rate``) and 128 for arrays.
+
+    Raises
+    ------
+    ValueError
+        If the recordings have different sample rates.
+    """
+    default_rate = 128 if sampling_rate is None else sampling_rate
+    if isinstance(recordings, np.ndarray):
+        return default_rate
+    sample_rates = {
+        _sampling_rate(recording, sampling_rate)
+        if isinstance(recording, (pd.DataFrame, Recording))
+        else default_rate
+        for recording in recordings
+    }
+    if len(sample_rates) > 1:
+        raise ValueError(
+            "All recordings of a batch need to have the same sample rate, "
+            f"got the sample rates {sorted(sample_rates)!r}."
+        )
+    return sample_rates.pop() if sample_rates else default_rate
+
+
+def stack_recordings(
+    recordings: np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray],
+    columns: Iterable[str] | None = None,
+) -> np.ndarray:
+    """Stack equal-length recordings into a 3D float array (recording x sample x channel).
+
+    Parameters
+    ----------
+    recordings : np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray]
+        3D array, which is used as it is, or recordings as dataframes, ``Recording``
+        or 2D arrays (sample x channel) with the same shape.
+    columns : Iterable[str], optional
+        Columns to use of dataframes and recordings,
+        by default None which results in all columns to be used
+
+    Returns
+    -------
+    np.ndarray
+        Values of all recordings, float32 if all recordings are float32 and float64 otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the recordings differ in their number of samples or channels
+        or an array doesn't have three dimensions.
+    """
+    if isinstance(recordings, np.ndarray):
+        if recordings.ndim != 3:
+            raise ValueError(
+                "Arrays of recordings need the shape (recording x sample x channel), "
+                f"got an array with {recordings.ndim} dimensions."
+            )
+        values = recordings
+    else:
+        if columns is not None:
+            columns = list(columns)
+        values_list = [
+            _select_values(recording, columns)[0]
+            if isinstance(recording, (pd.DataFrame, Recording))
+            else np.asarray(recording)
+            for recording in recordings
+        ]
+        if len({values.shape for values in values_list}) > 1:
+            raise ValueError(
+                "All recordings need to have the same number of samples and channels, "
+                f"got the shapes {[values.shape for values in values_list]!r}."
+            )
+        values = np.stack(values_list)
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    return values
+
+
+def _fft_spectra(
+    values: np.ndarray, sampling_rate: int | float, norm: bool, axis: int = 0
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the one-sided FFT amplitude spectra along ``axis`` for all signals at once.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of signals with the samples along ``axis``.
+    sampling_rate : int | float
+        Number of sample per second.
+    norm : bool
+        Whether to normalize the spectra to 1 or not.
+    axis : int
+        Sample axis of ``values``, by default 0
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Frequencies and spectra with the frequency along ``axis``.
+    """
+    n_samples = values.shape[axis]
+    frequencies = np.fft.rfftfreq(n_samples, d=1 / sampling_rate)
+    amplitudes = np.abs(np.fft.rfft(values, axis=axis)).astype(values.dtype, copy=False)
+    amplitudes *= 2 / n_samples
+    if norm:
+        amplitudes /= amplitudes.max(axis=axis, keepdims=True)
+    return frequencies, amplitudes
+
+
+def _power_density_spectra(
+    values: np.ndarray,
+    sampling_rate: int | float,
+    norm: bool,
+    method: str,
+    nperseg: int | None,
+    noverlap: int | None,
+    axis: int = 0,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate the power density spectra along ``axis`` for all signals at once.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Array of signals with the samples along ``axis``.
+    sampling_rate : int | float
+        Number of sample per second.
+    norm : bool
+        Whether to normalize the spectra to 1 or not.
+    method : str
+        Method used to estimate the spectra, "periodogram" or "welch".
+    nperseg : int | None
+        Number of samples per segment for ``method="welch"``.
+    noverlap : int | None
+        Number of samples segments overlap for ``method="welch"``.
+    axis : int
+        Sample axis of ``values``, by default 0
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Frequencies and spectra with the frequency along ``axis``.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` isn't supported.
+    """
+    if method == "periodogram":
+        frequencies, power_density = periodogram(values, sampling_rate, axis=axis)
+        scaling = 2 / (values.shape[axis] / sampling_rate)
+    elif method == "welch":
+        frequencies, power_density = welch(
+            values,
+            sampling_rate,
+            nperseg=nperseg,
+            noverlap=noverlap,
+            scaling="spectrum",
+            axis=axis,
+        )
+        scaling = 2
+    else:
+        raise ValueError(
+            f"Unknown method {method!r}, supported methods are 'periodogram' and 'welch'."
+        )
+    if norm:
+        power_density /= power_density.max(axis=axis, keepdims=True)
+    else:
+        power_density *= scaling
+    return frequencies, power_density
+
+
+@instrument
 def fft_spectra(
-    input_dataframe: pd.DataFrame,
+    input_dataframe: pd.DataFrame | Recording,
     columns: Iterable[str] | None = None,
-    sampling_rate: int | float = 128,
+    sampling_rate: int | float | None = None,
     norm: bool = False,
 ) -> pd.DataFrame:
     """Calculate the FFT of accelerometry data.
 
+    The one-sided spectra of all columns are calculated at once using a real FFT.
+
     Parameters
     ----------
-    input_dataframe : pd.DataFrame
-        Dataframe containing accelerometry data.
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
     columns : Iterable[str], optional
         Columns co calculate the FFT for,
         by default None which results in all columns to be used
-    sampling_rate : int
-        Number of sample per second, by default 128
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of a recording and 128 otherwise
     norm : bool
         Whether to normalize the the data to 1 or not, by default False
 
@@ -33,55 +344,452 @@ def fft_spectra(
     pd.DataFrame
         FFT spectra of the accelerometry data.
     """
-    n_samples = input_dataframe.shape[0]
-    freq = np.fft.fftfreq(n_samples, d=1 / sampling_rate)
-    fft_results = {}
-    if columns is None:
-        columns = input_dataframe.columns
-    for column in columns:
-        fft_vals = 2 / n_samples * np.abs(np.fft.fft(input_dataframe[column]))
-        if norm:
-            fft_vals /= fft_vals.max()
-        fft_results[column] = fft_vals
-    fft_df = pd.DataFrame(fft_results, index=freq)
-    return fft_df.iloc[freq >= 0, :]
+    values, columns = _select_values(input_dataframe, columns)
+    freq, fft_vals = _fft_spectra(values, _sampling_rate(input_dataframe, sampling_rate), norm)
+    return pd.DataFrame(fft_vals, index=freq, columns=columns)
 
 
+@instrument
 def power_density_spectra(
-    input_dataframe: pd.DataFrame,
+    input_dataframe: pd.DataFrame | Recording,
     columns: Iterable[str] | None = None,
-    sampling_rate: int | float = 128,
+    sampling_rate: int | float | None = None,
     norm: bool = False,
+    method: str = "periodogram",
+    nperseg: int | None = None,
+    noverlap: int | None = None,
 ) -> pd.DataFrame:
     """Calculate the power density spectra of accelerometry data.
 
     Compared to the FFT the resulting values are FFT[-freq]*FFT[freq] with freq>=0.
 
+    With ``method="welch"`` the spectra are averaged over overlapping (hann tapered)
+    segments, which reduces the noise of the estimate and results in ``nperseg // 2 + 1``
+    frequencies independent of the length of the recording.
+
     Parameters
     ----------
-    input_dataframe : pd.DataFrame
-        Dataframe containing accelerometry data.
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
     columns : Iterable[str]
         Columns co calculate the FFT for,
         by default None which results in all columns to be used
-    sampling_rate : int | float
-        Number of sample per second, by default 128
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of a recording and 128 otherwise
     norm : bool
         Whether to normalize the the data to 1 or not, by default False
+    method : str
+        Method used to estimate the spectra, "periodogram" or "welch", by default "periodogram"
+    nperseg : int, optional
+        Number of samples per segment for ``method="welch"``,
+        by default None which uses the default of ``scipy.signal.welch``
+    noverlap : int, optional
+        Number of samples segments overlap for ``method="welch"``,
+        by default None which results in ``nperseg // 2``
 
     Returns
     -------
     pd.DataFrame
         Power density spectra accelerometry data.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` isn't supported.
+
+
+    .. # noqa: DAR402 ValueError
+    """
+    values, columns = _select_values(input_dataframe, columns)
+    frequency, power_density = _power_density_spectra(
+        values, _sampling_rate(input_dataframe, sampling_rate), norm, method, nperseg, noverlap
+    )
+    return pd.DataFrame(power_density, index=frequency, columns=columns)
+
+
+@instrument
+def batch_fft_spectra(
+    recordings: np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray],
+    sampling_rate: int | float | None = None,
+    norm: bool = False,
+) -> BatchSpectra:
+    """Calculate the FFT spectra of multiple recordings in one batched call.
+
+    Parameters
+    ----------
+    recordings : np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray]
+        Recordings as (recording x sample x channel) array or equal-length recordings
+        (see ``stack_recordings``).
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of the recordings and 128 otherwise
+    norm : bool
+        Whether to normalize the the data to 1 or not, by default False
+
+    Returns
+    -------
+    BatchSpectra
+        Spectra of all recordings as (recording x frequency x channel) array.
+
+    Raises
+    ------
+    ValueError
+        If the recordings have different sample rates.
+
+    See Also
+    --------
+    fft_spectra
+    stack_recordings
+
+
+    .. # noqa: DAR402 ValueError
+    """
+    if not isinstance(recordings, np.ndarray):
+        recordings = list(recordings)
+    return BatchSpectra(
+        *_fft_spectra(
+            stack_recordings(recordings),
+            _batch_sampling_rate(recordings, sampling_rate),
+            norm,
+            axis=1,
+        )
+    )
+
+
+@instrument
+def batch_power_density_spectra(
+    recordings: np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray],
+    sampling_rate: int | float | None = None,
+    norm: bool = False,
+    method: str = "periodogram",
+    nperseg: int | None = None,
+    noverlap: int | None = None,
+) -> BatchSpectra:
+    """Calculate the power density spectra of multiple recordings in one batched call.
+
+    Parameters
+    ----------
+    recordings : np.ndarray | Iterable[pd.DataFrame | Recording | np.ndarray]
+        Recordings as (recording x sample x channel) array or equal-length recordings
+        (see ``stack_recordings``).
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of the recordings and 128 otherwise
+    norm : bool
+        Whether to normalize the the data to 1 or not, by default False
+    method : str
+        Method used to estimate the spectra, "periodogram" or "welch", by default "periodogram"
+    nperseg : int, optional
+        Number of samples per segment for ``method="welch"``,
+        by default None which uses the default of ``scipy.signal.welch``
+    noverlap : int, optional
+        Number of samples segments overlap for ``method="welch"``,
+        by default None which results in ``nperseg // 2``
+
+    Returns
+    -------
+    BatchSpectra
+        Spectra of all recordings as (recording x frequency x channel) array.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` isn't supported or the recordings have different sample rates.
+
+    See Also
+    --------
+    power_density_spectra
+    stack_recordings
+
+
+    .. # noqa: DAR402 ValueError
+    """
+    if not isinstance(recordings, np.ndarray):
+        recordings = list(recordings)
+    return BatchSpectra(
+        *_power_density_spectra(
+            stack_recordings(recordings),
+            _batch_sampling_rate(recordings, sampling_rate),
+            norm,
+            method,
+            nperseg,
+            noverlap,
+            axis=1,
+        )
+    )
+
+
+def _sliding_windows(values: np.ndarray, window_length: int, hop: int) -> np.ndarray:
+    """Create a read-only view of sliding windows over the first axis of ``values``.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D array (sample x channel).
+    window_length : int
+        Number of samples per window.
+    hop : int
+        Number of samples between the starts of consecutive windows.
+
+    Returns
+    -------
+    np.ndarray
+        View of ``values`` with the shape (window x sample x channel), no data are copied.
+    """
+    n_windows = max((values.shape[0] - window_length) // hop + 1, 0)
+    sample_stride, channel_stride = values.strides
+    return as_strided(
+        values,
+        shape=(n_windows, window_length, values.shape[1]),
+        strides=(hop * sample_stride, sample_stride, channel_stride),
+        writeable=False,
+    )
+
+
+def _get_taper(window: WindowType, window_length: int) -> np.ndarray:
+    """Get the values of a window function.
+
+    Parameters
+    ----------
+    window : WindowType
+        Values of the window function or a specification
+        understood by ``scipy.signal.get_window``.
+    window_length : int
+        Number of samples per window.
+
+    Returns
+    -------
+    np.ndarray
+        Values of the window function.
+    """
+    return window if isinstance(window, np.ndarray) else get_window(window, window_length)
+
+
+def _check_windows(window: WindowType, window_length: int, hop: int) -> None:
+    """Check the parameters of sliding windows.
+
+    Parameters
+    ----------
+    window : WindowType
+        Values of the window function or a specification
+        understood by ``scipy.signal.get_window``.
+    window_length : int
+        Number of samples per window.
+    hop : int
+        Number of samples between the starts of consecutive windows.
+
+    Raises
+    ------
+    ValueError
+        If ``hop`` isn't positive or the values of ``window`` don't have ``window_length``.
+    """
+    if hop <= 0:
+        raise ValueError(f"hop ({hop}) needs to be positive.")
+    if isinstance(window, np.ndarray) and window.shape != (window_length,):
+        raise ValueError(
+            f"window has the shape {window.shape}, "
+            f"but the values of a window need the shape ({window_length},)."
+        )
+
+
+def _windowed_fft_amplitudes(windows: np.ndarray, taper: np.ndarray) -> np.ndarray:
+    """Calculate the amplitude spectra of all windows at once.
+
+    The amplitudes are corrected for the coherent gain of ``taper``, so a sine
+    results in a peak with its amplitude (same as ``fft_spectra``).
+
+    Parameters
+    ----------
+    windows : np.ndarray
+        Array of the shape (window x sample x channel).
+    taper : np.ndarray
+        Window function with one value per sample.
+
+    Returns
+    -------
+    np.ndarray
+        Amplitude spectra with the shape (window x frequency x channel)
+        and the data type of ``windows``.
+    """
+    amplitudes = np.abs(np.fft.rfft(windows * taper[:, np.newaxis], axis=1)).astype(
+        windows.dtype, copy=False
+    )
+    amplitudes *= 2 / taper.sum()
+    return amplitudes
+
+
+@instrument
+def windowed_spectra(
+    input_dataframe: pd.DataFrame | Recording,
+    columns: Iterable[str] | None = None,
+    sampling_rate: int | float | None = None,
+    window_length: int = 1024,
+    hop: int | None = None,
+    window: WindowType = "hann",
+    norm: bool = False,
+    active: np.ndarray | pd.Series | None = None,
+) -> WindowedSpectra:
+    """Calculate the FFT spectra of sliding windows over accelerometry data.
+
+    This allows to follow changes of the tremor over time (short-time FFT).
+    With ``active`` only the spectra of the windows containing movement are calculated.
+
+    Parameters
+    ----------
+    input_dataframe : pd.DataFrame | Recording
+        Dataframe or recording containing accelerometry data.
+    columns : Iterable[str], optional
+        Columns co calculate the spectra for,
+        by default None which results in all columns to be used
+    sampling_rate : int | float, optional
+        Number of sample per second,
+        by default None which uses the sample rate of a recording and 128 otherwise
+    window_length : int
+        Number of samples per window, by default 1024
+    hop : int, optional
+        Number of samples between the starts of consecutive windows,
+        by default None which results in ``window_length // 2``
+    window : WindowType
+        Taper applied to each window, either the values or a specification
+        understood by ``scipy.signal.get_window``, by default "hann"
+    norm : bool
+        Whether to normalize each spectrum to 1 or not, by default False
+    active : np.ndarray | pd.Series, optional
+        Mask of the windows to calculate the spectra for (e.g. from ``active_windows``),
+        by default None which calculates the spectra of all windows
+
+    Returns
+    -------
+    WindowedSpectra
+        Spectra of all (active) windows as (time x frequency x channel) array.
+
+    Raises
+    ------
+    ValueError
+        If the length of ``active`` differs from the number of windows,
+        ``hop`` isn't positive or the values of ``window`` don't have ``window_length``.
+
+    See Also
+    --------
+    fft_spectra
+    tremana.analysis.activity.active_windows
+    """
+    if hop is None:
+        hop = window_length // 2
+    _check_windows(window, window_length, hop)
+    values, columns = _select_values(input_dataframe, columns)
+    windows = _sliding_windows(values, window_length=window_length, hop=hop)
+    positions = np.arange(windows.shape[0]) * hop
+    if active is not None:
+        active = np.asarray(active, dtype=bool)
+        if active.shape != positions.shape:
+            raise ValueError(
+                f"active has {active.size} values, but there are {positions.size} windows."
+            )
+        # only the active windows are copied out of the sliding window view
+        windows = windows[active]
+        positions = positions[active]
+    amplitudes = _windowed_fft_amplitudes(windows, _get_taper(window, window_length))
+    if norm:
+        amplitudes /= amplitudes.max(axis=1, keepdims=True)
+    return WindowedSpectra(
+        times=input_dataframe.time_index(positions)
+        if isinstance(input_dataframe, Recording)
+        else input_dataframe.index[positions],
+        frequencies=np.fft.rfftfreq(
+            window_length, d=1 / _sampling_rate(input_dataframe, sampling_rate)
+        ),
+        channels=columns,
+        values=amplitudes,
+    )
+
+
+@instrument
+def iter_windowed_spectra(
+    chunks: Iterable[pd.DataFrame],
+    columns: Iterable[str] | None = None,
+    sampling_rate: int | float | None = None,
+    window_length: int = 1024,
+    hop: int | None = None,
+    window: WindowType = "hann",
+    norm: bool = False,
+) -> Iterator[WindowedSpectra]:
+    """Calculate the FFT spectra of sliding windows over consecutive chunks of data.
+
+    Samples of windows overlapping the border of two chunks are carried over
+    to the next chunk, so the results are the same as for ``windowed_spectra``
+    on the whole data, while the memory is bounded by the chunk size.
+
+    Parameters
+    ----------
+    chunks : Iterable[pd.DataFrame]
+        Consecutive chunks of accelerometry data (e.g. from ``iter_somnowatch``).
+    columns : Iterable[str], optional
+        Columns co calculate the spectra for,
+        by default None which results in all columns to be used
+    sampling_rate : int | float, optional
+        Number of sample per second, by default None which uses
+        ``attrs["sample_rate"]`` of the first chunk and 128 otherwise
+    window_length : int
+        Number of samples per window, by default 1024
+    hop : int, optional
+        Number of samples between the starts of consecutive windows,
+        by default None which results in ``window_length // 2``
+    window : WindowType
+        Taper applied to each window, either the values or a specification
+        understood by ``scipy.signal.get_window``, by default "hann"
+    norm : bool
+        Whether to normalize each spectrum to 1 or not, by default False
+
+    Yields
+    ------
+    WindowedSpectra
+        Spectra of all windows which are complete after adding a chunk.
+
+    Raises
+    ------
+    ValueError
+        If ``hop`` isn't positive or the values of ``window`` don't have ``window_length``.
+
+    See Also
+    --------
+    windowed_spectra
+    tremana.parsers.devices.somnowatch.iter_somnowatch
+
+
+    .. # noqa: DAR402 ValueError
     """
-    pds_results = {}
-    if columns is None:
-        columns = input_dataframe.columns
-    for column in columns:
-        frequency, power_density = periodogram(input_dataframe[column], sampling_rate)
-        if norm:
-            power_density /= power_density.max()
-        else:
-            power_density *= 2 / (input_dataframe.shape[0] / sampling_rate)
-        pds_results[column] = power_density
-    return pd.DataFrame(pds_results, index=frequency)
+    if hop is None:
+        hop = window_length // 2
+    _check_windows(window, window_length, hop)
+    taper = _get_taper(window, window_length)
+    frequencies: np.ndarray | None = None
+    carry_values: np.ndarray | None = None
+    carry_index: pd.Index | None = None
+    for chunk in chunks:
+        if frequencies is None:
+            frequencies = np.fft.rfftfreq(
+                window_length, d=1 / _sampling_rate(chunk, sampling_rate)
+            )
+        values, channels = _select_values(chunk, columns)
+        index = chunk.index
+        if carry_values is not None and carry_index is not None:
+            values = np.concatenate((carry_values, values))
+            index = carry_index.append(index)
+        windows = _sliding_windows(values, window_length=window_length, hop=hop)
+        n_windows = windows.shape[0]
+        if n_windows > 0:
+            amplitudes = _windowed_fft_amplitudes(windows, taper)
+            if norm:
+                amplitudes /= amplitudes.max(axis=1, keepdims=True)
+            yield WindowedSpectra(
+                times=index[np.arange(n_windows) * hop],
+                frequencies=frequencies,
+                channels=channels,
+                values=amplitudes,
+            )
+        next_start = n_windows * hop
+        # copy so the rest of the chunk can be freed
+        carry_values = values[next_start:].copy()
+        carry_index = index[next_start:]
@@ -5,23 +5,104 @@ import sys
 
 import click
 
+from tremana.constants import SPECTRA_METHODS
 
-@click.command()
-def main(args: list[str] | None = None) -> int:
-    """Console script for tremana.
+# Heavy dependencies (pandas, scipy, ...) are only imported inside of the commands,
+# so the CLI starts fast.
+
+
+@click.group()
+def main() -> None:
+    """Tremor analysis of accelerometry data."""
+
+
+@main.command()
+@click.argument("directory", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "-o",
+    "--output",
+    type=click.Path(dir_okay=False, writable=True),
+    default="tremana_results.csv",
+    show_default=True,
+    help="CSV file to write the results table to.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of recordings to analyze in parallel.",
+)
+@click.option(
+    "--pattern",
+    default="*",
+    show_default=True,
+    help="Glob pattern of the exported files.",
+)
+@click.option(
+    "--method",
+    type=click.Choice(SPECTRA_METHODS),
+    default="welch",
+    show_default=True,
+    help="Method to calculate the spectra.",
+)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write a Chrome trace (JSON) of the processing steps to this file.",
+)
+def analyze(
+    directory: str, output: str, jobs: int, pattern: str, method: str, profile: str | None
+) -> None:
+    r"""Analyze all recordings of supported devices in DIRECTORY.
+
+    The device of each file is detected from its header and all files of
+    a device in the same folder are treated as one recording.
+    \f
 
     Parameters
     ----------
-    args : List[str], optional
-        Commandline arguments
-
-    Returns
-    -------
-    int
+    directory : str
+        Root directory of the exports.
+    output : str
+        CSV file to write the results table to.
+    jobs : int
+        Number of recordings to analyze in parallel.
+    pattern : str
+        Glob pattern of the exported files.
+    method : str
+        Method to calculate the spectra.
+    profile : str | None
+        File to write a Chrome trace of the processing steps to.
     """
-    click.echo("Replace this message by putting your code into " "tremana.cli.main")
-    click.echo("See click documentation at https://click.palletsprojects.com/")
-    return 0
+    from tremana.pipeline import analyze_cohort
+    from tremana.pipeline import combine_recording_results
+    from tremana.utils.profiling import Profiler
+
+    results = []
+    for result in analyze_cohort(
+        directory, jobs=jobs, pattern=pattern, method=method, profile=profile is not None
+    ):
+        name = f"{result.recording} ({result.device})"
+        if result.error is None:
+            click.echo(f"{name}: {result.processing_time:.3f}s")
+        else:
+            click.echo(
+                f"{name}: failed after {result.processing_time:.3f}s\n    {result.error}",
+                err=True,
+            )
+        results.append(result)
+    combine_recording_results(results).to_csv(output, index=False)
+    n_failed = sum(result.error is not None for result in results)
+    click.echo(f"Analyzed {len(results) - n_failed} of {len(results)} recordings -> {output}")
+    if profile is not None:
+        profiler = Profiler(record for result in results for record in result.profile or [])
+        profiler.write_chrome_trace(profile)
+        click.echo(f"\n{profiler.summary().to_string()}\n\nProfile -> {profile}")
+    if n_failed:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,4 @@
+"""Constants shared by the CLI and the analysis, without importing heavy dependencies."""
+
+SPECTRA_METHODS = ("fft", "periodogram", "welch")
+"""Methods to calculate the spectra of a recording in the pipeline."""
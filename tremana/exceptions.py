@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+from typing import Iterable
 
 from tremana import __repo_short_url__
 
@@ -73,3 +74,119 @@ class TremanaParsingSampleRateException(TremanaParsingException):
             "can't be cast to float, which is needed for fft."
         )
         super().__init__(*args, msg=msg, origin_file=origin_file)
+
+
+class TremanaParsingDataLengthException(TremanaParsingException):
+    """Error thrown when the number of samples doesn't match the length in the header."""
+
+    def __init__(
+        self,
+        *args: object,
+        expected_length: int,
+        actual_length: int | None = None,
+        origin_file: str | os.PathLike[str] | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        expected_length : int
+            Number of samples given in the header.
+        actual_length : int, optional
+            Number of samples in the data, by default None which means that
+            there are more samples than ``expected_length``.
+        origin_file : Union[str, os.PathLike]
+            Path to the file causing the warning, by default None
+
+
+        .. # noqa: DAR101
+        """
+        actual_length_str = (
+            f"more than {expected_length}" if actual_length is None else f"{actual_length}"
+        )
+        msg = (
+            f"The header states a length of {expected_length} samples, "
+            f"but the data contain {actual_length_str} samples."
+        )
+        super().__init__(*args, msg=msg, origin_file=origin_file)
+
+
+class TremanaParsingUnknownDeviceException(TremanaParsingException):
+    """Error thrown when a file can't be assigned to a device parser."""
+
+    def __init__(
+        self,
+        *args: object,
+        devices: Iterable[str],
+        origin_file: str | os.PathLike[str] | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        devices : Iterable[str]
+            Names of the registered device parsers.
+        origin_file : Union[str, os.PathLike]
+            Path to the file causing the warning, by default None
+
+
+        .. # noqa: DAR101
+        """
+        msg = (
+            "The header doesn't match any of the supported devices "
+            f"{sorted(devices)!r}, so the file can't be read."
+        )
+        super().__init__(*args, msg=msg, origin_file=origin_file)
+
+
+class TremanaParsingMixedDevicesException(TremanaParsingException):
+    """Error thrown when the files of a recording were created by different devices."""
+
+    def __init__(
+        self,
+        *args: object,
+        devices: Iterable[str],
+        origin_file: str | os.PathLike[str] | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        devices : Iterable[str]
+            Names of the detected devices.
+        origin_file : Union[str, os.PathLike]
+            Path to the folder causing the warning, by default None
+
+
+        .. # noqa: DAR101
+        """
+        msg = (
+            f"The files were created by different devices {sorted(devices)!r}, "
+            "but a recording can only be read from the files of a single device."
+        )
+        super().__init__(*args, msg=msg, origin_file=origin_file)
+
+
+class TremanaParsingMixedSampleRatesException(TremanaParsingException):
+    """Error thrown when channels with different sample rates can't be combined."""
+
+    def __init__(
+        self,
+        *args: object,
+        sample_rates: Iterable[float],
+        origin_file: str | os.PathLike[str] | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        sample_rates : Iterable[float]
+            Sample rates of the channels.
+        origin_file : Union[str, os.PathLike]
+            Path to the file causing the warning, by default None
+
+
+        .. # noqa: DAR101
+        """
+        msg = (
+            f"The channels have different sample rates {sorted(set(sample_rates))!r}, "
+            "so their samples can't be indexed by a common sample number. "
+            "Align the channels to resample them to a common sample rate."
+        )
+        super().__init__(*args, msg=msg, origin_file=origin_file)
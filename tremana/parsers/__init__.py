@@ -1 +1,4 @@
 """Package containing parser for intermediate files and device raw data."""
+from tremana.utils.lazy_import import lazy_submodules
+
+__getattr__, __dir__ = lazy_submodules(__name__, ("catalog", "devices", "registry"))
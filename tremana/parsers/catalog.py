@@ -0,0 +1,314 @@
+"""Persistent metadata index (catalog) of somnowatch archives.
+
+The catalog is a SQLite database containing the header metadata of every file
+of an archive. Updating it only reads the headers of new or modified files
+(detected by size and modification time), and queries don't open any data file.
+Files which aren't somnowatch exports are recorded as skipped, so they aren't read again
+until they change.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import TracebackType
+from typing import Iterable
+
+import pandas as pd
+
+from tremana.exceptions import TremanaParsingException
+from tremana.parsers.devices.somnowatch import SOMNOWATCH_DATETIME_FORMAT
+from tremana.parsers.devices.somnowatch import _somnowatch_parse_header
+from tremana.utils.cache import source_file_stamp
+from tremana.utils.io import _read_header
+from tremana.utils.profiling import in_caller_context
+from tremana.utils.profiling import instrument
+from tremana.warnings import TremanaParsingIgnoredSignalTypeWarning
+from tremana.warnings import filter_tremana_warnings
+
+_CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    recording TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    signal_type TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    sample_rate REAL NOT NULL,
+    length INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    unit TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_recording ON files (recording);
+CREATE INDEX IF NOT EXISTS files_sample_rate_duration ON files (sample_rate, duration);
+CREATE TABLE IF NOT EXISTS skipped_files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+# The header of a somnowatch export fits into a single block,
+# which limits the bytes read of binary files without line breaks
+_HEADER_MAX_SIZE = 4096
+
+
+def _read_catalog_header(file_path: str) -> list[str] | None:
+    """Read the header lines of a file, which might not be a somnowatch export.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file.
+
+    Returns
+    -------
+    list[str] | None
+        Header lines of the file or None if it can't be read (e.g. it was deleted).
+    """
+    try:
+        return _read_header(file_path, 5, max_size=_HEADER_MAX_SIZE, errors="replace")
+    except OSError:
+        return None
+
+
+class SomnoWatchCatalog:
+    """Persistent metadata index of somnowatch exports backed by a SQLite database.
+
+    Files in the same folder are considered to belong to the same recording.
+
+    Examples
+    --------
+    >>> with SomnoWatchCatalog("archive.sqlite") as catalog:
+    ...     catalog.update("path/to/archive")
+    ...     catalog.query(sample_rate=128, min_duration=6 * 3600, by_recording=True)
+    """
+
+    def __init__(self, database: str | os.PathLike[str]) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        database : str | os.PathLike[str]
+            Path to the SQLite database, which is created if it doesn't exist.
+
+
+        .. # noqa: DAR101
+        """
+        self.connection = sqlite3.connect(str(database))
+        self.connection.executescript(_CATALOG_SCHEMA)
+
+    def __enter__(self) -> SomnoWatchCatalog:
+        """Use the catalog as context manager which closes the connection on exit.
+
+        Returns
+        -------
+        SomnoWatchCatalog
+            The catalog itself.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the connection to the database.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            Type of the exception raised in the context.
+        exc_value : BaseException | None
+            Exception raised in the context.
+        traceback : TracebackType | None
+            Traceback of the exception raised in the context.
+        """
+        self.close()
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self.connection.close()
+
+    @instrument
+    def update(
+        self,
+        directory: str | os.PathLike[str],
+        pattern: str = "*.txt",
+        max_workers: int = 1,
+    ) -> int:
+        """Index all files matching ``pattern`` in the directory tree ``directory``.
+
+        Only new or modified files are read and entries of deleted files are removed.
+        Files which can't be parsed as somnowatch export are skipped
+        and only read again once they are modified.
+
+        Parameters
+        ----------
+        directory : str | os.PathLike[str]
+            Root directory of the archive.
+        pattern : str
+            Glob pattern of the exported files, by default "*.txt"
+        max_workers : int
+            Number of threads reading the headers, by default 1
+
+        Returns
+        -------
+        int
+            Number of files which were (re)indexed.
+        """
+        directory = Path(directory).resolve()
+        directory_prefix = f"{directory}{os.sep}"
+        indexed_stamps = {
+            path: {"size": size, "mtime_ns": mtime_ns}
+            for path, size, mtime_ns in self.connection.execute(
+                "SELECT path, size, mtime_ns FROM files WHERE substr(path, 1, ?) = ? "
+                "UNION ALL "
+                "SELECT path, size, mtime_ns FROM skipped_files WHERE substr(path, 1, ?) = ?",
+                (len(directory_prefix), directory_prefix) * 2,
+            )
+        }
+        stamps = {}
+        for file_path in sorted(directory.rglob(pattern)):
+            try:
+                if file_path.is_file():
+                    stamps[str(file_path)] = source_file_stamp(file_path)
+            except OSError:
+                # deleted since globbing
+                continue
+        changed_files = [
+            file_path
+            for file_path, stamp in stamps.items()
+            if indexed_stamps.get(file_path) != stamp
+        ]
+        deleted_files = indexed_stamps.keys() - stamps.keys()
+        rows, skipped_files = self._parse_headers(changed_files, stamps, max_workers=max_workers)
+        outdated_paths = [(path,) for path in [*deleted_files, *changed_files]]
+        with self.connection:
+            self.connection.executemany("DELETE FROM files WHERE path = ?", outdated_paths)
+            self.connection.executemany("DELETE FROM skipped_files WHERE path = ?", outdated_paths)
+            self.connection.executemany(
+                "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self.connection.executemany(
+                "INSERT INTO skipped_files VALUES (?, ?, ?)",
+                ((path, stamps[path]["size"], stamps[path]["mtime_ns"]) for path in skipped_files),
+            )
+        return len(rows)
+
+    @staticmethod
+    def _parse_headers(
+        file_paths: list[str], stamps: dict[str, dict[str, int]], max_workers: int = 1
+    ) -> tuple[list[tuple[object, ...]], list[str]]:
+        """Parse the headers of files into rows of the files table.
+
+        Parameters
+        ----------
+        file_paths : list[str]
+            Paths to the files.
+        stamps : dict[str, dict[str, int]]
+            Size and modification time of the files.
+        max_workers : int
+            Number of threads reading the headers, by default 1
+
+        Returns
+        -------
+        tuple[list[tuple[object, ...]], list[str]]
+            Rows of the successfully parsed files and paths of the files
+            which aren't somnowatch exports. Files which can't be read are in neither.
+        """
+        if max_workers == 1:
+            header_lines_list = list(map(_read_catalog_header, file_paths))
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                header_lines_list = list(
+                    executor.map(in_caller_context(_read_catalog_header), file_paths)
+                )
+        rows: list[tuple[object, ...]] = []
+        skipped_files = []
+        # all signal types are indexed, not only the ones used by tremana
+        with filter_tremana_warnings((TremanaParsingIgnoredSignalTypeWarning,)):
+            for file_path, header_lines in zip(file_paths, header_lines_list):
+                if header_lines is None:
+                    continue
+                try:
+                    metadata = _somnowatch_parse_header(header_lines, origin_file=file_path)
+                    start_date = pd.to_datetime(
+                        metadata.start_date, format=SOMNOWATCH_DATETIME_FORMAT
+                    )
+                except (TremanaParsingException, ValueError, IndexError):
+                    skipped_files.append(file_path)
+                    continue
+                rows.append(
+                    (
+                        file_path,
+                        os.path.dirname(file_path),
+                        stamps[file_path]["size"],
+                        stamps[file_path]["mtime_ns"],
+                        metadata.signal_type,
+                        start_date.isoformat(),
+                        metadata.sample_rate,
+                        metadata.length,
+                        metadata.length / metadata.sample_rate,
+                        metadata.unit,
+                    )
+                )
+        return rows, skipped_files
+
+    @instrument
+    def query(
+        self,
+        *,
+        sample_rate: float | None = None,
+        min_duration: float | None = None,
+        max_duration: float | None = None,
+        signal_types: Iterable[str] | None = None,
+        by_recording: bool = False,
+    ) -> pd.DataFrame:
+        """Query the indexed files by their metadata.
+
+        Parameters
+        ----------
+        sample_rate : float, optional
+            Sample rate the files need to have, by default None
+        min_duration : float, optional
+            Minimal duration in seconds, by default None
+        max_duration : float, optional
+            Maximal duration in seconds, by default None
+        signal_types : Iterable[str], optional
+            Signal types to select (e.g. ``("X", "Y", "Z", "Mag")``), by default None
+        by_recording : bool
+            Whether to aggregate the matching files per recording, by default False
+
+        Returns
+        -------
+        pd.DataFrame
+            Metadata of the matching files or recordings.
+        """
+        conditions = []
+        parameters: list[object] = []
+        if sample_rate is not None:
+            conditions.append("sample_rate = ?")
+            parameters.append(sample_rate)
+        if min_duration is not None:
+            conditions.append("duration >= ?")
+            parameters.append(min_duration)
+        if max_duration is not None:
+            conditions.append("duration <= ?")
+            parameters.append(max_duration)
+        if signal_types is not None:
+            signal_types = list(signal_types)
+            conditions.append(f"signal_type IN ({', '.join('?' * len(signal_types))})")
+            parameters.extend(signal_types)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        if by_recording:
+            sql = (
+                "SELECT recording, COUNT(*) AS n_files, MIN(start_date) AS start_date, "
+                "MIN(sample_rate) AS sample_rate, MIN(duration) AS duration "
+                f"FROM files {where} GROUP BY recording ORDER BY recording"
+            )
+        else:
+            sql = f"SELECT * FROM files {where} ORDER BY path"
+        return pd.read_sql_query(
+            sql, self.connection, params=parameters, parse_dates=["start_date"]
+        )
@@ -1 +1,4 @@
 """Package containing modules for raw data reading for specific devices."""
+from tremana.utils.lazy_import import lazy_submodules
+
+__getattr__, __dir__ = lazy_submodules(__name__, ("somnowatch",))
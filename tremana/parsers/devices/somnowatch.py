@@ -5,18 +5,40 @@ See: https://somnomedics.de
 from __future__ import annotations
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from itertools import zip_longest
+from pathlib import Path
+from typing import ContextManager
 from typing import Iterable
+from typing import Iterator
 from typing import NamedTuple
 from warnings import warn
 
 import numpy as np
 import pandas as pd
+from numpy.typing import DTypeLike
 
+from tremana.analysis.alignment import align_channels
+from tremana.exceptions import TremanaParsingDataLengthException
+from tremana.exceptions import TremanaParsingException
+from tremana.exceptions import TremanaParsingMixedSampleRatesException
 from tremana.exceptions import TremanaParsingSampleRateException
-from tremana.utils.dataframe_helper import extract_position_by_value
+from tremana.parsers.registry import register_parser
+from tremana.recording import Recording
+from tremana.utils.cache import read_cached_metadata
+from tremana.utils.cache import read_cached_values
+from tremana.utils.cache import write_cache_entry
+from tremana.utils.dataframe_helper import majority_by_group
+from tremana.utils.io import concurrent_read_headers
 from tremana.utils.io import lazy_read_headers
+from tremana.utils.profiling import in_caller_context
+from tremana.utils.profiling import instrument
+from tremana.utils.profiling import record_bytes_read
 from tremana.warnings import TremanaParsingIgnoredSignalTypeWarning
 from tremana.warnings import TremanaParsingInconsistentMetadataWarning
+from tremana.warnings import TremanaParsingIncorrectDateFormatWarning
 from tremana.warnings import filter_tremana_warnings
 
 SOMNOWATCH_TYPE_MAPPING = {
@@ -26,6 +48,16 @@ SOMNOWATCH_TYPE_MAPPING = {
     "Mag_Type": "Mag",
 }
 
+SOMNOWATCH_DATETIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+SOMNOWATCH_HEADER_LENGTH = 7
+SOMNOWATCH_DEVIATION_COLUMNS = (
+    "file",
+    "recording",
+    "metadata_name",
+    "actual_value",
+    "expected_value",
+)
+
 
 class SomnoWatchMetaData(NamedTuple):
     """NamedTuple representing the somnowatch meta information."""
@@ -96,69 +128,920 @@ def _somnowatch_parse_header(
     return SomnoWatchMetaData(signal_type, start_date, sample_rate, length, unit)
 
 
-def _somnowatch_validate_meta_data(
-    file_paths: Iterable[str | os.PathLike[str]],
+def _somnowatch_parse_start_date(
+    start_date: str,
+    origin_file: None | str | os.PathLike[str] = None,
+) -> pd.Timestamp:
+    """Parse the start date of a somnowatch file.
+
+    Parameters
+    ----------
+    start_date : str
+        Start date as given in the header of a somnowatch file.
+    origin_file : str | os.PathLike[str], optional
+        Path to the file causing the warning, by default None
+
+    Returns
+    -------
+    pd.Timestamp
+        Start of the measurement.
+
+    Warns
+    -----
+    TremanaParsingIncorrectDateFormatWarning
+        If ``start_date`` doesn't match ``SOMNOWATCH_DATETIME_FORMAT``
+
+
+    .. # noqa: DAR402 TremanaParsingIncorrectDateFormatWarning
+    """
+    try:
+        return pd.to_datetime(start_date, format=SOMNOWATCH_DATETIME_FORMAT)
+    except ValueError:
+        warn(
+            TremanaParsingIncorrectDateFormatWarning(
+                date_str=start_date,
+                format_str=SOMNOWATCH_DATETIME_FORMAT,
+                origin_file=origin_file,
+            )
+        )
+        return pd.to_datetime(start_date, dayfirst=True)
+
+
+def _somnowatch_time_index(
+    start_date: pd.Timestamp, sample_rate: float, length: int, offset: int = 0
+) -> pd.DatetimeIndex:
+    """Calculate the time axis of a somnowatch measurement from its metadata.
+
+    Since the samples are equidistant the timestamps don't need to be parsed
+    from the data, which is by far the most expensive part of reading the data.
+
+    Parameters
+    ----------
+    start_date : pd.Timestamp
+        Start of the measurement.
+    sample_rate : float
+        Number of samples per second.
+    length : int
+        Number of samples.
+    offset : int
+        Position of the first sample in the measurement, by default 0
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Timestamps of all samples of the measurement.
+    """
+    offsets = np.round(np.arange(offset, offset + length) * (1e9 / sample_rate))
+    return pd.DatetimeIndex(start_date + offsets.astype("timedelta64[ns]"), name="time")
+
+
+def _somnowatch_iter_values(
+    file_path: str | os.PathLike[str], *, chunk_size: int = 2**20
+) -> Iterator[np.ndarray]:
+    """Iterate over the sample values of a somnowatch file in chunks.
+
+    The time column is skipped, since it can be calculated from the metadata
+    (see ``_somnowatch_time_index``).
+
+    Parameters
+    ----------
+    file_path : str | os.PathLike[str]
+        Path to the somnowatch file.
+    chunk_size : int
+        Maximum number of samples per chunk, by default 2**20
+
+    Yields
+    ------
+    np.ndarray
+        Sample values of the chunk.
+    """
+    record_bytes_read(os.path.getsize(file_path))
+    chunks = pd.read_csv(
+        file_path,
+        skiprows=SOMNOWATCH_HEADER_LENGTH,
+        header=None,
+        usecols=[1],
+        sep=";",
+        decimal=",",
+        dtype=np.float64,
+        engine="c",
+        chunksize=chunk_size,
+    )
+    with chunks:
+        for chunk in chunks:
+            yield chunk.iloc[:, 0].to_numpy()
+
+
+def _somnowatch_iter_checked_values(
+    file_path: str | os.PathLike[str],
+    metadata: SomnoWatchMetaData,
+    *,
+    chunk_size: int = 2**20,
+) -> Iterator[np.ndarray]:
+    """Iterate over the sample values of a somnowatch file and check their number.
+
+    Parameters
+    ----------
+    file_path : str | os.PathLike[str]
+        Path to the somnowatch file.
+    metadata : SomnoWatchMetaData
+        Metadata of the file, which contains the expected number of samples.
+    chunk_size : int
+        Number of samples to be parsed at once, by default 2**20
+
+    Yields
+    ------
+    np.ndarray
+        Consecutive chunks of the sample values.
+
+    Raises
+    ------
+    TremanaParsingDataLengthException
+        If the number of samples doesn't match ``metadata.length``.
+    """
+    position = 0
+    for chunk in _somnowatch_iter_values(file_path, chunk_size=chunk_size):
+        position += chunk.size
+        if position > metadata.length:
+            raise TremanaParsingDataLengthException(
+                expected_length=metadata.length, origin_file=file_path
+            )
+        yield chunk
+    if position != metadata.length:
+        raise TremanaParsingDataLengthException(
+            expected_length=metadata.length, actual_length=position, origin_file=file_path
+        )
+
+
+def _somnowatch_read_data(
+    file_path: str | os.PathLike[str],
+    metadata: SomnoWatchMetaData,
+    *,
+    chunk_size: int = 2**20,
+    dtype: DTypeLike = np.float64,
+) -> np.ndarray:
+    """Read the sample values of a somnowatch file.
+
+    Parameters
+    ----------
+    file_path : str | os.PathLike[str]
+        Path to the somnowatch file.
+    metadata : SomnoWatchMetaData
+        Metadata of the file, which is used to preallocate the result.
+    chunk_size : int
+        Number of samples to be parsed at once, by default 2**20
+    dtype : DTypeLike
+        Data type of the returned values, by default np.float64
+
+    Returns
+    -------
+    np.ndarray
+        Sample values of the measurement.
+
+    Raises
+    ------
+    TremanaParsingDataLengthException
+        If the number of samples doesn't match ``metadata.length``.
+
+
+    .. # noqa: DAR402 TremanaParsingDataLengthException
+    """
+    values = np.empty(metadata.length, dtype=dtype)
+    position = 0
+    for chunk in _somnowatch_iter_checked_values(file_path, metadata, chunk_size=chunk_size):
+        stop = position + chunk.size
+        values[position:stop] = chunk
+        position = stop
+    return values
+
+
+def _somnowatch_read_meta_data(
+    file_paths: list[str | os.PathLike[str]],
+    cache_dir: None | str | os.PathLike[str] = None,
+    max_workers: int = 1,
+) -> list[SomnoWatchMetaData]:
+    """Read the metadata of somnowatch files.
+
+    Only the files without a valid cache entry in ``cache_dir`` are opened.
+
+    Parameters
+    ----------
+    file_paths : list[str | os.PathLike[str]]
+        Paths to the somnowatch files.
+    cache_dir : str | os.PathLike[str], optional
+        Directory of the cache for parsed files, by default None
+    max_workers : int
+        Number of threads reading the headers, by default 1
+
+    Returns
+    -------
+    list[SomnoWatchMetaData]
+        Metadata of the files in the same order as ``file_paths``.
+    """
+    cached_metadata = [
+        None if cache_dir is None else read_cached_metadata(cache_dir, file_path)
+        for file_path in file_paths
+    ]
+    uncached_file_paths = [
+        file_path for file_path, metadata in zip(file_paths, cached_metadata) if metadata is None
+    ]
+    if max_workers == 1:
+        header_lines_iter = lazy_read_headers(uncached_file_paths, lines_to_read=5)
+    else:
+        header_lines_iter = concurrent_read_headers(
+            uncached_file_paths, lines_to_read=5, max_workers=max_workers
+        )
+    return [
+        _somnowatch_parse_header(header_lines=next(header_lines_iter), origin_file=file_path)
+        if metadata is None
+        else SomnoWatchMetaData(**metadata)
+        for file_path, metadata in zip(file_paths, cached_metadata)
+    ]
+
+
+def _somnowatch_parse_start_dates(start_dates: pd.Series) -> pd.Series:
+    """Parse the start dates of multiple somnowatch files at once.
+
+    Parameters
+    ----------
+    start_dates : pd.Series
+        Start dates as given in the headers, indexed by the file paths.
+
+    Returns
+    -------
+    pd.Series
+        Parsed start dates.
+
+    See Also
+    --------
+    _somnowatch_parse_start_date
+    """
+    parsed = pd.to_datetime(start_dates, format=SOMNOWATCH_DATETIME_FORMAT, errors="coerce")
+    for origin_file in parsed.index[parsed.isna()]:
+        parsed[origin_file] = _somnowatch_parse_start_date(
+            start_dates[origin_file], origin_file=origin_file
+        )
+    return parsed
+
+
+def _somnowatch_metadata_frame(
+    file_paths: list[str | os.PathLike[str]],
     ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
+    cache_dir: None | str | os.PathLike[str] = None,
+    max_workers: int = 1,
 ) -> pd.DataFrame:
-    header_lines_list = lazy_read_headers(file_paths, lines_to_read=5)
+    """Read the metadata of somnowatch files into a dataframe indexed by file path.
+
+    Parameters
+    ----------
+    file_paths : list[str | os.PathLike[str]]
+        Paths to the somnowatch files.
+    ignore_signal_types : list[str]
+        Signal types which are dropped, by default ["Light_Type", "Accu_Type"]
+    cache_dir : str | os.PathLike[str], optional
+        Directory of the cache for parsed files, by default None
+    max_workers : int
+        Number of threads reading the headers, by default 1
+
+    Returns
+    -------
+    pd.DataFrame
+        Metadata with one row per file and the start dates parsed.
+    """
     ignore_regex = f"'({'|'.join(ignore_signal_types)})'"
     with filter_tremana_warnings((TremanaParsingIgnoredSignalTypeWarning,), message=ignore_regex):
         metadata_df = pd.DataFrame(
-            [
-                _somnowatch_parse_header(header_lines=header_lines, origin_file=origin_file)
-                for header_lines, origin_file in zip(header_lines_list, file_paths)
-            ],
+            _somnowatch_read_meta_data(file_paths, cache_dir=cache_dir, max_workers=max_workers),
             index=list(map(str, file_paths)),
+            columns=SomnoWatchMetaData._fields,
         )
+    metadata_df = metadata_df[~metadata_df["signal_type"].isin(ignore_signal_types)].copy()
+    metadata_df["start_date"] = _somnowatch_parse_start_dates(metadata_df["start_date"])
+    return metadata_df
+
+
+def _somnowatch_metadata_deviations(
+    metadata_df: pd.DataFrame, recordings: pd.Series | None = None
+) -> pd.DataFrame:
+    """Find metadata deviating from the most common value of the recording.
 
-    metadata_df.drop(columns=ignore_signal_types, inplace=True, errors="ignore")
-    metadata_df["start_date"] = pd.to_datetime(metadata_df["start_date"])
-    metadata_df = metadata_df[~metadata_df["signal_type"].isin(ignore_signal_types)]
-    most_common: pd.Series = metadata_df.mode().iloc[0, :]
+    The most common values are determined for all recordings and metadata at once
+    (see ``majority_by_group``), so this scales to the metadata of whole cohorts.
 
-    all_equal_metadata_mask: pd.DataFrame = metadata_df == most_common
+    Parameters
+    ----------
+    metadata_df : pd.DataFrame
+        Metadata as returned by ``_somnowatch_metadata_frame``.
+    recordings : pd.Series, optional
+        Recording each file belongs to, by default None which means
+        that all files belong to the same recording.
+
+    Returns
+    -------
+    pd.DataFrame
+        Report with one row per deviating value and the columns
+        ``SOMNOWATCH_DEVIATION_COLUMNS``.
+    """
+    if recordings is None:
+        recordings = pd.Series("", index=metadata_df.index)
     # signal_type is supposed to differ
-    all_equal_metadata_mask.drop(columns=["signal_type"], inplace=True)
-
-    if not np.all(all_equal_metadata_mask):
-        positions: list[tuple[str, str]] = extract_position_by_value(  # type:ignore
-            all_equal_metadata_mask, value=False
-        )
-        for file_path, value_name in positions:
-            if metadata_df.loc[file_path, "signal_type"] not in ignore_signal_types:
-                value: str | float | int = metadata_df.at[file_path, value_name]
-                expected_value: str | float | int = most_common[value_name]
-                warn(
-                    TremanaParsingInconsistentMetadataWarning(
-                        actual_value=value,
-                        expected_value=expected_value,
-                        metadata_name=value_name,
-                        origin_file=file_path,
-                    )
+    values = metadata_df.drop(columns=["signal_type"])
+    expected = majority_by_group(values, recordings)
+    deviations = []
+    for column_position, column in enumerate(values.columns):
+        mask = (values[column] != expected[column]).to_numpy()
+        if mask.any():
+            deviations.append(
+                pd.DataFrame(
+                    {
+                        "file": values.index[mask],
+                        "recording": recordings.to_numpy()[mask],
+                        "metadata_name": column,
+                        "actual_value": values[column].to_numpy()[mask],
+                        "expected_value": expected[column].to_numpy()[mask],
+                        "_order": np.flatnonzero(mask) * values.shape[1] + column_position,
+                    }
                 )
+            )
+    if not deviations:
+        return pd.DataFrame(columns=SOMNOWATCH_DEVIATION_COLUMNS)
+    return (
+        pd.concat(deviations, ignore_index=True)
+        .sort_values("_order")
+        .drop(columns="_order")
+        .reset_index(drop=True)
+    )
 
+
+def _somnowatch_validate_meta_data(
+    file_paths: Iterable[str | os.PathLike[str]],
+    ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
+    cache_dir: None | str | os.PathLike[str] = None,
+) -> pd.DataFrame:
+    metadata_df = _somnowatch_metadata_frame(
+        list(file_paths), ignore_signal_types=ignore_signal_types, cache_dir=cache_dir
+    )
+    for deviation in _somnowatch_metadata_deviations(metadata_df).itertuples(index=False):
+        warn(
+            TremanaParsingInconsistentMetadataWarning(
+                actual_value=deviation.actual_value,
+                expected_value=deviation.expected_value,
+                metadata_name=deviation.metadata_name,
+                origin_file=deviation.file,
+            )
+        )
     return metadata_df
 
 
-def _somnowatch_validate_measurement_data(
+def _somnowatch_check_channels(metadata_df: pd.DataFrame, ignore_signal_types: list[str]) -> None:
+    """Check that at least one channel is left after ignoring signal types.
+
+    Parameters
+    ----------
+    metadata_df : pd.DataFrame
+        Metadata as returned by ``_somnowatch_validate_meta_data``.
+    ignore_signal_types : list[str]
+        Signal types which were ignored.
+
+    Raises
+    ------
+    TremanaParsingException
+        If all files are of ignored signal types.
+    """
+    if metadata_df.empty:
+        raise TremanaParsingException(
+            msg=f"All files are of ignored signal types {ignore_signal_types!r}."
+        )
+
+
+def _somnowatch_check_sample_rates(metadata_df: pd.DataFrame) -> None:
+    """Check that all channels have the same sample rate.
+
+    Parameters
+    ----------
+    metadata_df : pd.DataFrame
+        Metadata as returned by ``_somnowatch_validate_meta_data``.
+
+    Raises
+    ------
+    TremanaParsingMixedSampleRatesException
+        If the sample rates differ, the first file deviating
+        from the most common sample rate is reported.
+    """
+    sample_rates = metadata_df["sample_rate"]
+    if sample_rates.nunique() > 1:
+        deviating = sample_rates.index[sample_rates != sample_rates.mode().iat[0]]
+        raise TremanaParsingMixedSampleRatesException(
+            sample_rates=sample_rates, origin_file=deviating[0]
+        )
+
+
+@instrument
+def somnowatch_metadata_report(
     file_paths: Iterable[str | os.PathLike[str]],
+    *,
     ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
-) -> None:
+    max_workers: int = 1,
+) -> pd.DataFrame:
+    """Check the metadata consistency of the somnowatch exports of a whole cohort.
+
+    Files in the same folder are considered to belong to the same recording.
+    Instead of emitting a warning per deviating value, all deviations from
+    the most common value of the recording are returned as table.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the exported files of all recordings.
+    ignore_signal_types : list[str]
+        Signal types which aren't checked, by default ["Light_Type", "Accu_Type"]
+    max_workers : int
+        Number of threads reading the headers, by default 1
+
+    Returns
+    -------
+    pd.DataFrame
+        Report with one row per deviating value and the columns
+        "file", "recording", "metadata_name", "actual_value" and "expected_value".
+    """
+    metadata_df = _somnowatch_metadata_frame(
+        list(file_paths), ignore_signal_types=ignore_signal_types, max_workers=max_workers
+    )
+    recordings = pd.Series(
+        [os.path.dirname(file_path) for file_path in metadata_df.index], index=metadata_df.index
+    )
+    return _somnowatch_metadata_deviations(metadata_df, recordings)
+
+
+def _somnowatch_channel_name(metadata: SomnoWatchMetaData) -> str:
+    """Name of a channel in the DataFrame representation of a somnowatch export.
+
+    Parameters
+    ----------
+    metadata : SomnoWatchMetaData
+        Metadata of the channel.
+
+    Returns
+    -------
+    str
+        Name of the channel.
+    """
+    return f"{metadata.signal_type} amplitude in {metadata.unit}"
+
+
+@instrument
+def _somnowatch_read_channel(
+    file_path: str | os.PathLike[str],
+    metadata: SomnoWatchMetaData,
+    cache_dir: None | str | os.PathLike[str] = None,
+    dtype: DTypeLike = np.float64,
+) -> np.ndarray:
+    """Read the values of a single channel file of a somnowatch export.
+
+    Parameters
+    ----------
+    file_path : str | os.PathLike[str]
+        Path to the somnowatch file.
+    metadata : SomnoWatchMetaData
+        Metadata of the file, with ``start_date`` already parsed to a timestamp.
+    cache_dir : str | os.PathLike[str], optional
+        Directory of the cache for parsed files, by default None which disables caching.
+    dtype : DTypeLike
+        Data type of the returned values, by default np.float64
+
+    Returns
+    -------
+    np.ndarray
+        Sample values of the channel.
+    """
+    values = None if cache_dir is None else read_cached_values(cache_dir, file_path)
+    if values is None:
+        # without cache the values are parsed directly into ``dtype``, cached values keep
+        # the full precision, so they can be read with any dtype
+        values = _somnowatch_read_data(
+            file_path, metadata, dtype=dtype if cache_dir is None else np.float64
+        )
+        if cache_dir is not None:
+            # Cache the start date in the header format, so cache hits are parsed the same way
+            start_date = metadata.start_date.strftime(SOMNOWATCH_DATETIME_FORMAT)  # type:ignore
+            write_cache_entry(
+                cache_dir,
+                file_path,
+                metadata=metadata._replace(start_date=start_date)._asdict(),
+                values=values,
+            )
+    return values.astype(dtype, copy=False)
+
+
+@instrument
+def read_somnowatch(
+    file_paths: Iterable[str | os.PathLike[str]],
+    *,
+    workers: int | None = 1,
+    ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
+    cache_dir: None | str | os.PathLike[str] = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Read the channel files of a somnowatch export into a single DataFrame.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the exported files of a measurement (one file per channel).
+    workers : int, optional
+        Number of threads used to parse the channel files concurrently,
+        by default 1 which reads the files one after another.
+        If None the default of ``concurrent.futures.ThreadPoolExecutor`` is used.
+    ignore_signal_types : list[str]
+        Signal types which aren't read, by default ["Light_Type", "Accu_Type"]
+    cache_dir : str | os.PathLike[str], optional
+        Directory to cache the parsed files in, by default None which disables caching.
+        Cached values are memory-mapped and entries of changed files are renewed.
+    compact : bool
+        Whether to use a memory compact representation, by default False.
+        The values are stored as float32, the index is the sample number
+        (the time is ``attrs["start_date"] + index / attrs["sample_rate"]``,
+        see ``somnowatch_time_index``) and the column names are categorical.
+
+    Returns
+    -------
+    pd.DataFrame
+        Dataframe indexed by time with one column per channel.
+        The (most common) sample rate of the channels is stored in ``attrs["sample_rate"]``.
+
+    Raises
+    ------
+    TremanaParsingException
+        If all files are of ignored signal types.
+    TremanaParsingMixedSampleRatesException
+        If ``compact`` is used for channels with different sample rates
+        (see ``read_somnowatch_recording`` with ``align=True``).
+
+    Warns
+    -----
+    TremanaParsingInconsistentMetadataWarning
+        If the metadata of the files differ.
+
+    See Also
+    --------
+    SomnoWatchMetaData
+
+
+    .. # noqa: DAR402
+    """
+    file_paths = list(file_paths)
     metadata_df = _somnowatch_validate_meta_data(
-        file_paths=file_paths, ignore_signal_types=ignore_signal_types
+        file_paths=file_paths, ignore_signal_types=ignore_signal_types, cache_dir=cache_dir
+    )
+    _somnowatch_check_channels(metadata_df, ignore_signal_types)
+    if compact:
+        _somnowatch_check_sample_rates(metadata_df)
+    metadata_list = [SomnoWatchMetaData(*row) for row in metadata_df.itertuples(index=False)]
+    read_channel = partial(
+        _somnowatch_read_channel,
+        cache_dir=cache_dir,
+        dtype=np.float32 if compact else np.float64,
     )
-    data_frames = []
-    for file in file_paths:
-        metadata_row = metadata_df[str(file)]
-        signal_type = metadata_row["signal_type"].squeeze()
-        unit = metadata_row["unit"].squeeze()
-        data_frames.append(
-            pd.read_csv(
-                file,
-                skiprows=7,
-                decimal=",",
-                sep=";",
-                names=["time", f"{signal_type} amplitude in {unit}"],
-                parse_dates=["time"],
+    if workers == 1:
+        values_list = list(map(read_channel, metadata_df.index, metadata_list))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            values_list = list(
+                executor.map(in_caller_context(read_channel), metadata_df.index, metadata_list)
             )
+
+    sample_rate = metadata_df["sample_rate"].mode().iat[0]
+    start_date = metadata_df["start_date"].min()
+    channels = []
+    for values, metadata in zip(values_list, metadata_list):
+        if compact:
+            offset = round((metadata.start_date - start_date).total_seconds() * sample_rate)
+            index: pd.Index = pd.RangeIndex(offset, offset + metadata.length)
+        else:
+            index = _somnowatch_time_index(
+                metadata.start_date, metadata.sample_rate, metadata.length  # type:ignore
+            )
+        channels.append(pd.Series(values, index=index, name=_somnowatch_channel_name(metadata)))
+    data = pd.concat(channels, axis=1)
+    data.attrs["sample_rate"] = sample_rate
+    if compact:
+        data.columns = pd.CategoricalIndex(data.columns)
+        data.attrs["start_date"] = start_date
+    return data
+
+
+@instrument
+def read_somnowatch_recording(
+    file_paths: Iterable[str | os.PathLike[str]],
+    *,
+    workers: int | None = 1,
+    ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
+    cache_dir: None | str | os.PathLike[str] = None,
+    dtype: DTypeLike = np.float64,
+    out_path: None | str | os.PathLike[str] = None,
+    align: bool = False,
+) -> Recording:
+    """Read the channel files of a somnowatch export into a ``Recording``.
+
+    The values of each channel are written directly into one (sample x channel) array,
+    without building a DataFrame. Channels starting later or ending earlier than
+    others are padded with NaN, unless they are aligned.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the exported files of a measurement (one file per channel).
+    workers : int, optional
+        Number of threads used to parse the channel files concurrently,
+        by default 1 which reads the files one after another.
+        If None the default of ``concurrent.futures.ThreadPoolExecutor`` is used.
+    ignore_signal_types : list[str]
+        Signal types which aren't read, by default ["Light_Type", "Accu_Type"]
+    cache_dir : str | os.PathLike[str], optional
+        Directory to cache the parsed files in, by default None which disables caching.
+    dtype : DTypeLike
+        Floating point data type of the values, by default np.float64
+    out_path : str | os.PathLike[str], optional
+        Path (without file extension) to save the recording at, by default None.
+        The values are written into a memory-mapped ``.npy`` file instead of memory,
+        so the recording can be reopened with ``Recording.load``.
+    align : bool
+        Whether to resample channels to the most common sample rate and trim them to the
+        time all channels were recorded (see ``align_channels``), by default False
+
+    Returns
+    -------
+    Recording
+        Recording with one channel per file, named like the columns of ``read_somnowatch``.
+
+    Raises
+    ------
+    TremanaParsingException
+        If all files are of ignored signal types.
+    TremanaParsingMixedSampleRatesException
+        If the sample rates of the channels differ and they aren't aligned.
+
+    Warns
+    -----
+    TremanaParsingInconsistentMetadataWarning
+        If the metadata of the files differ, with ``align=True`` only
+        for other metadata than sample rate, start date and length.
+
+    See Also
+    --------
+    read_somnowatch
+    tremana.recording.Recording
+    tremana.analysis.alignment.align_channels
+
+
+    .. # noqa: DAR402
+    """
+    file_paths = list(file_paths)
+    aligned_metadata_warnings: ContextManager[None] = (
+        filter_tremana_warnings(
+            (TremanaParsingInconsistentMetadataWarning,),
+            message="'(sample_rate|start_date|length)'",
         )
+        if align
+        else nullcontext()
+    )
+    with aligned_metadata_warnings:
+        metadata_df = _somnowatch_validate_meta_data(
+            file_paths=file_paths, ignore_signal_types=ignore_signal_types, cache_dir=cache_dir
+        )
+    _somnowatch_check_channels(metadata_df, ignore_signal_types)
+    metadata_list = [SomnoWatchMetaData(*row) for row in metadata_df.itertuples(index=False)]
+    channel_names = [_somnowatch_channel_name(metadata) for metadata in metadata_list]
+    read_channel = partial(_somnowatch_read_channel, cache_dir=cache_dir, dtype=dtype)
+    if align:
+        if workers == 1:
+            values_list = list(map(read_channel, metadata_df.index, metadata_list))
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as align_executor:
+                values_list = list(
+                    align_executor.map(
+                        in_caller_context(read_channel), metadata_df.index, metadata_list
+                    )
+                )
+        recording = align_channels(
+            values_list,
+            sample_rates=[metadata.sample_rate for metadata in metadata_list],
+            start_dates=[metadata.start_date for metadata in metadata_list],  # type:ignore
+            channels=channel_names,
+            metadata=dict(zip(channel_names, metadata_list)),
+        )
+        if out_path is not None:
+            recording.save(out_path)
+        return recording
+
+    _somnowatch_check_sample_rates(metadata_df)
+    sample_rate = metadata_df["sample_rate"].mode().iat[0]
+    start_date = metadata_df["start_date"].min()
+    offsets = [
+        round((metadata.start_date - start_date).total_seconds() * sample_rate)  # type:ignore
+        for metadata in metadata_list
+    ]
+    shape = (
+        max(
+            (offset + metadata.length for offset, metadata in zip(offsets, metadata_list)),
+            default=0,
+        ),
+        len(metadata_list),
+    )
+    if out_path is None:
+        values = np.full(shape, np.nan, dtype=dtype, order="F")
+    else:
+        values = np.lib.format.open_memmap(
+            Path(out_path).with_suffix(".npy"),
+            mode="w+",
+            dtype=dtype,
+            shape=shape,
+            fortran_order=True,
+        )
+        values[:] = np.nan
+
+    executor: ThreadPoolExecutor | None = (
+        None if workers == 1 else ThreadPoolExecutor(max_workers=workers)
+    )
+    channel_values = (
+        map(read_channel, metadata_df.index, metadata_list)
+        if executor is None
+        else executor.map(in_caller_context(read_channel), metadata_df.index, metadata_list)
+    )
+    try:
+        # each channel is written into the array as soon as it is read,
+        # so only the values of one channel (per worker) are held additionally
+        for channel, (offset, metadata, values_of_channel) in enumerate(
+            zip(offsets, metadata_list, channel_values)
+        ):
+            values[slice(offset, offset + metadata.length), channel] = values_of_channel
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    recording = Recording(
+        values,
+        channels=channel_names,
+        sample_rate=sample_rate,
+        start_date=start_date,
+        metadata=dict(zip(channel_names, metadata_list)),
+    )
+    if out_path is not None:
+        recording.save(out_path)
+    return recording
+
+
+def somnowatch_time_index(data: pd.DataFrame) -> pd.DatetimeIndex:
+    """Calculate the time index of somnowatch data read with ``compact=True``.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data returned by ``read_somnowatch`` or ``iter_somnowatch`` with ``compact=True``.
+
+    Returns
+    -------
+    pd.DatetimeIndex
+        Timestamps of the samples in ``data``.
+    """
+    offsets = np.round(data.index.to_numpy() * (1e9 / data.attrs["sample_rate"]))
+    return pd.DatetimeIndex(
+        data.attrs["start_date"] + offsets.astype("timedelta64[ns]"), name="time"
+    )
+
+
+@instrument
+def iter_somnowatch(
+    file_paths: Iterable[str | os.PathLike[str]],
+    *,
+    chunk_size: int = 2**20,
+    ignore_signal_types: list[str] = ["Light_Type", "Accu_Type"],
+    compact: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """Iterate over the channel files of a somnowatch export in chunks.
+
+    This allows processing recordings which don't fit into memory, since only
+    ``chunk_size`` samples per channel are held at once.
+    The channels are read in lock step, which assumes them to share ``start_date``
+    and ``sample_rate``, channels ending earlier than others are padded with NaN
+    (see ``read_somnowatch_recording`` with ``align=True`` to align differing channels).
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the exported files of a measurement (one file per channel).
+    chunk_size : int
+        Number of samples per chunk, by default 2**20
+    ignore_signal_types : list[str]
+        Signal types which aren't read, by default ["Light_Type", "Accu_Type"]
+    compact : bool
+        Whether to use the memory compact representation of ``read_somnowatch``,
+        by default False
+
+    Yields
+    ------
+    pd.DataFrame
+        Consecutive chunks indexed by time with one column per channel,
+        the sample rate is stored in ``attrs["sample_rate"]``.
+
+    Raises
+    ------
+    TremanaParsingException
+        If all files are of ignored signal types.
+    TremanaParsingMixedSampleRatesException
+        If the sample rates of the channels differ.
+    TremanaParsingDataLengthException
+        If the number of samples of a file doesn't match the length in its header.
+
+    Warns
+    -----
+    TremanaParsingInconsistentMetadataWarning
+        If the metadata of the files differ.
+
+    See Also
+    --------
+    read_somnowatch_recording
+    tremana.analysis.transformations.iter_windowed_spectra
+
+
+    .. # noqa: DAR402
+    """
+    metadata_df = _somnowatch_validate_meta_data(
+        file_paths=file_paths, ignore_signal_types=ignore_signal_types
+    )
+    _somnowatch_check_channels(metadata_df, ignore_signal_types)
+    _somnowatch_check_sample_rates(metadata_df)
+    metadata_list = [SomnoWatchMetaData(*row) for row in metadata_df.itertuples(index=False)]
+    columns: pd.Index = pd.Index(
+        [_somnowatch_channel_name(metadata) for metadata in metadata_list]
+    )
+    if compact:
+        columns = pd.CategoricalIndex(columns)
+    reference = metadata_list[0]
+    position = 0
+    # all files are parsed in chunks of chunk_size, so the chunks of the channels
+    # cover the same samples and only channels which already ended are missing
+    for chunk_values in zip_longest(
+        *(
+            _somnowatch_iter_checked_values(file_path, metadata, chunk_size=chunk_size)
+            for file_path, metadata in zip(metadata_df.index, metadata_list)
+        )
+    ):
+        length = max(values.size for values in chunk_values if values is not None)
+        values = np.full(
+            (length, len(chunk_values)), np.nan, dtype=np.float32 if compact else np.float64
+        )
+        for channel, channel_values in enumerate(chunk_values):
+            if channel_values is not None:
+                values[: channel_values.size, channel] = channel_values
+        if compact:
+            chunk = pd.DataFrame(
+                values,
+                index=pd.RangeIndex(position, position + length),
+                columns=columns,
+            )
+            chunk.attrs["start_date"] = reference.start_date
+        else:
+            chunk = pd.DataFrame(
+                values,
+                index=_somnowatch_time_index(
+                    reference.start_date,  # type:ignore
+                    reference.sample_rate,
+                    length,
+                    offset=position,
+                ),
+                columns=columns,
+            )
+        # like read_somnowatch, so the transformations pick up the sample rate
+        chunk.attrs["sample_rate"] = reference.sample_rate
+        yield chunk
+        position += length
+
+
+def _somnowatch_sniff(header_lines: list[str]) -> bool:
+    """Check if the first lines of a file are the header of a somnowatch export.
+
+    Parameters
+    ----------
+    header_lines : list[str]
+        First lines of the file.
+
+    Returns
+    -------
+    bool
+        Whether the file is a somnowatch export.
+    """
+    return (
+        len(header_lines) >= 2
+        and header_lines[0].startswith("Signal Type:")
+        and header_lines[1].startswith("Start Time:")
+    )
+
+
+register_parser(
+    "somnowatch",
+    sniff=_somnowatch_sniff,
+    read=read_somnowatch,
+    header_lines=2,
+    read_recording=partial(read_somnowatch_recording, align=True),
+)
@@ -0,0 +1,337 @@
+"""Registry of device parsers, which detects the device of files by their header.
+
+Each device module registers a cheap header sniffer and a reader with ``register_parser``.
+Detecting the device of a file only reads a small prefix of it, so folders with files
+of different devices can be sorted without trial parsing and each group of files
+is read by the parser of its device (see ``read_by_device``).
+"""
+from __future__ import annotations
+
+import os
+from importlib import import_module
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import NamedTuple
+from warnings import warn
+
+from tremana.exceptions import TremanaParsingMixedDevicesException
+from tremana.exceptions import TremanaParsingUnknownDeviceException
+from tremana.utils.io import concurrent_read_headers
+from tremana.utils.io import lazy_read_headers
+from tremana.warnings import TremanaParsingUnknownDeviceWarning
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from tremana.recording import Recording
+
+# Modules of the builtin devices, which register their parser when they are imported
+BUILTIN_DEVICE_MODULES = ("tremana.parsers.devices.somnowatch",)
+# Number of bytes read to detect the device of a file
+SNIFF_PREFIX_SIZE = 512
+
+
+class DeviceParser(NamedTuple):
+    """NamedTuple representing the parser of a device.
+
+    ``sniff`` gets the first ``header_lines`` lines of a file and returns whether the
+    file was created by the device, ``read`` gets the files of a recording and
+    returns their data. ``read_recording`` reads them into a ``Recording`` with the channels
+    aligned to a common time grid, if it is None the result of ``read`` is converted.
+    """
+
+    name: str
+    sniff: Callable[[list[str]], bool]
+    read: Callable[..., pd.DataFrame]
+    header_lines: int
+    read_recording: Callable[..., Recording] | None = None
+
+
+DEVICE_PARSERS: dict[str, DeviceParser] = {}
+"""Registered device parsers by their name."""
+
+
+def register_parser(
+    name: str,
+    *,
+    sniff: Callable[[list[str]], bool],
+    read: Callable[..., pd.DataFrame],
+    header_lines: int = 5,
+    read_recording: Callable[..., Recording] | None = None,
+) -> None:
+    """Register the parser of a device.
+
+    Parameters
+    ----------
+    name : str
+        Name of the device.
+    sniff : Callable[[list[str]], bool]
+        Function getting the first ``header_lines`` lines of a file and returning
+        whether the file was created by the device. It must not raise for other files.
+    read : Callable[..., pd.DataFrame]
+        Function reading the files of a recording (given as list of paths).
+    header_lines : int
+        Number of lines ``sniff`` needs, by default 5
+    read_recording : Callable[..., Recording], optional
+        Function reading the files of a recording into a ``Recording`` with aligned
+        channels, by default None which converts the result of ``read``
+    """
+    DEVICE_PARSERS[name] = DeviceParser(name, sniff, read, header_lines, read_recording)
+
+
+def _load_builtin_parsers() -> dict[str, DeviceParser]:
+    """Import the builtin device modules, so they are registered.
+
+    Returns
+    -------
+    dict[str, DeviceParser]
+        Registered device parsers.
+    """
+    for module_name in BUILTIN_DEVICE_MODULES:
+        import_module(module_name)
+    return DEVICE_PARSERS
+
+
+def get_parser(device: str) -> DeviceParser:
+    """Get the registered parser of a device.
+
+    Parameters
+    ----------
+    device : str
+        Name of the device (e.g. "somnowatch").
+
+    Returns
+    -------
+    DeviceParser
+        Parser of the device.
+
+    Raises
+    ------
+    KeyError
+        If no parser is registered for the device.
+    """
+    parsers = _load_builtin_parsers()
+    if device not in parsers:
+        raise KeyError(f"No parser is registered for the device {device!r}.")
+    return parsers[device]
+
+
+def sniff_device(
+    header_lines: list[str], parsers: Iterable[DeviceParser] | None = None
+) -> str | None:
+    """Detect the device which created a file from its first lines.
+
+    Parameters
+    ----------
+    header_lines : list[str]
+        First lines of the file.
+    parsers : Iterable[DeviceParser], optional
+        Parsers to check, by default None which uses all registered parsers
+
+    Returns
+    -------
+    str | None
+        Name of the device or None if no registered device matches.
+    """
+    if parsers is None:
+        parsers = _load_builtin_parsers().values()
+    for parser in parsers:
+        if parser.sniff(header_lines[: parser.header_lines]):
+            return parser.name
+    return None
+
+
+def group_by_device(
+    file_paths: Iterable[str | os.PathLike[str]], *, max_workers: int = 1
+) -> dict[str | None, list[Path]]:
+    """Group files by the device which created them.
+
+    Only the first ``SNIFF_PREFIX_SIZE`` bytes of each file are read,
+    so also big binary files of other devices are sorted out fast.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the files.
+    max_workers : int
+        Number of threads reading the headers, by default 1
+
+    Returns
+    -------
+    dict[str | None, list[Path]]
+        Files of each device, files of unknown devices are grouped under None.
+    """
+    paths = [Path(file_path) for file_path in file_paths]
+    parsers = list(_load_builtin_parsers().values())
+    lines_to_read = max((parser.header_lines for parser in parsers), default=1)
+    if max_workers == 1:
+        headers: Iterator[list[str]] = lazy_read_headers(
+            paths,
+            lines_to_read=lines_to_read,
+            prefix_size=SNIFF_PREFIX_SIZE,
+            max_size=SNIFF_PREFIX_SIZE,
+            errors="replace",
+        )
+    else:
+        headers = concurrent_read_headers(
+            paths,
+            lines_to_read=lines_to_read,
+            prefix_size=SNIFF_PREFIX_SIZE,
+            max_size=SNIFF_PREFIX_SIZE,
+            errors="replace",
+            max_workers=max_workers,
+        )
+    groups: dict[str | None, list[Path]] = {}
+    for file_path, header_lines in zip(paths, headers):
+        groups.setdefault(sniff_device(header_lines, parsers), []).append(file_path)
+    return groups
+
+
+def _device_groups(
+    path_or_dir: str | os.PathLike[str], pattern: str, stacklevel: int
+) -> dict[str, list[Path]]:
+    """Group the files of a recording by device and warn about files of unknown devices.
+
+    Parameters
+    ----------
+    path_or_dir : str | os.PathLike[str]
+        Path to a single file or to the folder containing the files of the recording.
+    pattern : str
+        Glob pattern of the files in a folder.
+    stacklevel : int
+        Stack level of the warnings, relative to the caller of this function.
+
+    Returns
+    -------
+    dict[str, list[Path]]
+        Files of each supported device.
+
+    Raises
+    ------
+    TremanaParsingUnknownDeviceException
+        If no file was created by a supported device.
+
+    Warns
+    -----
+    TremanaParsingUnknownDeviceWarning
+        For files in a folder which weren't created by a supported device.
+
+
+    .. # noqa: DAR402 TremanaParsingUnknownDeviceWarning
+    """
+    path = Path(path_or_dir)
+    if path.is_dir():
+        file_paths = sorted(file_path for file_path in path.glob(pattern) if file_path.is_file())
+    else:
+        file_paths = [path]
+    groups = group_by_device(file_paths)
+    unknown_file_paths = groups.pop(None, [])
+    if not groups:
+        raise TremanaParsingUnknownDeviceException(devices=DEVICE_PARSERS, origin_file=path)
+    for file_path in unknown_file_paths:
+        warn(TremanaParsingUnknownDeviceWarning(origin_file=file_path), stacklevel=stacklevel + 1)
+    return {device: device_file_paths for device, device_file_paths in groups.items() if device}
+
+
+def read_by_device(
+    path_or_dir: str | os.PathLike[str], pattern: str = "*", **kwargs: Any
+) -> dict[str, pd.DataFrame]:
+    """Read the files of each supported device in a folder with the parser of the device.
+
+    Parameters
+    ----------
+    path_or_dir : str | os.PathLike[str]
+        Path to a single file or to a folder containing files of one or more devices.
+    pattern : str
+        Glob pattern of the files in a folder, by default "*"
+    **kwargs : Any
+        Keyword arguments passed on to the readers of all devices.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        Data of each device found in the folder.
+
+    Raises
+    ------
+    TremanaParsingUnknownDeviceException
+        If no file was created by a supported device.
+
+    Warns
+    -----
+    TremanaParsingUnknownDeviceWarning
+        For files in a folder which weren't created by a supported device.
+
+    See Also
+    --------
+    read
+
+    Examples
+    --------
+    >>> for device, data in read_by_device("path/to/folder").items():
+    ...     print(device, data.shape)
+
+
+    .. # noqa: DAR402 TremanaParsingUnknownDeviceException TremanaParsingUnknownDeviceWarning
+    """
+    return {
+        device: DEVICE_PARSERS[device].read(device_file_paths, **kwargs)
+        for device, device_file_paths in _device_groups(path_or_dir, pattern, 2).items()
+    }
+
+
+def read(path_or_dir: str | os.PathLike[str], pattern: str = "*", **kwargs: Any) -> pd.DataFrame:
+    """Read a recording of any supported device.
+
+    The device is detected from the headers of the files, files of unknown devices
+    in a folder are skipped.
+
+    Parameters
+    ----------
+    path_or_dir : str | os.PathLike[str]
+        Path to a single file or to the folder containing the files of the recording.
+    pattern : str
+        Glob pattern of the files in a folder, by default "*"
+    **kwargs : Any
+        Keyword arguments passed on to the reader of the device
+        (e.g. ``workers`` for ``read_somnowatch``).
+
+    Returns
+    -------
+    pd.DataFrame
+        Data of the recording.
+
+    Raises
+    ------
+    TremanaParsingUnknownDeviceException
+        If no file was created by a supported device.
+    TremanaParsingMixedDevicesException
+        If the files were created by different devices, which can be read with
+        ``read_by_device``.
+
+    Warns
+    -----
+    TremanaParsingUnknownDeviceWarning
+        For files in a folder which weren't created by a supported device.
+
+    See Also
+    --------
+    read_by_device
+
+    Examples
+    --------
+    >>> import tremana
+    >>> data = tremana.read("path/to/recording")
+
+
+    .. # noqa: DAR402 TremanaParsingUnknownDeviceException TremanaParsingUnknownDeviceWarning
+    """
+    groups = _device_groups(path_or_dir, pattern, 2)
+    if len(groups) > 1:
+        raise TremanaParsingMixedDevicesException(devices=groups, origin_file=path_or_dir)
+    ((device, device_file_paths),) = groups.items()
+    return DEVICE_PARSERS[device].read(device_file_paths, **kwargs)
@@ -0,0 +1,236 @@
+"""Batch analysis of whole cohorts of recordings."""
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from time import perf_counter
+from typing import ContextManager
+from typing import Iterator
+from typing import NamedTuple
+
+import pandas as pd
+
+from tremana.analysis.metrics import center_of_mass
+from tremana.analysis.transformations import fft_spectra
+from tremana.analysis.transformations import power_density_spectra
+from tremana.constants import SPECTRA_METHODS
+from tremana.parsers.registry import get_parser
+from tremana.parsers.registry import group_by_device
+from tremana.recording import Recording
+from tremana.utils.profiling import Profiler
+from tremana.utils.profiling import ProfileRecord
+from tremana.utils.profiling import instrument
+
+
+class RecordingResult(NamedTuple):
+    """NamedTuple representing the result of analyzing a single recording."""
+
+    recording: str
+    device: str
+    metrics: pd.DataFrame | None
+    processing_time: float
+    error: str | None
+    profile: list[ProfileRecord] | None = None
+
+
+def find_recordings(
+    directory: str | os.PathLike[str], pattern: str = "*", max_workers: int = 1
+) -> dict[tuple[str, str], list[Path]]:
+    """Find the recordings of all supported devices in a directory tree.
+
+    The device of each file is detected from its header (see ``group_by_device``)
+    and files of unknown devices are skipped. All files of the same device in the
+    same folder are considered to be the files of one recording, so folders
+    with files of different devices contain one recording per device.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike[str]
+        Root directory of the exports.
+    pattern : str
+        Glob pattern of the exported files, by default "*"
+    max_workers : int
+        Number of threads reading the headers, by default 1
+
+    Returns
+    -------
+    dict[tuple[str, str], list[Path]]
+        Mapping of the recording folder relative to ``directory`` and the device
+        to the files of the recording.
+    """
+    directory = Path(directory)
+    file_paths = [
+        file_path for file_path in sorted(directory.rglob(pattern)) if file_path.is_file()
+    ]
+    recordings: dict[tuple[str, str], list[Path]] = {}
+    for device, device_file_paths in group_by_device(file_paths, max_workers=max_workers).items():
+        if device is None:
+            continue
+        for file_path in device_file_paths:
+            recording = file_path.parent.relative_to(directory).as_posix()
+            recordings.setdefault((recording, device), []).append(file_path)
+    return dict(sorted(recordings.items()))
+
+
+@instrument
+def analyze_recording(
+    file_paths: list[Path], device: str = "somnowatch", method: str = "welch"
+) -> pd.DataFrame:
+    """Run the whole analysis (parse, spectra, metrics) of one recording.
+
+    The files are read with the parser registered for ``device``, channels with
+    inconsistent sample rates, start dates or lengths are aligned by it
+    before the spectra are calculated.
+
+    Parameters
+    ----------
+    file_paths : list[Path]
+        Paths to the files of the recording (e.g. one file per channel).
+    device : str
+        Name of the device which created the files, by default "somnowatch"
+    method : str
+        Method used to calculate the spectra, one of ``SPECTRA_METHODS``, by default "welch"
+
+    Returns
+    -------
+    pd.DataFrame
+        Metrics with one row per channel.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` isn't one of ``SPECTRA_METHODS``.
+
+    See Also
+    --------
+    tremana.parsers.registry.register_parser
+    tremana.analysis.transformations.fft_spectra
+    tremana.analysis.transformations.power_density_spectra
+    """
+    if method not in SPECTRA_METHODS:
+        raise ValueError(f"Unknown method {method!r}, supported methods are {SPECTRA_METHODS!r}.")
+    parser = get_parser(device)
+    if parser.read_recording is None:
+        recording = Recording.from_dataframe(parser.read(file_paths))
+    else:
+        recording = parser.read_recording(file_paths)
+    if method == "fft":
+        spectra = fft_spectra(recording)
+    else:
+        spectra = power_density_spectra(recording, method=method)
+    metrics = center_of_mass(spectra).T
+    metrics.index.name = "channel"
+    metrics.insert(0, "sample_rate", recording.sample_rate)
+    metrics.insert(1, "duration", recording.duration)
+    return metrics
+
+
+def _timed_analyze_recording(
+    recording: tuple[tuple[str, str], list[Path]], method: str = "welch", profile: bool = False
+) -> RecordingResult:
+    """Analyze a recording, measure the processing time and catch errors.
+
+    Parameters
+    ----------
+    recording : tuple[tuple[str, str], list[Path]]
+        Name, device and files of the recording.
+    method : str
+        Method used to calculate the spectra, by default "welch"
+    profile : bool
+        Whether to record the calls of the processing steps, by default False
+
+    Returns
+    -------
+    RecordingResult
+        Metrics or error of the recording.
+    """
+    (name, device), file_paths = recording
+    # the profiler is created in the worker process, so the records are returned with the result
+    profiler = Profiler() if profile else None
+    context: ContextManager[Profiler | None] = nullcontext() if profiler is None else profiler
+    metrics = None
+    error_message = None
+    start = perf_counter()
+    with context:
+        try:
+            metrics = analyze_recording(file_paths, device=device, method=method)
+        # a single broken recording shouldn't abort the analysis of the whole cohort
+        except Exception as error:
+            error_message = f"{type(error).__name__}: {error}"
+    return RecordingResult(
+        name,
+        device,
+        metrics,
+        perf_counter() - start,
+        error_message,
+        None if profiler is None else profiler.records,
+    )
+
+
+def analyze_cohort(
+    directory: str | os.PathLike[str],
+    *,
+    jobs: int = 1,
+    pattern: str = "*",
+    method: str = "welch",
+    profile: bool = False,
+) -> Iterator[RecordingResult]:
+    """Analyze all recordings of supported devices in a directory tree.
+
+    Parameters
+    ----------
+    directory : str | os.PathLike[str]
+        Root directory of the exports.
+    jobs : int
+        Number of processes used to analyze recordings in parallel, by default 1
+    pattern : str
+        Glob pattern of the exported files, by default "*"
+    method : str
+        Method used to calculate the spectra, one of ``SPECTRA_METHODS``, by default "welch"
+    profile : bool
+        Whether to record the calls of the processing steps in ``RecordingResult.profile``,
+        by default False
+
+    Yields
+    ------
+    RecordingResult
+        Result of each recording in the order of ``find_recordings``.
+
+    See Also
+    --------
+    find_recordings
+    analyze_recording
+    """
+    recordings = find_recordings(directory, pattern=pattern).items()
+    analyze = partial(_timed_analyze_recording, method=method, profile=profile)
+    if jobs == 1:
+        yield from map(analyze, recordings)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            yield from executor.map(analyze, recordings)
+
+
+def combine_recording_results(results: list[RecordingResult]) -> pd.DataFrame:
+    """Combine the metrics of multiple recordings into a single table.
+
+    Parameters
+    ----------
+    results : list[RecordingResult]
+        Results of the analyzed recordings, failed recordings are skipped.
+
+    Returns
+    -------
+    pd.DataFrame
+        Table with one row per recording, device and channel.
+    """
+    metrics = {
+        (result.recording, result.device): result.metrics
+        for result in results
+        if result.error is None
+    }
+    if not metrics:
+        return pd.DataFrame()
+    return pd.concat(metrics, names=["recording", "device"]).reset_index()
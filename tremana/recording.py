@@ -0,0 +1,353 @@
+"""Container for the samples of all channels of a recording in a single array.
+
+Compared to a DataFrame with one column per channel, the samples are kept in one
+contiguous (sample x channel) array, which can be memory-mapped from disk and is
+passed to the transformations without any copies.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Hashable
+from typing import Iterable
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from typing import Literal
+
+
+class Recording:
+    """Samples of all channels of a recording with their sample rate and metadata.
+
+    ``values`` has the shape (sample x channel) and is Fortran-contiguous, so the samples
+    of each channel are contiguous in memory. This is the layout the FFTs along the
+    sample axis are fastest on and the layout pandas stores its blocks in.
+    Arrays (including ``np.memmap``) are used without copying them if they already
+    have this layout.
+
+    Examples
+    --------
+    >>> recording = read_somnowatch_recording(file_paths)
+    >>> spectra = power_density_spectra(recording, method="welch")
+    >>> data = recording.to_pandas()
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        channels: Iterable[Hashable] | None = None,
+        sample_rate: int | float = 128,
+        start_date: pd.Timestamp | None = None,
+        metadata: Mapping[Hashable, Any] | None = None,
+    ) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        values : np.ndarray
+            Samples with the shape (sample x channel), a 1D array is a single channel.
+        channels : Iterable[Hashable], optional
+            Names of the channels, by default None which uses their position
+        sample_rate : int | float
+            Number of samples per second, by default 128
+        start_date : pd.Timestamp, optional
+            Time of the first sample, by default None
+        metadata : Mapping[Hashable, Any], optional
+            Metadata of each channel (e.g. ``SomnoWatchMetaData``), by default None
+
+        Raises
+        ------
+        ValueError
+            If ``values`` has more than two dimensions or the number of channels
+            doesn't match the number of columns of ``values``.
+
+
+        .. # noqa: DAR101
+        .. # noqa: DAR401 ValueError
+        """
+        if not isinstance(values, np.ndarray):
+            values = np.asarray(values)
+        if values.ndim == 1:
+            values = values[:, np.newaxis]
+        if values.ndim != 2:
+            raise ValueError(
+                "The values of a recording need the shape (sample x channel), "
+                f"got an array with {values.ndim} dimensions."
+            )
+        if not values.flags.f_contiguous:
+            values = np.asfortranarray(values)
+        self.values = values
+        self.channels = pd.Index(range(values.shape[1]) if channels is None else channels)
+        if len(self.channels) != values.shape[1]:
+            raise ValueError(
+                f"Got {len(self.channels)} channel names for {values.shape[1]} channels."
+            )
+        self.sample_rate = sample_rate
+        self.start_date = None if start_date is None else pd.Timestamp(start_date)
+        self.metadata = dict(metadata or {})
+
+    def __repr__(self) -> str:
+        """Short description of the recording.
+
+        Returns
+        -------
+        str
+            Shape, channels and sample rate of the recording.
+        """
+        return (
+            f"Recording({self.n_samples} samples x {list(self.channels)!r}, "
+            f"sample_rate={self.sample_rate!r}, start_date={self.start_date!r})"
+        )
+
+    def __getitem__(self, channel: Hashable) -> np.ndarray:
+        """Return the samples of a single channel as view.
+
+        Parameters
+        ----------
+        channel : Hashable
+            Name of the channel.
+
+        Returns
+        -------
+        np.ndarray
+            Samples of the channel.
+        """
+        return self.values[:, self.channels.get_loc(channel)]
+
+    @property
+    def n_samples(self) -> int:
+        """Number of samples per channel.
+
+        Returns
+        -------
+        int
+            Number of samples.
+        """
+        return self.values.shape[0]
+
+    @property
+    def n_channels(self) -> int:
+        """Number of channels.
+
+        Returns
+        -------
+        int
+            Number of channels.
+        """
+        return self.values.shape[1]
+
+    @property
+    def duration(self) -> float:
+        """Duration of the recording in seconds.
+
+        Returns
+        -------
+        float
+            Number of samples divided by the sample rate.
+        """
+        return self.n_samples / self.sample_rate
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the values in bytes.
+
+        Returns
+        -------
+        int
+            Size of ``values``.
+        """
+        return self.values.nbytes
+
+    def select(self, channels: Iterable[Hashable]) -> Recording:
+        """Select a subset of the channels as new recording.
+
+        Parameters
+        ----------
+        channels : Iterable[Hashable]
+            Names of the channels.
+
+        Returns
+        -------
+        Recording
+            Recording with the selected channels, which is the recording itself
+            if all channels are selected in their order.
+
+        Raises
+        ------
+        KeyError
+            If any of the channels isn't a channel of the recording.
+        """
+        selected = pd.Index(list(channels))
+        if selected.equals(self.channels):
+            return self
+        indexer = self.channels.get_indexer_for(selected)
+        if (indexer == -1).any():
+            raise KeyError(
+                f"{list(selected[indexer == -1])} not in the channels of the recording."
+            )
+        return Recording(
+            self.values[:, indexer],
+            channels=selected,
+            sample_rate=self.sample_rate,
+            start_date=self.start_date,
+            metadata={
+                channel: self.metadata[channel] for channel in selected if channel in self.metadata
+            },
+        )
+
+    def time_index(self, positions: np.ndarray | None = None) -> pd.Index:
+        """Timestamps of samples.
+
+        Parameters
+        ----------
+        positions : np.ndarray, optional
+            Positions of the samples, by default None which uses all samples
+
+        Returns
+        -------
+        pd.Index
+            Timestamps of the samples or their positions if ``start_date`` is None.
+        """
+        if positions is None:
+            positions = np.arange(self.n_samples)
+        if self.start_date is None:
+            return pd.Index(positions)
+        offsets = np.round(np.asarray(positions) * (1e9 / self.sample_rate))
+        return pd.DatetimeIndex(self.start_date + offsets.astype("timedelta64[ns]"), name="time")
+
+    def to_pandas(self, compact: bool = False) -> pd.DataFrame:
+        """Convert the recording to a dataframe like the one of ``read_somnowatch``.
+
+        The values aren't copied, so the dataframe shares the memory with the recording.
+
+        Parameters
+        ----------
+        compact : bool
+            Whether to index the samples by their position instead of their time,
+            by default False. The start date is stored in ``attrs["start_date"]``
+            and the column names are categorical.
+
+        Returns
+        -------
+        pd.DataFrame
+            Dataframe with one column per channel, the sample rate is stored
+            in ``attrs["sample_rate"]``.
+        """
+        if compact:
+            index: pd.Index = pd.RangeIndex(self.n_samples)
+            columns: pd.Index = pd.CategoricalIndex(self.channels)
+        else:
+            index = self.time_index()
+            columns = self.channels
+        data = pd.DataFrame(self.values, index=index, columns=columns, copy=False)
+        data.attrs["sample_rate"] = self.sample_rate
+        if compact:
+            data.attrs["start_date"] = self.start_date
+        return data
+
+    @classmethod
+    def from_dataframe(
+        cls, data: pd.DataFrame, sample_rate: int | float | None = None
+    ) -> Recording:
+        """Create a recording from a dataframe with one column per channel.
+
+        The values aren't copied, if all columns have the same data type and the
+        dataframe wasn't modified column wise (e.g. created by ``to_pandas``).
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Dataframe with one column per channel (e.g. from ``read_somnowatch``).
+        sample_rate : int | float, optional
+            Number of samples per second,
+            by default None which uses ``attrs["sample_rate"]`` or 128
+
+        Returns
+        -------
+        Recording
+            Recording of the data.
+        """
+        if sample_rate is None:
+            sample_rate = data.attrs.get("sample_rate", 128)
+        start_date = data.attrs.get("start_date")
+        if start_date is None and isinstance(data.index, pd.DatetimeIndex) and len(data.index):
+            start_date = data.index[0]
+        dtype = np.float32 if (data.dtypes == np.float32).all() else np.float64
+        return cls(
+            data.to_numpy(dtype=dtype),
+            channels=list(data.columns),
+            sample_rate=sample_rate,
+            start_date=start_date,
+        )
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the recording, so it can be memory-mapped with ``Recording.load``.
+
+        The values are stored in a ``.npy`` file and the other attributes in a
+        ``.json`` file next to it.
+        Values which are already memory-mapped from the ``.npy`` file are only flushed,
+        since rewriting the file would truncate the memory-mapped data.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str]
+            Path of the recording without file extension.
+        """
+        values_path = Path(path).with_suffix(".npy")
+        mapped_path = getattr(self.values, "filename", None)
+        if (
+            isinstance(self.values, np.memmap)
+            and mapped_path is not None
+            and values_path.exists()
+            and os.path.exists(mapped_path)
+            # samefile also detects paths through symlinks or hard links
+            and os.path.samefile(mapped_path, values_path)
+        ):
+            self.values.flush()
+        else:
+            np.save(values_path, self.values)
+        info = {
+            "channels": list(self.channels),
+            "sample_rate": self.sample_rate,
+            "start_date": None if self.start_date is None else self.start_date.isoformat(),
+            "metadata": [
+                [channel, getattr(metadata, "_asdict", lambda: metadata)()]
+                for channel, metadata in self.metadata.items()
+            ],
+        }
+        Path(path).with_suffix(".json").write_text(json.dumps(info, default=str))
+
+    @classmethod
+    def load(
+        cls,
+        path: str | os.PathLike[str],
+        mmap_mode: Literal["r+", "r", "w+", "c"] | None = "r",
+    ) -> Recording:
+        """Load a recording stored with ``Recording.save``.
+
+        Parameters
+        ----------
+        path : str | os.PathLike[str]
+            Path of the recording without file extension.
+        mmap_mode : {None, "r+", "r", "w+", "c"}
+            Mode used to memory-map the values (see ``numpy.load``),
+            by default "r" which maps them read only. None reads them into memory.
+
+        Returns
+        -------
+        Recording
+            Loaded recording, the metadata of the channels are dicts.
+        """
+        info = json.loads(Path(path).with_suffix(".json").read_text())
+        return cls(
+            np.load(Path(path).with_suffix(".npy"), mmap_mode=mmap_mode),
+            channels=info["channels"],
+            sample_rate=info["sample_rate"],
+            start_date=info["start_date"],
+            metadata={channel: metadata for channel, metadata in info["metadata"]},
+        )
@@ -1 +1,4 @@
 """Utility functions which are used internally."""
+from tremana.utils.lazy_import import lazy_submodules
+
+__getattr__, __dir__ = lazy_submodules(__name__, ("cache", "dataframe_helper", "io", "profiling"))
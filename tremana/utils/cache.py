@@ -0,0 +1,163 @@
+"""Helper functions for the on-disk cache of parsed files.
+
+Each cache entry consists of a ``.npy`` file containing the parsed values and a ``.json``
+file containing the metadata and the size and modification time of the source file.
+Entries are invalidated and removed as soon as the source file changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+def source_file_stamp(source_file: str | os.PathLike[str]) -> dict[str, int]:
+    """Stamp of a file used to detect if it changed since it was cached.
+
+    Parameters
+    ----------
+    source_file : str | os.PathLike[str]
+        Path to the file.
+
+    Returns
+    -------
+    dict[str, int]
+        Size and modification time (in ns) of the file.
+    """
+    stat_result = os.stat(source_file)
+    return {"size": stat_result.st_size, "mtime_ns": stat_result.st_mtime_ns}
+
+
+def cache_entry_stem(
+    cache_dir: str | os.PathLike[str], source_file: str | os.PathLike[str]
+) -> Path:
+    """Path of the cache entry belonging to ``source_file`` without file extension.
+
+    Parameters
+    ----------
+    cache_dir : str | os.PathLike[str]
+        Directory containing the cache.
+    source_file : str | os.PathLike[str]
+        Path to the cached file.
+
+    Returns
+    -------
+    Path
+        Common path of the ``.json`` and ``.npy`` file of the cache entry.
+    """
+    path_hash = hashlib.sha1(str(Path(source_file).resolve()).encode()).hexdigest()
+    return Path(cache_dir) / path_hash
+
+
+def remove_cache_entry(
+    cache_dir: str | os.PathLike[str], source_file: str | os.PathLike[str]
+) -> None:
+    """Remove the cache entry of ``source_file`` if it exists.
+
+    Parameters
+    ----------
+    cache_dir : str | os.PathLike[str]
+        Directory containing the cache.
+    source_file : str | os.PathLike[str]
+        Path to the cached file.
+    """
+    stem = cache_entry_stem(cache_dir, source_file)
+    for suffix in (".json", ".npy"):
+        try:
+            stem.with_suffix(suffix).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def read_cached_metadata(
+    cache_dir: str | os.PathLike[str], source_file: str | os.PathLike[str]
+) -> dict[str, Any] | None:
+    """Read the cached metadata of ``source_file``.
+
+    Stale cache entries (the size or modification time of ``source_file`` changed)
+    are removed.
+
+    Parameters
+    ----------
+    cache_dir : str | os.PathLike[str]
+        Directory containing the cache.
+    source_file : str | os.PathLike[str]
+        Path to the cached file.
+
+    Returns
+    -------
+    dict[str, Any] | None
+        Cached metadata or None if there is no valid cache entry.
+    """
+    json_path = cache_entry_stem(cache_dir, source_file).with_suffix(".json")
+    if not json_path.is_file():
+        return None
+    cache_info = json.loads(json_path.read_text())
+    if cache_info["stamp"] != source_file_stamp(source_file):
+        remove_cache_entry(cache_dir, source_file)
+        return None
+    return cache_info["metadata"]
+
+
+def read_cached_values(
+    cache_dir: str | os.PathLike[str], source_file: str | os.PathLike[str], *, mmap: bool = True
+) -> np.ndarray | None:
+    """Read the cached values of ``source_file``.
+
+    Parameters
+    ----------
+    cache_dir : str | os.PathLike[str]
+        Directory containing the cache.
+    source_file : str | os.PathLike[str]
+        Path to the cached file.
+    mmap : bool
+        Whether to memory-map the values (read-only) instead of loading them,
+        by default True
+
+    Returns
+    -------
+    np.ndarray | None
+        Cached values or None if there is no valid cache entry.
+    """
+    if read_cached_metadata(cache_dir, source_file) is None:
+        return None
+    return np.load(
+        cache_entry_stem(cache_dir, source_file).with_suffix(".npy"),
+        mmap_mode="r" if mmap else None,
+    )
+
+
+def write_cache_entry(
+    cache_dir: str | os.PathLike[str],
+    source_file: str | os.PathLike[str],
+    *,
+    metadata: dict[str, Any],
+    values: np.ndarray,
+) -> None:
+    """Write the cache entry of ``source_file``.
+
+    Parameters
+    ----------
+    cache_dir : str | os.PathLike[str]
+        Directory containing the cache.
+    source_file : str | os.PathLike[str]
+        Path to the cached file.
+    metadata : dict[str, Any]
+        JSON serializable metadata of ``source_file``.
+    values : np.ndarray
+        Parsed values of ``source_file``.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    stem = cache_entry_stem(cache_dir, source_file)
+    np.save(stem.with_suffix(".npy"), values)
+    # The json file is written last, so only complete entries are considered valid
+    cache_info = {
+        "source_file": str(Path(source_file).resolve()),
+        "stamp": source_file_stamp(source_file),
+        "metadata": metadata,
+    }
+    stem.with_suffix(".json").write_text(json.dumps(cache_info))
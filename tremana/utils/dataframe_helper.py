@@ -1,31 +1,39 @@
 """Helper functions to extract information from DataFrames."""
 from __future__ import annotations
 
-import numpy as np
 import pandas as pd
 
 
-def extract_position_by_value(df: pd.DataFrame, value: object) -> list[tuple[object, object]]:
-    """Extract index and column where the dataframe has the value ``value``.
+def majority_by_group(df: pd.DataFrame, groups: pd.Series) -> pd.DataFrame:
+    """Most common value of each column within each group.
+
+    The values are counted with a single hash based groupby per column,
+    ties are resolved by taking the smallest value (same as ``DataFrame.mode``).
 
     Parameters
     ----------
     df : pd.DataFrame
-        Dataframe the columns and indices should be extracted from.
-    value : object
-        Value to look for in ``df``
+        Dataframe to get the most common values from.
+    groups : pd.Series
+        Group label of each row of ``df`` (same index as ``df``).
 
     Returns
     -------
-    list[tuple[object, object]]
-        List of indices and column where ``df`` has the value ``value``
+    pd.DataFrame
+        Dataframe of the same shape as ``df`` with the most common value of
+        the group each row belongs to.
     """
-    # This is needed since True==1, because bool is a subclass of int
-    if isinstance(value, bool):
-        filter_df: pd.DataFrame = df.loc[:, df.dtypes == bool]
-    else:
-        filter_df = df.loc[:, df.dtypes != bool]
-    return [
-        (filter_df.index[index], filter_df.columns[column])
-        for index, column in np.argwhere((filter_df == value).values)
-    ]
+    group_name = "__group__"
+    majority = {}
+    for column in df.columns:
+        counts = (
+            pd.DataFrame({group_name: groups.to_numpy(), column: df[column].to_numpy()})
+            .groupby([group_name, column], sort=False)
+            .size()
+            .rename("__count__")
+            .reset_index()
+            .sort_values(["__count__", column], ascending=[False, True], kind="mergesort")
+            .drop_duplicates(group_name)
+        )
+        majority[column] = groups.map(counts.set_index(group_name)[column])
+    return pd.DataFrame(majority, index=df.index)
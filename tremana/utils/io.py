@@ -1,36 +1,176 @@
 """Helper function for IO operations."""
 from __future__ import annotations
 
+import locale
 import os
+from collections import deque
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque
 from typing import Iterable
+from typing import Iterator
 
+from tremana.utils.profiling import in_caller_context
+from tremana.utils.profiling import instrument
+from tremana.utils.profiling import record_bytes_read
 
+
+def _read_header(
+    file_path: str | os.PathLike[str],
+    lines_to_read: int,
+    prefix_size: int = 4096,
+    encoding: str | None = None,
+    max_size: int | None = None,
+    errors: str = "strict",
+) -> list[str]:
+    """Read the first lines of a file by reading a fixed size byte prefix.
+
+    If the prefix doesn't contain ``lines_to_read`` lines, further blocks of
+    ``prefix_size`` bytes are read until it does, ``max_size`` bytes were read
+    or the end of the file is reached.
+
+    Parameters
+    ----------
+    file_path : str | os.PathLike[str]
+        Path to the file which should be read.
+    lines_to_read : int
+        Number of lines to be read.
+    prefix_size : int
+        Number of bytes to read at once, by default 4096
+    encoding : str, optional
+        Encoding of the file, by default None which uses the same default as ``open``
+    max_size : int, optional
+        Maximal number of bytes to read, by default None which doesn't limit the size
+    errors : str
+        Handling of decoding errors (see ``bytes.decode``), by default "strict"
+
+    Returns
+    -------
+    list[str]
+        Headerlines of the file, missing lines are empty strings.
+    """
+    with open(file_path, "rb") as file:
+        data = file.read(prefix_size)
+        while data.count(b"\n") < lines_to_read:
+            if max_size is not None and len(data) >= max_size:
+                break
+            block = file.read(prefix_size)
+            if not block:
+                break
+            data += block
+    record_bytes_read(len(data))
+    end = -1
+    for _ in range(lines_to_read):
+        end = data.find(b"\n", end + 1)
+        if end == -1:
+            break
+    else:
+        data = data[:end]
+    lines = (
+        data.decode(encoding or locale.getpreferredencoding(False), errors=errors)
+        .replace("\r\n", "\n")
+        .split("\n")[:lines_to_read]
+    )
+    return lines + [""] * (lines_to_read - len(lines))
+
+
+@instrument
 def lazy_read_headers(
-    file_paths: Iterable[str | os.PathLike[str]], *, lines_to_read: int = 10
-) -> list[list[str]]:
+    file_paths: Iterable[str | os.PathLike[str]],
+    *,
+    lines_to_read: int = 10,
+    prefix_size: int = 4096,
+    max_size: int | None = None,
+    errors: str = "strict",
+) -> Iterator[list[str]]:
     """Lazy read headerlines of files.
 
+    Each file is only opened when the next header is requested and only a
+    small byte prefix of each file is read.
+
     Parameters
     ----------
     file_paths : Iterable[str | os.PathLike[str]]
         Paths to the files which should be read.
     lines_to_read : int
         Number of lines to be read, by default 10
+    prefix_size : int
+        Number of bytes to read at once, by default 4096
+    max_size : int, optional
+        Maximal number of bytes to read per file, by default None which doesn't limit the size
+    errors : str
+        Handling of decoding errors (see ``bytes.decode``), by default "strict"
 
-    Returns
-    -------
-    list[list[str]]
+    Yields
+    ------
+    list[str]
         Headerlines of the read files.
+
+    See Also
+    --------
+    concurrent_read_headers
     """
-    header_lines_list = []
     for file_path in file_paths:
-        with open(file_path) as file:
-            header_lines_list.append(
-                [
-                    file.readline().rstrip(
-                        "\n",
-                    )
-                    for _ in range(lines_to_read)
-                ]
+        yield _read_header(
+            file_path, lines_to_read, prefix_size=prefix_size, max_size=max_size, errors=errors
+        )
+
+
+@instrument
+def concurrent_read_headers(
+    file_paths: Iterable[str | os.PathLike[str]],
+    *,
+    lines_to_read: int = 10,
+    prefix_size: int = 4096,
+    max_size: int | None = None,
+    errors: str = "strict",
+    max_workers: int = 16,
+) -> Iterator[list[str]]:
+    """Read headerlines of files concurrently.
+
+    This hides the latency of opening files on network storage.
+    At most ``2 * max_workers`` reads are in flight at once and the headers
+    are yielded in the order of ``file_paths``.
+
+    Parameters
+    ----------
+    file_paths : Iterable[str | os.PathLike[str]]
+        Paths to the files which should be read.
+    lines_to_read : int
+        Number of lines to be read, by default 10
+    prefix_size : int
+        Number of bytes to read at once, by default 4096
+    max_size : int, optional
+        Maximal number of bytes to read per file, by default None which doesn't limit the size
+    errors : str
+        Handling of decoding errors (see ``bytes.decode``), by default "strict"
+    max_workers : int
+        Number of threads reading files, by default 16
+
+    Yields
+    ------
+    list[str]
+        Headerlines of the read files.
+
+    See Also
+    --------
+    lazy_read_headers
+    """
+    read_header = in_caller_context(_read_header)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending: Deque[Future[list[str]]] = deque()
+        for file_path in file_paths:
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+            pending.append(
+                executor.submit(
+                    read_header,
+                    file_path,
+                    lines_to_read,
+                    prefix_size=prefix_size,
+                    max_size=max_size,
+                    errors=errors,
+                )
             )
-    return header_lines_list
+        while pending:
+            yield pending.popleft().result()
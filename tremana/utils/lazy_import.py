@@ -0,0 +1,74 @@
+"""Helper to lazily import the submodules of a package (PEP 562)."""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import Mapping
+
+
+def lazy_submodules(
+    package_name: str,
+    submodules: Iterable[str],
+    attributes: Mapping[str, str] | None = None,
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """Create module level ``__getattr__`` and ``__dir__`` functions for lazy imports.
+
+    Submodules are only imported when they are accessed as attribute of the package,
+    so importing the package doesn't import heavy dependencies like pandas or scipy.
+
+    Parameters
+    ----------
+    package_name : str
+        Fully qualified name of the package (``__name__`` in its ``__init__.py``).
+    submodules : Iterable[str]
+        Names of the submodules to be lazily imported.
+    attributes : Mapping[str, str], optional
+        Attributes of submodules to be lazily exposed by the package,
+        mapping their name to the fully qualified name of the module defining them,
+        by default None
+
+    Returns
+    -------
+    tuple[Callable[[str], Any], Callable[[], list[str]]]
+        ``__getattr__`` and ``__dir__`` functions of the package.
+    """
+    submodules = frozenset(submodules)
+    attributes = dict(attributes or {})
+
+    def __getattr__(name: str) -> Any:
+        """Import the submodule ``name`` or the module defining ``name`` on first access.
+
+        Parameters
+        ----------
+        name : str
+            Name of the accessed attribute.
+
+        Returns
+        -------
+        Any
+            Imported submodule or attribute.
+
+        Raises
+        ------
+        AttributeError
+            If ``name`` isn't a lazily imported submodule or attribute.
+        """
+        if name in submodules:
+            return import_module(f"{package_name}.{name}")
+        if name in attributes:
+            return getattr(import_module(attributes[name]), name)
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+    def __dir__() -> list[str]:
+        """List the attributes of the package including the lazy submodules.
+
+        Returns
+        -------
+        list[str]
+            Attribute names of the package.
+        """
+        return sorted(set(vars(import_module(package_name))) | submodules | attributes.keys())
+
+    return __getattr__, __dir__
@@ -0,0 +1,384 @@
+"""Opt-in instrumentation of the processing steps (wall time, bytes read and array sizes).
+
+Calls of functions decorated with ``instrument`` are only recorded while a ``Profiler``
+is active, otherwise the overhead is a single global lookup per call.
+This module doesn't import any heavy dependency, so it can be used by the CLI.
+"""
+from __future__ import annotations
+
+import contextvars
+import inspect
+import json
+import os
+import threading
+from functools import wraps
+from time import perf_counter
+from types import TracebackType
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import NamedTuple
+from typing import TypeVar
+from typing import cast
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+FuncType = TypeVar("FuncType", bound=Callable[..., Any])
+
+INSTRUMENTED_FUNCTIONS: dict[str, Callable[..., Any]] = {}
+"""Registry of all instrumented functions by their qualified name."""
+
+_active_profiler: Profiler | None = None
+
+# Bytes read counters of the instrumented calls in progress in the current context,
+# each call only counts the reads of its own context (and the ones started by it)
+_bytes_read_counters: contextvars.ContextVar[tuple[list[int], ...]] = contextvars.ContextVar(
+    "bytes_read_counters", default=()
+)
+
+
+class ProfileRecord(NamedTuple):
+    """NamedTuple representing a single call of an instrumented function.
+
+    ``start`` is the value of ``time.perf_counter`` at the start of the call and all
+    times are in seconds. ``bytes_read`` only contains the reads of the call itself,
+    including the ones of worker threads started with ``in_caller_context``.
+    For generators ``duration`` is the time spent inside of the generator
+    (excluding the consumer) and ``output_nbytes`` the size of all yielded items.
+    """
+
+    name: str
+    start: float
+    duration: float
+    bytes_read: int
+    input_nbytes: int
+    output_nbytes: int
+    process_id: int
+    thread_id: int
+
+
+def _nbytes(obj: object) -> int:
+    """Calculate the size of the data of arrays, pandas objects and tuples or lists of them.
+
+    Parameters
+    ----------
+    obj : object
+        Object to calculate the size of, unsupported objects have a size of 0.
+
+    Returns
+    -------
+    int
+        Size in bytes.
+    """
+    if isinstance(obj, (list, tuple)):
+        return sum(_nbytes(item) for item in obj)
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(obj, "memory_usage", None)
+    if callable(memory_usage):
+        return int(memory_usage().sum())
+    return 0
+
+
+def record_bytes_read(nbytes: int) -> None:
+    """Add bytes read from a file to the calls recorded by the active profiler.
+
+    Parameters
+    ----------
+    nbytes : int
+        Number of bytes read.
+    """
+    profiler = _active_profiler
+    if profiler is not None:
+        profiler.add_bytes_read(nbytes, _bytes_read_counters.get())
+
+
+def in_caller_context(func: FuncType) -> FuncType:
+    """Run ``func`` in a copy of the context of the caller of ``in_caller_context``.
+
+    Functions submitted to a thread pool don't run in the context of the caller,
+    wrapping them attributes their bytes read to the instrumented call
+    which submitted them.
+
+    Parameters
+    ----------
+    func : FuncType
+        Function to run in worker threads.
+
+    Returns
+    -------
+    FuncType
+        Function running in a copy of the current context on each call.
+
+    Examples
+    --------
+    >>> with ThreadPoolExecutor() as executor:
+    ...     values_list = list(executor.map(in_caller_context(read_channel), file_paths))
+    """
+    context = contextvars.copy_context()
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        # a context can't be entered by several threads at once
+        return context.copy().run(func, *args, **kwargs)
+
+    return cast(FuncType, wrapper)
+
+
+class Profiler:
+    """Record the calls of instrumented functions while being used as context manager.
+
+    Calls in all threads of the process are recorded, calls in other processes need
+    their own profiler (see ``tremana.pipeline.analyze_cohort``).
+    Profilers can't be nested, only the innermost active one records calls.
+
+    Examples
+    --------
+    >>> with Profiler() as profiler:
+    ...     data = read_somnowatch(file_paths)
+    ...     metrics = center_of_mass(fft_spectra(data))
+    >>> profiler.summary()
+    >>> profiler.write_chrome_trace("trace.json")
+    """
+
+    def __init__(self, records: Iterable[ProfileRecord] = ()) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        records : Iterable[ProfileRecord]
+            Records of earlier runs (e.g. from worker processes) to include, by default ()
+
+
+        .. # noqa: DAR101
+        """
+        self.records: list[ProfileRecord] = list(records)
+        self.bytes_read = 0
+        self._lock = threading.Lock()
+        self._previous: Profiler | None = None
+
+    def __enter__(self) -> Profiler:
+        """Start recording calls.
+
+        Returns
+        -------
+        Profiler
+            The profiler itself.
+        """
+        global _active_profiler
+        self._previous = _active_profiler
+        _active_profiler = self
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Stop recording calls.
+
+        Parameters
+        ----------
+        exc_type : type[BaseException] | None
+            Type of the exception raised in the context.
+        exc_value : BaseException | None
+            Exception raised in the context.
+        traceback : TracebackType | None
+            Traceback of the exception raised in the context.
+        """
+        global _active_profiler
+        _active_profiler = self._previous
+        self._previous = None
+
+    def add_bytes_read(self, nbytes: int, counters: Iterable[list[int]] = ()) -> None:
+        """Add bytes read from a file by any thread.
+
+        Parameters
+        ----------
+        nbytes : int
+            Number of bytes read.
+        counters : Iterable[list[int]]
+            Counters of the calls in progress which the read belongs to, by default ()
+        """
+        with self._lock:
+            self.bytes_read += nbytes
+            for counter in counters:
+                counter[0] += nbytes
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Convert the records to a table with one row per call.
+
+        Returns
+        -------
+        pd.DataFrame
+            Recorded calls in the order they finished.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.records, columns=ProfileRecord._fields)
+
+    def summary(self) -> pd.DataFrame:
+        """Aggregate the records per function.
+
+        Returns
+        -------
+        pd.DataFrame
+            Number of calls, total and mean duration and sums of the sizes per function,
+            sorted by the total duration.
+        """
+        summary = (
+            self.to_dataframe()
+            .groupby("name")
+            .agg(
+                calls=("duration", "size"),
+                total_time=("duration", "sum"),
+                mean_time=("duration", "mean"),
+                bytes_read=("bytes_read", "sum"),
+                input_nbytes=("input_nbytes", "sum"),
+                output_nbytes=("output_nbytes", "sum"),
+            )
+        )
+        return summary.sort_values("total_time", ascending=False)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Convert the records to the Chrome trace event format.
+
+        The trace can be viewed with ``chrome://tracing`` or https://ui.perfetto.dev.
+
+        Returns
+        -------
+        dict[str, Any]
+            Trace with one complete event per call, times are relative to the first call.
+        """
+        origin = min((record.start for record in self.records), default=0)
+        return {
+            "traceEvents": [
+                {
+                    "name": record.name,
+                    "cat": "tremana",
+                    "ph": "X",
+                    "ts": (record.start - origin) * 1e6,
+                    "dur": record.duration * 1e6,
+                    "pid": record.process_id,
+                    "tid": record.thread_id,
+                    "args": {
+                        "bytes_read": record.bytes_read,
+                        "input_nbytes": record.input_nbytes,
+                        "output_nbytes": record.output_nbytes,
+                    },
+                }
+                for record in self.records
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def write_chrome_trace(self, file_path: str | os.PathLike[str]) -> None:
+        """Write the records as Chrome trace JSON file.
+
+        Parameters
+        ----------
+        file_path : str | os.PathLike[str]
+            Path of the file to write.
+
+        See Also
+        --------
+        to_chrome_trace
+        """
+        with open(file_path, "w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
+
+
+def instrument(func: FuncType) -> FuncType:
+    """Record the calls of ``func`` while a ``Profiler`` is active.
+
+    The decorated function is added to ``INSTRUMENTED_FUNCTIONS``.
+    Generator functions are recorded once the generator is exhausted or closed.
+
+    Parameters
+    ----------
+    func : FuncType
+        Function to instrument.
+
+    Returns
+    -------
+    FuncType
+        Instrumented function.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    if inspect.isgeneratorfunction(func):
+
+        @wraps(func)
+        def generator_wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _active_profiler
+            if profiler is None:
+                return (yield from func(*args, **kwargs))
+            start = perf_counter()
+            duration = 0.0
+            bytes_read = [0]
+            output_nbytes = 0
+            generator = func(*args, **kwargs)
+            try:
+                while True:
+                    # the counter is only set while the generator runs, not in the consumer
+                    token = _bytes_read_counters.set(_bytes_read_counters.get() + (bytes_read,))
+                    resume = perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration as stop:
+                        return stop.value
+                    finally:
+                        duration += perf_counter() - resume
+                        _bytes_read_counters.reset(token)
+                    output_nbytes += _nbytes(item)
+                    yield item
+            finally:
+                generator.close()
+                profiler.records.append(
+                    ProfileRecord(
+                        name,
+                        start,
+                        duration,
+                        bytes_read[0],
+                        _nbytes((args, tuple(kwargs.values()))),
+                        output_nbytes,
+                        os.getpid(),
+                        threading.get_ident(),
+                    )
+                )
+
+        INSTRUMENTED_FUNCTIONS[name] = generator_wrapper
+        return cast(FuncType, generator_wrapper)
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        profiler = _active_profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        result = None
+        bytes_read = [0]
+        token = _bytes_read_counters.set(_bytes_read_counters.get() + (bytes_read,))
+        start = perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            _bytes_read_counters.reset(token)
+            profiler.records.append(
+                ProfileRecord(
+                    name,
+                    start,
+                    perf_counter() - start,
+                    bytes_read[0],
+                    _nbytes((args, tuple(kwargs.values()))),
+                    _nbytes(result),
+                    os.getpid(),
+                    threading.get_ident(),
+                )
+            )
+        return result
+
+    INSTRUMENTED_FUNCTIONS[name] = wrapper
+    return cast(FuncType, wrapper)
@@ -194,3 +194,20 @@ class TremanaParsingIncorrectDateFormatWarning(TremanaSupressableWarning):
             f"datetime_format {format_str!r}."
         )
         super().__init__(*args, msg=msg, **kwargs)
+
+
+class TremanaParsingUnknownDeviceWarning(TremanaSupressableWarning):
+    """Warning for files which don't match any device parser and are skipped."""
+
+    def __init__(self, *args: object, **kwargs: Any) -> None:  # noqa: D205, D400
+        """
+        Parameters
+        ----------
+        **kwargs : Any
+            Keyword arguments of ``TremanaSupressableWarning`` (e.g. ``origin_file``).
+
+
+        .. # noqa: DAR101
+        """
+        msg = "The header doesn't match any of the supported devices, so the file is skipped."
+        super().__init__(*args, msg=msg, **kwargs)